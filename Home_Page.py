@@ -1,5 +1,9 @@
 import streamlit as st
 
+from backend.utils.warm_start import warm_start
+
+warm_start()
+
 st.title("Web Development Lab03")
 
 st.header("CS 1301")
@@ -0,0 +1,164 @@
+import atexit
+import os
+import pickle
+import threading
+import time
+from typing import NamedTuple
+
+from backend.cache.memory_cache import MemoryCache
+from backend.cache.sqlite_cache import SQLiteCache
+from backend.data_models.data_models import Forecast
+from config.weather import (
+    FORECAST_CACHE_BACKEND, FORECAST_CACHE_PATH, FORECAST_CACHE_TTL_SECONDS, FORECAST_CACHE_MAX_ENTRIES,
+    FORECAST_GRID_DEGREES, FORECAST_STALE_SECONDS, FORECAST_SNAPSHOT_PATH, FORECAST_SNAPSHOT_INTERVAL_SECONDS
+)
+
+_forecast_cache: "ForecastCache | None" = None
+_forecast_cache_lock = threading.Lock()
+
+
+class CachedForecast(NamedTuple):
+    forecast: Forecast
+    # Wall-clock time the backend's TTL runs out; None if it never does.
+    fresh_until: float | None
+
+    @property
+    def is_stale(self) -> bool:
+        return self.fresh_until is not None and self.fresh_until <= time.time()
+
+
+class ForecastCache:
+    """Forecasts shared by every session, keyed by grid-snapped coordinates and forecast start date.
+
+    Any two locations in the same ``grid_degrees`` cell resolve to the same key, so a city asked
+    about by many users (or spelled in several ways) costs one upstream fetch per TTL.
+
+    Entries are kept ``stale_seconds`` past the backend's TTL. :meth:`get` ignores them then, while
+    :meth:`lookup` still returns them marked stale, so a caller that is refreshing one can serve it meanwhile.
+    """
+
+    def __init__(self, backend: MemoryCache | SQLiteCache, grid_degrees: float,
+                 stale_seconds: float = FORECAST_STALE_SECONDS):
+        self.backend = backend
+        self.grid_degrees = grid_degrees
+        self.stale_seconds = stale_seconds
+        self._writes = 0
+        self._snapshot_writes = 0
+        self._snapshot_lock = threading.Lock()
+
+    def snap(self, latitude: float, longitude: float) -> tuple[float, float]:
+        """Centre of the grid cell containing the coordinates; forecasts are fetched for this point."""
+        return (
+            round(round(latitude / self.grid_degrees) * self.grid_degrees, 6),
+            round(round(longitude / self.grid_degrees) * self.grid_degrees, 6),
+        )
+
+    def key(self, latitude: float, longitude: float, start_date: str) -> str:
+        latitude, longitude = self.snap(latitude, longitude)
+        return f"{latitude:.4f},{longitude:.4f}:{start_date}"
+
+    def get(self, latitude: float, longitude: float, start_date: str) -> Forecast | None:
+        entry = self.lookup(latitude, longitude, start_date)
+        return entry.forecast if entry is not None and not entry.is_stale else None
+
+    def lookup(self, latitude: float, longitude: float, start_date: str, peek: bool = False) -> CachedForecast | None:
+        """The cached forecast with its freshness, including one past its TTL but still within ``stale_seconds``.
+
+        With ``peek`` the lookup is left out of the hit/miss counts, for housekeeping that is not serving a request.
+        """
+        key = self.key(latitude, longitude, start_date)
+        entry = self.backend.peek(key) if peek else self.backend.get(key)
+        if isinstance(entry, Forecast):
+            # Written before entries carried their freshness.
+            return CachedForecast(entry, None)
+        return entry
+
+    def set(self, latitude: float, longitude: float, start_date: str, forecast: Forecast) -> None:
+        ttl = self.backend.ttl
+        if ttl is None:
+            self.backend.set(self.key(latitude, longitude, start_date), CachedForecast(forecast, None))
+        else:
+            entry = CachedForecast(forecast, time.time() + ttl)
+            self.backend.set(self.key(latitude, longitude, start_date), entry, ttl=ttl + self.stale_seconds)
+        with self._snapshot_lock:
+            self._writes += 1
+
+    def save_snapshot(self, path: str) -> int:
+        """Write the unexpired entries of a memory backend to ``path``; returns how many were written.
+
+        Nothing is written when no forecast was stored since the last snapshot, or for the SQLite backend,
+        which persists on its own. The file is replaced atomically, so a crash never leaves half a snapshot.
+        """
+        if not isinstance(self.backend, MemoryCache):
+            return 0
+        with self._snapshot_lock:
+            writes = self._writes
+            if writes == self._snapshot_writes:
+                return 0
+            entries = self.backend.snapshot()
+            snapshot = {"grid_degrees": self.grid_degrees, "saved_at": time.time(), "entries": entries}
+            temporary_path = f"{path}.tmp"
+            with open(temporary_path, "wb") as snapshot_file:
+                pickle.dump(snapshot, snapshot_file, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temporary_path, path)
+            self._snapshot_writes = writes
+            return len(entries)
+
+    def load_snapshot(self, path: str) -> int:
+        """Restore entries saved by :meth:`save_snapshot`; returns how many were still unexpired.
+
+        The file is unpickled, so ``path`` must be one only this app can write. A missing, unreadable or
+        differently gridded snapshot restores nothing.
+        """
+        if not isinstance(self.backend, MemoryCache):
+            return 0
+        try:
+            with open(path, "rb") as snapshot_file:
+                snapshot = pickle.load(snapshot_file)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+            return 0
+        if not isinstance(snapshot, dict) or snapshot.get("grid_degrees") != self.grid_degrees:
+            return 0
+        return self.backend.restore(snapshot["entries"])
+
+    def stats(self) -> dict[str, float]:
+        return self.backend.stats()
+
+
+def create_forecast_cache_backend(backend: str = FORECAST_CACHE_BACKEND) -> MemoryCache | SQLiteCache:
+    if backend == "sqlite":
+        return SQLiteCache(FORECAST_CACHE_PATH, max_entries=FORECAST_CACHE_MAX_ENTRIES, ttl=FORECAST_CACHE_TTL_SECONDS)
+    if backend == "memory":
+        return MemoryCache(max_entries=FORECAST_CACHE_MAX_ENTRIES, ttl=FORECAST_CACHE_TTL_SECONDS)
+    raise ValueError(f"Unknown forecast cache backend: {backend}")
+
+
+def get_forecast_cache() -> ForecastCache:
+    global _forecast_cache
+    if _forecast_cache is None:
+        with _forecast_cache_lock:
+            if _forecast_cache is None:
+                forecast_cache = ForecastCache(create_forecast_cache_backend(), FORECAST_GRID_DEGREES)
+                if FORECAST_SNAPSHOT_PATH:
+                    forecast_cache.load_snapshot(FORECAST_SNAPSHOT_PATH)
+                    _start_snapshots(forecast_cache, FORECAST_SNAPSHOT_PATH, FORECAST_SNAPSHOT_INTERVAL_SECONDS)
+                _forecast_cache = forecast_cache
+    return _forecast_cache
+
+
+def _start_snapshots(forecast_cache: ForecastCache, path: str, interval: float) -> None:
+    """Snapshot ``forecast_cache`` every ``interval`` seconds and once more at interpreter exit."""
+    def save() -> None:
+        try:
+            forecast_cache.save_snapshot(path)
+        except OSError:
+            # An unwritable path only costs the warm restart; the next interval tries again.
+            pass
+
+    def run() -> None:
+        while True:
+            time.sleep(interval)
+            save()
+
+    threading.Thread(target=run, name="forecast-cache-snapshots", daemon=True).start()
+    atexit.register(save)
@@ -0,0 +1,103 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any
+
+
+class MemoryCache:
+    """Process-wide, size-bounded LRU cache with optional TTL.
+
+    Same interface as :class:`backend.cache.sqlite_cache.SQLiteCache`, for values that only need to
+    be shared between the sessions of one worker process.
+    """
+
+    def __init__(self, max_entries: int, ttl: float | None = None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+
+        self._entries: OrderedDict[str, tuple[Any, float | None]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str, default: Any = None) -> Any:
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or (entry[1] is not None and entry[1] <= now):
+                self._entries.pop(key, None)
+                self.misses += 1
+                return default
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def peek(self, key: str, default: Any = None) -> Any:
+        """Like :meth:`get`, without counting a hit or miss or refreshing the entry's recency."""
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is None or (entry[1] is not None and entry[1] <= time.time()):
+            return default
+        return entry[0]
+
+    def set(self, key: str, value: Any, ttl: float | None = None) -> None:
+        ttl = ttl if ttl is not None else self.ttl
+        expires_at = time.time() + ttl if ttl is not None else None
+
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def snapshot(self) -> list[tuple[str, Any, float | None]]:
+        """Unexpired ``(key, value, expires_at)`` entries, least recently used first."""
+        now = time.time()
+        with self._lock:
+            return [
+                (key, value, expires_at) for key, (value, expires_at) in self._entries.items()
+                if expires_at is None or expires_at > now
+            ]
+
+    def restore(self, entries: list[tuple[str, Any, float | None]]) -> int:
+        """Add entries taken by :meth:`snapshot`, keeping their expiry; returns how many were still unexpired."""
+        now = time.time()
+        restored = 0
+        with self._lock:
+            for key, value, expires_at in entries:
+                if expires_at is not None and expires_at <= now:
+                    continue
+                self._entries[key] = (value, expires_at)
+                self._entries.move_to_end(key)
+                restored += 1
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return restored
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "entries": len(self),
+            "max_entries": self.max_entries,
+        }
+
+    def close(self) -> None:
+        pass
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
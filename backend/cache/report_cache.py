@@ -0,0 +1,50 @@
+import threading
+
+from backend.cache.memory_cache import MemoryCache
+from backend.cache.sqlite_cache import SQLiteCache
+from backend.data_models.data_models import Forecast
+from backend.utils.geocoding import normalize_location_name
+from config.weather import REPORT_CACHE_BACKEND, REPORT_CACHE_MAX_ENTRIES, REPORT_CACHE_PATH, REPORT_CACHE_TTL_SECONDS
+
+_report_cache: "ReportCache | None" = None
+_report_cache_lock = threading.Lock()
+
+
+class ReportCache:
+    """Generated Weather_Man reports shared by every session.
+
+    Keys include the forecast's content hash, so a report is reused only while the forecast it was
+    written from is unchanged; a refreshed forecast simply misses and the stale entry ages out.
+    """
+
+    def __init__(self, backend: MemoryCache | SQLiteCache):
+        self.backend = backend
+
+    def key(self, location: str, event_date: str, units: str, forecast: Forecast) -> str:
+        return f"{normalize_location_name(location)}|{event_date}|{units.casefold()}|{forecast.content_hash()}"
+
+    def get(self, location: str, event_date: str, units: str, forecast: Forecast) -> str | None:
+        return self.backend.get(self.key(location, event_date, units, forecast))
+
+    def set(self, location: str, event_date: str, units: str, forecast: Forecast, report: str) -> None:
+        self.backend.set(self.key(location, event_date, units, forecast), report)
+
+    def stats(self) -> dict[str, float]:
+        return self.backend.stats()
+
+
+def create_report_cache_backend(backend: str = REPORT_CACHE_BACKEND) -> MemoryCache | SQLiteCache:
+    if backend == "sqlite":
+        return SQLiteCache(REPORT_CACHE_PATH, max_entries=REPORT_CACHE_MAX_ENTRIES, ttl=REPORT_CACHE_TTL_SECONDS)
+    if backend == "memory":
+        return MemoryCache(max_entries=REPORT_CACHE_MAX_ENTRIES, ttl=REPORT_CACHE_TTL_SECONDS)
+    raise ValueError(f"Unknown report cache backend: {backend}")
+
+
+def get_report_cache() -> ReportCache:
+    global _report_cache
+    if _report_cache is None:
+        with _report_cache_lock:
+            if _report_cache is None:
+                _report_cache = ReportCache(create_report_cache_backend())
+    return _report_cache
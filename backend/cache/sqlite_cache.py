@@ -0,0 +1,144 @@
+import pickle
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any
+
+
+class SQLiteCache:
+    """Size-bounded key/value cache persisted to SQLite and fronted by an in-process LRU.
+
+    The database file survives restarts and can be shared by every session and worker
+    process. Once more than ``max_entries`` are stored, the least recently used entries
+    are evicted. Entries can optionally expire after ``ttl`` seconds.
+    """
+
+    def __init__(self, path: str, max_entries: int, ttl: float | None = None):
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+
+        self._memory: OrderedDict[str, tuple[Any, float | None]] = OrderedDict()
+        self._touched: dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, timeout=30, isolation_level=None, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            "key TEXT PRIMARY KEY, value BLOB NOT NULL, expires_at REAL, last_used REAL NOT NULL)"
+        )
+        self._connection.execute("CREATE INDEX IF NOT EXISTS entries_last_used ON entries (last_used)")
+
+    def get(self, key: str, default: Any = None) -> Any:
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None and (entry[1] is None or entry[1] > now):
+                self._memory.move_to_end(key)
+                self._touched[key] = now
+                self.hits += 1
+                return entry[0]
+
+            row = self._connection.execute(
+                "SELECT value, expires_at FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or (row[1] is not None and row[1] <= now):
+                self._memory.pop(key, None)
+                self.misses += 1
+                return default
+
+            self._connection.execute("UPDATE entries SET last_used = ? WHERE key = ?", (now, key))
+            value = pickle.loads(row[0])
+            self._remember(key, value, row[1])
+            self.hits += 1
+            return value
+
+    def peek(self, key: str, default: Any = None) -> Any:
+        """Like :meth:`get`, without counting a hit or miss or refreshing the entry's recency."""
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None and (entry[1] is None or entry[1] > now):
+                return entry[0]
+            row = self._connection.execute(
+                "SELECT value, expires_at FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None or (row[1] is not None and row[1] <= now):
+            return default
+        return pickle.loads(row[0])
+
+    def set(self, key: str, value: Any, ttl: float | None = None) -> None:
+        now = time.time()
+        ttl = ttl if ttl is not None else self.ttl
+        expires_at = now + ttl if ttl is not None else None
+
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO entries (key, value, expires_at, last_used) VALUES (?, ?, ?, ?)",
+                (key, pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL), expires_at, now)
+            )
+            self._remember(key, value, expires_at)
+            self._evict(now)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._connection.execute("DELETE FROM entries WHERE key = ?", (key,))
+            self._memory.pop(key, None)
+            self._touched.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._connection.execute("DELETE FROM entries")
+            self._memory.clear()
+            self._touched.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "entries": len(self),
+            "max_entries": self.max_entries,
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._connection.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+    def _remember(self, key: str, value: Any, expires_at: float | None) -> None:
+        self._memory[key] = (value, expires_at)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def _evict(self, now: float) -> None:
+        # Hits served from memory only record their recency here, so flush it before picking victims.
+        if self._touched:
+            self._connection.executemany(
+                "UPDATE entries SET last_used = ? WHERE key = ?",
+                [(used, key) for key, used in self._touched.items()]
+            )
+            self._touched.clear()
+
+        self._connection.execute("DELETE FROM entries WHERE expires_at IS NOT NULL AND expires_at <= ?", (now,))
+        excess = self._connection.execute("SELECT COUNT(*) FROM entries").fetchone()[0] - self.max_entries
+        if excess <= 0:
+            return
+
+        evicted = [row[0] for row in self._connection.execute(
+            "SELECT key FROM entries ORDER BY last_used LIMIT ?", (excess,)
+        )]
+        self._connection.executemany("DELETE FROM entries WHERE key = ?", [(key,) for key in evicted])
+        for key in evicted:
+            self._memory.pop(key, None)
+            self._touched.pop(key, None)
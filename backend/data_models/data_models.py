@@ -1,4 +1,11 @@
-from typing import Callable
+import hashlib
+import json
+from typing import TYPE_CHECKING, Callable, NamedTuple
+
+import numpy as np
+
+if TYPE_CHECKING:
+    import pandas as pd
 
 
 class Tool:
@@ -28,4 +35,112 @@ class Tool:
             for example in self.usage_examples:
                 info.append(f"  - {example}")
 
-        return "\n".join(info)
\ No newline at end of file
+        return "\n".join(info)
+
+
+class Place(NamedTuple):
+    name: str
+    country_code: str
+    admin1_code: str
+    latitude: float
+    longitude: float
+    timezone: str
+    population: int
+
+    @property
+    def label(self) -> str:
+        """Display name such as "Atlanta, GA, US"; numeric admin1 codes are left out."""
+        parts = [self.name]
+        if self.admin1_code and not self.admin1_code.isdigit():
+            parts.append(self.admin1_code)
+        parts.append(self.country_code)
+        return ", ".join(parts)
+
+
+class Forecast:
+    """Columnar hourly forecast: one float32 row per variable over an int64 epoch-seconds time axis.
+
+    ``day_offsets`` holds the index of the first hour of each local calendar day (plus a final
+    end offset), so per-day slices are views into the same arrays. Conversion to dicts, JSON or a
+    DataFrame only happens at the edges, when one of the ``to_*`` methods is called.
+    """
+
+    __slots__ = ("time", "values", "variables", "utc_offset_seconds", "timezone", "dates", "day_offsets")
+
+    def __init__(self, time: np.ndarray, values: np.ndarray, variables: tuple[str, ...], utc_offset_seconds: int = 0,
+                 timezone: str | None = None):
+        self.time = np.asarray(time, dtype=np.int64)
+        self.values = np.asarray(values, dtype=np.float32).reshape(len(variables), len(self.time))
+        self.variables = tuple(variables)
+        self.utc_offset_seconds = int(utc_offset_seconds)
+        self.timezone = timezone
+
+        local_days = (self.time + self.utc_offset_seconds) // 86400
+        starts = np.flatnonzero(np.diff(local_days, prepend=local_days[:1] - 1))
+        self.day_offsets = np.append(starts, len(self.time))
+        self.dates = np.datetime_as_string(local_days[starts].astype("datetime64[D]")).tolist()
+
+    def __len__(self) -> int:
+        return len(self.time)
+
+    def __getitem__(self, variable: str) -> np.ndarray:
+        return self.values[self.variables.index(variable)]
+
+    def day(self, date: str) -> "Forecast":
+        """View of the hours falling on ``date`` (YYYY-MM-DD, local time); no data is copied."""
+        index = self.dates.index(date)
+        start, stop = self.day_offsets[index], self.day_offsets[index + 1]
+
+        view = object.__new__(Forecast)
+        view.time = self.time[start:stop]
+        view.values = self.values[:, start:stop]
+        view.variables = self.variables
+        view.utc_offset_seconds = self.utc_offset_seconds
+        view.timezone = self.timezone
+        view.dates = [date]
+        view.day_offsets = np.array([0, stop - start])
+        return view
+
+    def content_hash(self) -> str:
+        """Digest of the time axis, values, variables and UTC offset; equal forecasts hash equally."""
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(",".join(self.variables).encode())
+        digest.update(self.utc_offset_seconds.to_bytes(4, "little", signed=True))
+        digest.update(np.ascontiguousarray(self.time).tobytes())
+        digest.update(np.ascontiguousarray(self.values).tobytes())
+        return digest.hexdigest()
+
+    def local_times(self) -> np.ndarray:
+        """Wall-clock times at the forecast location as ``datetime64[s]``."""
+        return (self.time + self.utc_offset_seconds).astype("datetime64[s]")
+
+    def to_dict(self) -> dict[str, list]:
+        """Plain-Python columns keyed by variable, with local "YYYY-MM-DD HH:MM:SS" timestamps under "time"."""
+        data = {"time": np.char.replace(np.datetime_as_string(self.local_times()), "T", " ").tolist()}
+        for variable, row in zip(self.variables, self.values):
+            data[variable] = row.tolist()
+        return data
+
+    def daily_rollups(self) -> dict[str, np.ndarray]:
+        """Per-day "min", "max" and "mean" of every variable, each shaped (n_variables, n_days); NaNs are skipped."""
+        starts = self.day_offsets[:-1]
+        valid = ~np.isnan(self.values)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean = np.add.reduceat(np.where(valid, self.values, 0), starts, axis=1) / np.add.reduceat(valid, starts, axis=1)
+        return {
+            "min": np.fmin.reduceat(self.values, starts, axis=1),
+            "max": np.fmax.reduceat(self.values, starts, axis=1),
+            "mean": mean,
+        }
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict())
+
+    def to_dataframe(self) -> "pd.DataFrame":
+        """One row per hour with "date" and "hour" (HH:MM:SS) columns followed by every variable."""
+        import pandas as pd
+
+        timestamps = np.char.partition(np.datetime_as_string(self.local_times()), "T")
+        columns = {"date": timestamps[:, 0], "hour": timestamps[:, 2]}
+        columns.update(zip(self.variables, self.values))
+        return pd.DataFrame(columns)
@@ -1,11 +1,12 @@
 from datetime import datetime, timedelta
 
+from backend.prompts.forecast_encoder import encode_forecast
 from backend.prompts.gemini_prompts import tooled_system_prompt, data_processor_system_prompt, data_processor_user_prompt
 from backend.data_models.data_models import Tool
 
 
-def generate_tooled_system_prompt(chatbot_name: str, tools_list: list[Tool]) -> str:
-    current_date = datetime.now()
+def generate_tooled_system_prompt(chatbot_name: str, tools_list: list[Tool], current_date: datetime | None = None) -> str:
+    current_date = current_date or datetime.now()
     tomorrow = current_date + timedelta(days=1)
     next_week = current_date + timedelta(days=7)
 
@@ -26,7 +27,12 @@ def generate_data_processor_system_prompt() -> str:
     return data_processor_system_prompt.format()
 
 
-def generate_data_processor_user_prompt(weather_data: dict[str, any], location: str, date: str, preferred_units: str) -> str:
+def generate_data_processor_user_prompt(weather_result: dict[str, any], location: str, date: str, preferred_units: str) -> str:
+    if weather_result["data"] is None:
+        weather_data = f"unavailable ({weather_result['error']})"
+    else:
+        weather_data = "\n" + encode_forecast(weather_result["data"], weather_result["date"])
+
     return data_processor_user_prompt.format(
         location,
         date,
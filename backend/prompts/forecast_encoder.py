@@ -0,0 +1,112 @@
+"""Compact text form of forecasts for prompts and tool responses.
+
+Column names are stated once per table, rows are comma-separated and every variable is rounded to the
+precision in ``VARIABLE_DECIMALS`` with trailing zeros dropped, so a week of hourly data costs a fraction of
+the tokens of a dict repr full of float32 artifacts such as ``12.350000381469727``.
+"""
+import numpy as np
+
+from backend.data_models.data_models import Forecast
+from config.weather import VARIABLE_DECIMALS
+
+DEFAULT_DECIMALS: int = 1
+
+
+def encode_forecast(forecast: Forecast, event_date: str | None = None) -> str:
+    """Hourly rows for every day, or only for ``event_date`` with min/max/mean rows for the other days."""
+    lines = [f"timezone: {forecast.timezone or 'UTC'} (UTC{_format_offset(forecast.utc_offset_seconds)})"]
+    header = ",".join(("hour", *forecast.variables))
+
+    hourly_dates = forecast.dates if event_date is None else [date for date in forecast.dates if date == event_date]
+    for date in hourly_dates:
+        lines += [f"hourly {date}", header, *_hourly_rows(forecast.day(date))]
+
+    other_dates = [] if event_date is None else [date for date in forecast.dates if date != event_date]
+    if other_dates:
+        lines += ["daily min/max/mean", ",".join(("date", *forecast.variables)), *_daily_rows(forecast, other_dates)]
+    return "\n".join(lines)
+
+
+def encode_weather_result(result: dict[str, any]) -> dict[str, any]:
+    """Weather result with its forecast replaced by the event-focused text encoding, for tool responses."""
+    if result["data"] is None:
+        return result
+    return {**result, "data": encode_forecast(result["data"], result["date"])}
+
+
+def digest_encoded_forecast(text: str) -> str:
+    """Text from :func:`encode_forecast` with each hourly table folded into a min/max/mean row for its day.
+
+    Used for old tool results in a conversation history, where the hours are no longer worth their tokens.
+    """
+    lines = text.splitlines()
+    variables, hourly, daily = [], {}, {}
+    index = 1
+    while index < len(lines):
+        if lines[index].startswith("hourly "):
+            end = index + 2
+            while end < len(lines) and not lines[end].startswith(("hourly ", "daily ")):
+                end += 1
+            variables = lines[index + 1].split(",")[1:]
+            hourly[lines[index].removeprefix("hourly ")] = [row.split(",")[1:] for row in lines[index + 2:end]]
+            index = end
+        elif lines[index] == "daily min/max/mean":
+            variables = lines[index + 1].split(",")[1:]
+            daily.update((row.split(",", 1)[0], row) for row in lines[index + 2:])
+            break
+        else:
+            index += 1
+    if not hourly:
+        return text
+
+    dates = list(hourly)
+    days = [np.array([[float(cell) if cell else np.nan for cell in row] for row in hourly[date]]).T for date in dates]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        rollups = {
+            "min": np.stack([np.fmin.reduce(day, axis=1) for day in days], axis=1),
+            "max": np.stack([np.fmax.reduce(day, axis=1) for day in days], axis=1),
+            "mean": np.stack([np.nansum(day, axis=1) / (~np.isnan(day)).sum(axis=1) for day in days], axis=1),
+        }
+    daily.update(zip(dates, _rollup_rows(dates, variables, rollups)))
+    return "\n".join((lines[0], "daily min/max/mean", ",".join(("date", *variables)), *map(daily.get, sorted(daily))))
+
+
+def _hourly_rows(day: Forecast) -> list[str]:
+    hours = np.char.partition(np.datetime_as_string(day.local_times(), unit="h"), "T")[:, 2]
+    rows = hours
+    for variable, values in zip(day.variables, day.values):
+        rows = np.char.add(np.char.add(rows, ","), _format_values(values, VARIABLE_DECIMALS.get(variable, DEFAULT_DECIMALS)))
+    return rows.tolist()
+
+
+def _daily_rows(forecast: Forecast, dates: list[str]) -> list[str]:
+    day_indices = [forecast.dates.index(date) for date in dates]
+    rollups = {name: values[:, day_indices] for name, values in forecast.daily_rollups().items()}
+    return _rollup_rows(dates, forecast.variables, rollups)
+
+
+def _rollup_rows(dates: list[str], variables: list[str], rollups: dict[str, np.ndarray]) -> list[str]:
+    """One row per date with a min/max/mean cell per variable; ``rollups`` are shaped (n_variables, n_dates)."""
+    rows = np.array(dates)
+    for index, variable in enumerate(variables):
+        decimals = VARIABLE_DECIMALS.get(variable, DEFAULT_DECIMALS)
+        cell = _format_values(rollups["min"][index], decimals)
+        for name in ("max", "mean"):
+            cell = np.char.add(np.char.add(cell, "/"), _format_values(rollups[name][index], decimals))
+        rows = np.char.add(np.char.add(rows, ","), cell)
+    return rows.tolist()
+
+
+def _format_values(values: np.ndarray, decimals: int) -> np.ndarray:
+    """Fixed-precision strings without trailing zeros or negative zero; missing values become empty cells."""
+    values = np.asarray(values, dtype=np.float64)
+    text = np.char.mod(f"%.{decimals}f", np.round(values, decimals) + 0.0)
+    if decimals:
+        text = np.char.rstrip(np.char.rstrip(text, "0"), ".")
+    return np.where(np.isnan(values), "", text)
+
+
+def _format_offset(seconds: int) -> str:
+    sign = "-" if seconds < 0 else "+"
+    hours, minutes = divmod(abs(seconds) // 60, 60)
+    return f"{sign}{hours:02d}:{minutes:02d}"
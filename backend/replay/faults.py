@@ -0,0 +1,31 @@
+import random
+import threading
+import time
+
+from config.replay import REPLAY_ERROR_RATE, REPLAY_LATENCY_JITTER_SECONDS, REPLAY_LATENCY_SECONDS, REPLAY_SEED
+
+
+class FaultInjector:
+    """Seeded latency and failure decisions, so a replayed run is reproducible draw for draw."""
+
+    def __init__(self, latency: float = REPLAY_LATENCY_SECONDS, jitter: float = REPLAY_LATENCY_JITTER_SECONDS,
+                 error_rate: float = REPLAY_ERROR_RATE, seed: int = REPLAY_SEED):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def draw(self) -> tuple[float, bool]:
+        """Delay in seconds and whether the call fails."""
+        with self._lock:
+            delay = self.latency + (self._random.uniform(0, self.jitter) if self.jitter else 0.0)
+            fails = self.error_rate > 0 and self._random.random() < self.error_rate
+        return delay, fails
+
+    def apply(self) -> bool:
+        """Sleep for the drawn delay; True if the call should fail."""
+        delay, fails = self.draw()
+        if delay:
+            time.sleep(delay)
+        return fails
@@ -0,0 +1,134 @@
+"""Record/replay stand-ins for ``GenerativeModel.generate_content``.
+
+Only the parts the app reads are reproduced: ``candidates[0].content.parts`` with ``text`` and ``function_call``
+(``name``, ``args``). Requests are keyed by model name and conversation contents, with ISO dates masked so
+recordings keep matching on later days.
+"""
+import re
+import time
+from collections.abc import Iterator
+from typing import Any, Callable
+
+from google.api_core.exceptions import ServiceUnavailable
+
+from backend.replay.faults import FaultInjector
+from backend.replay.store import FixtureStore, canonical_json, to_plain
+from config.replay import REPLAY_FIXTURES_DIR, UPSTREAM_MODE
+
+SERVICE: str = "gemini"
+_ISO_DATE = re.compile(r"\b\d{4}-\d{2}-\d{2}\b")
+
+
+class ReplayFunctionCall:
+    def __init__(self, name: str, args: dict[str, Any]):
+        self.name = name
+        self.args = args
+
+
+class ReplayPart:
+    def __init__(self, text: str = "", function_call: ReplayFunctionCall | None = None):
+        self.text = text
+        self.function_call = function_call
+
+
+class ReplayContent:
+    def __init__(self, parts: list[ReplayPart]):
+        self.parts = parts
+
+
+class ReplayCandidate:
+    def __init__(self, content: ReplayContent):
+        self.content = content
+
+
+class ReplayResponse:
+    def __init__(self, parts: list[ReplayPart]):
+        self.candidates = [ReplayCandidate(ReplayContent(parts))]
+
+
+class ReplayModel:
+    """Answers ``generate_content`` from recordings, with the injected latency applied before the first chunk."""
+
+    def __init__(self, name: str, store: FixtureStore, faults: FaultInjector | None = None):
+        self.name = name
+        self.store = store
+        self.faults = faults or FaultInjector()
+
+    def generate_content(self, contents: Any, stream: bool = False) -> ReplayResponse | Iterator[ReplayResponse]:
+        key = request_key(self.name, contents)
+        record = self.store.get(SERVICE, key)
+        if record is None:
+            raise LookupError(f"No recorded {self.name} response for request {key}")
+
+        delay, fails = self.faults.draw()
+        if stream:
+            return self._stream(record["chunks"], delay, fails)
+        time.sleep(delay)
+        if fails:
+            raise ServiceUnavailable("Injected failure")
+        return ReplayResponse([_part_from_plain(part) for chunk in record["chunks"] for part in chunk])
+
+    @staticmethod
+    def _stream(chunks: list[list[dict]], delay: float, fails: bool) -> Iterator[ReplayResponse]:
+        time.sleep(delay)
+        if fails:
+            raise ServiceUnavailable("Injected failure")
+        for chunk in chunks:
+            yield ReplayResponse([_part_from_plain(part) for part in chunk])
+
+
+class RecordingModel:
+    """Passes calls through to a real model and records each response, streamed or not."""
+
+    def __init__(self, model: Any, name: str, store: FixtureStore):
+        self.model = model
+        self.name = name
+        self.store = store
+
+    def generate_content(self, contents: Any, stream: bool = False) -> Any:
+        key = request_key(self.name, contents)
+        request = to_plain(contents)
+        if stream:
+            return self._record_stream(self.model.generate_content(contents, stream=True), key, request)
+
+        response = self.model.generate_content(contents)
+        self._save(key, request, [_parts_to_plain(response)])
+        return response
+
+    def _record_stream(self, chunks: Iterator[Any], key: str, request: Any) -> Iterator[Any]:
+        recorded = []
+        for chunk in chunks:
+            recorded.append(_parts_to_plain(chunk))
+            yield chunk
+        self._save(key, request, recorded)
+
+    def _save(self, key: str, request: Any, chunks: list[list[dict]]) -> None:
+        self.store.put(SERVICE, key, {"model": self.name, "request": request, "chunks": chunks})
+
+
+def create_model(name: str, factory: Callable[[], Any]) -> Any:
+    """The model ``factory`` builds in "live" mode, or its record/replay stand-in per ``UPSTREAM_MODE``."""
+    if UPSTREAM_MODE == "replay":
+        return ReplayModel(name, FixtureStore(REPLAY_FIXTURES_DIR))
+    if UPSTREAM_MODE == "record":
+        return RecordingModel(factory(), name, FixtureStore(REPLAY_FIXTURES_DIR))
+    return factory()
+
+
+def request_key(name: str, contents: Any) -> str:
+    return FixtureStore.key({"model": name, "contents": _ISO_DATE.sub("<date>", canonical_json(contents))})
+
+
+def _parts_to_plain(response: Any) -> list[dict]:
+    if not response.candidates:
+        return []
+    return [
+        {"function_call": to_plain(part.function_call)} if part.function_call else {"text": part.text}
+        for part in response.candidates[0].content.parts
+    ]
+
+
+def _part_from_plain(part: dict) -> ReplayPart:
+    if "function_call" in part:
+        return ReplayPart(function_call=ReplayFunctionCall(part["function_call"]["name"], part["function_call"]["args"]))
+    return ReplayPart(text=part["text"])
@@ -0,0 +1,158 @@
+"""Localhost stand-in for the Open-Meteo geocoding and forecast APIs.
+
+In "replay" mode it answers from recorded fixtures only; in "record" mode it forwards each request to the real
+service and records the response first. Every HTTP client in the app (pooled requests sessions, the async
+niquests session) reaches it through the URLs in ``config.weather``, so nothing in the call path is mocked.
+
+The app starts one in-process on first use. To share one between processes or drive it from a load tool:
+
+    python -m backend.replay.server [--mode replay] [--port 8765] [--latency 0.05] [--error-rate 0.01]
+"""
+import argparse
+import base64
+import json
+import socket
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import requests
+
+from backend.replay.faults import FaultInjector
+from backend.replay.store import FixtureStore
+from config.replay import (
+    REPLAY_FIXTURES_DIR, REPLAY_HOST, REPLAY_PORT, REPLAY_UPSTREAMS, REPLAY_VOLATILE_PARAMS, UPSTREAM_MODE
+)
+from config.weather import HTTP_TIMEOUT_SECONDS
+
+_replay_server: "ReplayServer | None" = None
+_replay_server_lock = threading.Lock()
+
+
+class ReplayServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address: tuple[str, int], store: FixtureStore, mode: str = "replay",
+                 faults: FaultInjector | None = None, upstreams: dict[str, str] = REPLAY_UPSTREAMS):
+        super().__init__(address, _ReplayHandler)
+        self.store = store
+        self.mode = mode
+        self.faults = faults or FaultInjector()
+        self.upstreams = upstreams
+        self.upstream_session = requests.Session()
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def request_key(self, method: str, path: str, query: str) -> str:
+        params = {
+            name: values for name, values in parse_qs(query, keep_blank_values=True).items()
+            if name not in REPLAY_VOLATILE_PARAMS
+        }
+        return self.store.key({"method": method, "path": path, "params": params})
+
+
+class _ReplayHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    server: ReplayServer
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        service, _, path = url.path.lstrip("/").partition("/")
+        if service not in self.server.upstreams:
+            return self._send_error(404, f"Unknown service: {service}")
+
+        key = self.server.request_key("GET", url.path, url.query)
+        if self.server.mode == "record":
+            record = self._forward(service, f"/{path}", url.query, key)
+        else:
+            record = self.server.store.get(service, key)
+            if record is None:
+                return self._send_error(404, f"No recorded response for {self.path}")
+            if self.server.faults.apply():
+                return self._send_error(503, "Injected failure")
+
+        self._send(record["status"], record["content_type"], base64.b64decode(record["body"]))
+
+    def _forward(self, service: str, path: str, query: str, key: str) -> dict:
+        response = self.server.upstream_session.get(
+            f"{self.server.upstreams[service]}{path}", params=query, timeout=HTTP_TIMEOUT_SECONDS
+        )
+        record = {
+            "request": {"method": "GET", "path": self.path},
+            "status": response.status_code,
+            "content_type": response.headers.get("Content-Type", "application/octet-stream"),
+            "body": base64.b64encode(response.content).decode(),
+        }
+        if response.status_code < 500:
+            self.server.store.put(service, key, record)
+        return record
+
+    def _send_error(self, status: int, reason: str) -> None:
+        self._send(status, "application/json", json.dumps({"error": True, "reason": reason}).encode())
+
+    def _send(self, status: int, content_type: str, body: bytes) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def start_replay_server(store: FixtureStore, mode: str = "replay", host: str = REPLAY_HOST, port: int = 0,
+                        faults: FaultInjector | None = None,
+                        upstreams: dict[str, str] = REPLAY_UPSTREAMS) -> ReplayServer:
+    """Serve ``store`` from a daemon thread; ``port=0`` picks a free port (see ``ReplayServer.base_url``)."""
+    server = ReplayServer((host, port), store, mode, faults, upstreams)
+    threading.Thread(target=server.serve_forever, args=(0.05,), name="replay-server", daemon=True).start()
+    return server
+
+
+def ensure_replay_server() -> None:
+    """Start the configured stand-in in this process unless running live or one is already listening."""
+    global _replay_server
+    if UPSTREAM_MODE == "live" or _replay_server is not None:
+        return
+    with _replay_server_lock:
+        if _replay_server is None and not _is_listening(REPLAY_HOST, REPLAY_PORT):
+            _replay_server = start_replay_server(FixtureStore(REPLAY_FIXTURES_DIR), UPSTREAM_MODE, port=REPLAY_PORT)
+
+
+def _is_listening(host: str, port: int) -> bool:
+    try:
+        with socket.create_connection((host, port), timeout=0.2):
+            return True
+    except OSError:
+        return False
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--mode", choices=("replay", "record"), default="replay" if UPSTREAM_MODE == "live" else UPSTREAM_MODE)
+    parser.add_argument("--host", default=REPLAY_HOST)
+    parser.add_argument("--port", type=int, default=REPLAY_PORT)
+    parser.add_argument("--fixtures", default=REPLAY_FIXTURES_DIR)
+    parser.add_argument("--latency", type=float, default=None, help="Seconds added to every replayed response")
+    parser.add_argument("--jitter", type=float, default=None, help="Extra uniform random delay, in seconds")
+    parser.add_argument("--error-rate", type=float, default=None, help="Fraction of replayed requests answered with 503")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    faults = FaultInjector(**{
+        name: value for name, value in
+        {"latency": args.latency, "jitter": args.jitter, "error_rate": args.error_rate, "seed": args.seed}.items()
+        if value is not None
+    })
+    server = ReplayServer((args.host, args.port), FixtureStore(args.fixtures), args.mode, faults)
+    print(f"{args.mode} stand-in on {server.base_url} serving {args.fixtures}")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+import hashlib
+import json
+import os
+import threading
+from collections.abc import Mapping
+from typing import Any
+
+
+class FixtureStore:
+    """Recorded responses on disk, one JSON file per request under ``<directory>/<service>/<key>.json``.
+
+    Keys are digests of a canonical form of the request, so the same request always maps to the same file
+    and recordings can be committed and diffed like any other test fixture.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(request: Any) -> str:
+        return hashlib.sha256(canonical_json(request).encode()).hexdigest()[:32]
+
+    def get(self, service: str, key: str) -> dict[str, Any] | None:
+        try:
+            with open(self._path(service, key), encoding="utf-8") as file:
+                return json.load(file)
+        except FileNotFoundError:
+            return None
+
+    def put(self, service: str, key: str, record: dict[str, Any]) -> None:
+        path = self._path(service, key)
+        with self._lock:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            temporary_path = f"{path}.tmp"
+            with open(temporary_path, "w", encoding="utf-8") as file:
+                json.dump(record, file, indent=1, sort_keys=True)
+            os.replace(temporary_path, path)
+
+    def _path(self, service: str, key: str) -> str:
+        return os.path.join(self.directory, service, f"{key}.json")
+
+
+def canonical_json(value: Any) -> str:
+    return json.dumps(to_plain(value), sort_keys=True, separators=(",", ":"), default=str)
+
+
+def to_plain(value: Any) -> Any:
+    """JSON-ready copy of ``value``; protobuf maps/lists and function-call objects become dicts and lists."""
+    if isinstance(value, (str, int, float, bool)) or value is None:
+        return value
+    if isinstance(value, Mapping):
+        return {str(key): to_plain(item) for key, item in value.items()}
+    if hasattr(value, "name") and hasattr(value, "args"):
+        return {"name": value.name, "args": to_plain(dict(value.args))}
+    if isinstance(value, (list, tuple)) or (hasattr(value, "__iter__") and hasattr(value, "__len__")):
+        return [to_plain(item) for item in value]
+    return str(value)
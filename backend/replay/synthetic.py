@@ -0,0 +1,52 @@
+"""Synthetic Open-Meteo forecast responses for benchmarks and tests that must not touch the network.
+
+Values are seeded random noise in every hourly variable; only the accessors the app reads are provided.
+"""
+import numpy as np
+
+from config.weather import HOURLY_VARIABLES
+
+
+class SyntheticVariable:
+    def __init__(self, values: np.ndarray):
+        self._values = values
+
+    def ValuesAsNumpy(self) -> np.ndarray:
+        return self._values
+
+
+class SyntheticHourly:
+    def __init__(self, start: int, hours: int, seed: int = 0):
+        self._start = start
+        self._hours = hours
+        rng = np.random.default_rng(seed)
+        self._variables = [SyntheticVariable(rng.random(hours, dtype=np.float32) * 30) for _ in HOURLY_VARIABLES]
+
+    def Time(self) -> int:
+        return self._start
+
+    def TimeEnd(self) -> int:
+        return self._start + self._hours * 3600
+
+    def Interval(self) -> int:
+        return 3600
+
+    def Variables(self, index: int) -> SyntheticVariable:
+        return self._variables[index]
+
+
+class SyntheticResponse:
+    """Stand-in exposing the parts of ``WeatherApiResponse`` that the transform reads."""
+
+    def __init__(self, hours: int, start: int = 1717200000, utc_offset_seconds: int = -4 * 3600, seed: int = 0):
+        self._hourly = SyntheticHourly(start, hours, seed)
+        self._utc_offset_seconds = utc_offset_seconds
+
+    def Hourly(self) -> SyntheticHourly:
+        return self._hourly
+
+    def UtcOffsetSeconds(self) -> int:
+        return self._utc_offset_seconds
+
+    def Timezone(self) -> bytes:
+        return b"America/New_York"
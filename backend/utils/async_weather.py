@@ -0,0 +1,179 @@
+"""Asyncio counterparts of :mod:`backend.utils.weather` and :mod:`backend.utils.geocoding`.
+
+Upstream calls go through one ``niquests.AsyncSession`` per event loop and are bounded by a semaphore, so a
+single worker can keep many geocoding and forecast requests in flight. Synchronous callers (the Streamlit
+pages) use :func:`run_sync`, which schedules coroutines on a shared background loop. Geocoding and forecast
+cache reads and writes may hit SQLite, so they run in worker threads rather than on the loop.
+"""
+import asyncio
+import threading
+import weakref
+from concurrent.futures import Future
+from typing import TYPE_CHECKING, Any, Coroutine, TypeVar
+
+from backend.replay.server import ensure_replay_server
+from backend.utils.rate_limit import limited_async
+from backend.utils.tracing import span
+from backend.utils.geocoding import (
+    _geocoding_params, _read_geocoding_response, _resolve_location_offline, geocoding_flights, get_geocoding_cache
+)
+from backend.utils.weather import (
+    _build_forecasts, _chunk_grid_points, _claim_grid_points, _error_result, _fill_forecast_results,
+    _forecast_params, _forecast_result_to_dict, _forecast_window, _group_by_grid_point, _release_grid_points,
+    _store_fetched_forecasts, _validate_event_date
+)
+from config.weather import (
+    ASYNC_MAX_CONCURRENCY, FORECAST_FLIGHT_WAIT_SECONDS, FORECAST_URL, GEOCODING_URL, HTTP_BACKOFF_FACTOR, HTTP_MAX_RETRIES, HTTP_POOL_SIZE,
+    HTTP_TIMEOUT_SECONDS
+)
+
+if TYPE_CHECKING:
+    import niquests
+    import openmeteo_requests
+
+T = TypeVar("T")
+
+_loop_resources: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, tuple]" = weakref.WeakKeyDictionary()
+_loop_resources_lock = threading.Lock()
+_background_loop: asyncio.AbstractEventLoop | None = None
+_background_loop_lock = threading.Lock()
+
+
+def _get_loop_resources() -> tuple["niquests.AsyncSession", "openmeteo_requests.AsyncClient", asyncio.Semaphore]:
+    """Session, Open-Meteo client and concurrency limit shared by every coroutine on the running loop."""
+    import niquests
+    import openmeteo_requests
+
+    loop = asyncio.get_running_loop()
+    with _loop_resources_lock:
+        resources = _loop_resources.get(loop)
+        if resources is None:
+            ensure_replay_server()
+            session = niquests.AsyncSession(
+                pool_connections=HTTP_POOL_SIZE,
+                pool_maxsize=HTTP_POOL_SIZE,
+                retries=niquests.RetryConfiguration(
+                    total=HTTP_MAX_RETRIES,
+                    backoff_factor=HTTP_BACKOFF_FACTOR,
+                    status_forcelist=(500, 502, 504),
+                    allowed_methods=None
+                ),
+                timeout=HTTP_TIMEOUT_SECONDS
+            )
+            resources = (session, openmeteo_requests.AsyncClient(session), asyncio.Semaphore(ASYNC_MAX_CONCURRENCY))
+            _loop_resources[loop] = resources
+    return resources
+
+
+def _get_background_loop() -> asyncio.AbstractEventLoop:
+    global _background_loop
+    if _background_loop is None:
+        with _background_loop_lock:
+            if _background_loop is None:
+                loop = asyncio.new_event_loop()
+                threading.Thread(target=loop.run_forever, name="weather-async-loop", daemon=True).start()
+                _background_loop = loop
+    return _background_loop
+
+
+def run_sync(coroutine: Coroutine[Any, Any, T]) -> T:
+    """Run ``coroutine`` on the shared background loop and block until it finishes.
+
+    Safe to call from any number of threads at once; their requests overlap on the one loop.
+    """
+    return asyncio.run_coroutine_threadsafe(coroutine, _get_background_loop()).result()
+
+
+async def _get_location_coordinates_async(city_name: str) -> tuple[float, float]:
+    with span("geocode") as attributes:
+        cache_key, coordinates = await asyncio.to_thread(_resolve_location_offline, city_name)
+        attributes["source"] = "offline" if coordinates is not None else "network"
+        if coordinates is not None:
+            return coordinates
+
+        return await geocoding_flights.do_async(cache_key, lambda: _geocode_online_async(cache_key))
+
+
+async def _geocode_online_async(cache_key: str) -> tuple[float, float]:
+    coordinates = await asyncio.to_thread(get_geocoding_cache().get, cache_key)
+    if coordinates is not None:
+        return coordinates
+
+    session, _, semaphore = _get_loop_resources()
+    async with limited_async("geocoding"), semaphore:
+        response = await session.get(GEOCODING_URL, params=_geocoding_params(cache_key))
+    return await asyncio.to_thread(_read_geocoding_response, response, cache_key)
+
+
+async def _fetch_forecasts_async(coordinates: list[tuple[float, float]], start_date: str, end_date: str) -> list:
+    _, client, semaphore = _get_loop_resources()
+    async with limited_async("forecast"):
+        with span("forecast.fetch", points=len(coordinates)):
+            async with semaphore:
+                params = _forecast_params(coordinates, start_date, end_date)
+                responses = await client.weather_api(FORECAST_URL, params=params)
+    return _build_forecasts(responses, len(coordinates))
+
+
+async def get_forecast_batch_async(locations: list[str], event_date: str) -> list[dict[str, Any]]:
+    date_error = _validate_event_date(event_date)
+    if date_error:
+        return [_error_result(location, event_date, date_error) for location in locations]
+
+    start_date_str, end_date_str = _forecast_window()
+    geocoded = await asyncio.gather(
+        *(_get_location_coordinates_async(location) for location in locations), return_exceptions=True
+    )
+    results, pending = _group_by_grid_point(locations, event_date, list(geocoded))
+    claimed: dict[tuple[float, float], Future] = {}
+
+    try:
+        leading, following = await asyncio.to_thread(
+            _claim_grid_points, results, pending, locations, event_date, start_date_str, claimed
+        )
+        await _fetch_and_store_async(results, pending, leading, locations, event_date, start_date_str, end_date_str)
+    finally:
+        _release_grid_points(claimed, start_date_str)
+
+    shared = {point: asyncio.wrap_future(future) for point, future in following.items()}
+    if shared:
+        # Not cancelled on timeout: that would cancel the leader's future for every other caller too.
+        await asyncio.wait(shared.values(), timeout=FORECAST_FLIGHT_WAIT_SECONDS)
+    for point, outcome in shared.items():
+        if outcome.done():
+            forecasts = outcome.exception() or [outcome.result()]
+            _fill_forecast_results(results, pending, [point], forecasts, locations, event_date)
+
+    # A fetch that has not answered in time is repeated here rather than waited on any longer.
+    late = [point for point, outcome in shared.items() if not outcome.done()]
+    await _fetch_and_store_async(results, pending, late, locations, event_date, start_date_str, end_date_str,
+                                 share=False)
+
+    return results
+
+
+async def _fetch_and_store_async(
+        results: list[dict[str, Any] | None], pending: dict[tuple[float, float], list[int]],
+        points: list[tuple[float, float]], locations: list[str], event_date: str, start_date: str, end_date: str,
+        share: bool = True
+) -> None:
+    chunks = _chunk_grid_points(points)
+    fetched = await asyncio.gather(
+        *(_fetch_forecasts_async(chunk, start_date, end_date) for chunk in chunks), return_exceptions=True
+    )
+    for chunk, forecasts in zip(chunks, fetched):
+        await asyncio.to_thread(
+            _store_fetched_forecasts, results, pending, chunk, forecasts, locations, event_date, start_date, share=share
+        )
+
+
+async def get_forecast_async(location: str, event_date: str) -> dict[str, Any]:
+    return (await get_forecast_batch_async([location], event_date))[0]
+
+
+async def get_weather_info_async(location: str, event_date: str) -> dict[str, Any]:
+    return _forecast_result_to_dict(await get_forecast_async(location, event_date))
+
+
+async def get_weather_info_batch_async(locations: list[str], event_date: str) -> list[dict[str, Any]]:
+    return [_forecast_result_to_dict(result) for result in await get_forecast_batch_async(locations, event_date)]
@@ -0,0 +1,103 @@
+import threading
+from typing import TYPE_CHECKING, Any, Callable
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3 import Retry
+
+from backend.replay.server import ensure_replay_server
+from config.weather import (
+    FORECAST_HTTP_CACHE_PATH, FORECAST_HTTP_CACHE_EXPIRE_SECONDS, HTTP_POOL_SIZE, HTTP_TIMEOUT_SECONDS,
+    HTTP_MAX_RETRIES, HTTP_BACKOFF_FACTOR
+)
+
+if TYPE_CHECKING:
+    import openmeteo_requests
+    import requests_cache
+
+_clients: dict[str, Any] = {}
+_clients_lock = threading.Lock()
+
+
+class PooledSession(requests.Session):
+    """Session with a keep-alive connection pool, retries and a default timeout on every request."""
+
+    def __init__(self, pool_size: int, max_retries: int, backoff_factor: float, timeout: float):
+        super().__init__()
+        _mount_pooled_adapter(self, pool_size, max_retries, backoff_factor, timeout)
+
+
+class _PooledAdapter(HTTPAdapter):
+    """Adapter that applies ``timeout`` to requests made without one."""
+
+    def __init__(self, timeout: float, **kwargs):
+        super().__init__(**kwargs)
+        self.timeout = timeout
+
+    def send(self, request, timeout=None, **kwargs):
+        return super().send(request, timeout=self.timeout if timeout is None else timeout, **kwargs)
+
+
+def _mount_pooled_adapter(
+        session: requests.Session, pool_size: int, max_retries: int, backoff_factor: float, timeout: float
+) -> None:
+    retries = Retry(
+        total=max_retries,
+        read=max_retries,
+        connect=max_retries,
+        backoff_factor=backoff_factor,
+        status_forcelist=(500, 502, 504),
+        allowed_methods=None
+    )
+    adapter = _PooledAdapter(timeout, pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retries)
+    for prefix in ("http://", "https://"):
+        session.mount(prefix, adapter)
+
+
+def create_geocoding_session(pool_size: int = HTTP_POOL_SIZE) -> PooledSession:
+    ensure_replay_server()
+    return PooledSession(pool_size, HTTP_MAX_RETRIES, HTTP_BACKOFF_FACTOR, HTTP_TIMEOUT_SECONDS)
+
+
+def create_openmeteo_session(
+        cache_name: str = FORECAST_HTTP_CACHE_PATH, pool_size: int = HTTP_POOL_SIZE
+) -> "requests_cache.CachedSession":
+    """HTTP-cached counterpart of :class:`PooledSession`, used for Open-Meteo forecast calls.
+
+    ``requests_cache`` is imported here, so processes that never fetch a forecast do not load it.
+    """
+    import requests_cache
+
+    ensure_replay_server()
+    session = requests_cache.CachedSession(cache_name, expire_after=FORECAST_HTTP_CACHE_EXPIRE_SECONDS)
+    _mount_pooled_adapter(session, pool_size, HTTP_MAX_RETRIES, HTTP_BACKOFF_FACTOR, HTTP_TIMEOUT_SECONDS)
+    return session
+
+
+def get_client(name: str, factory: Callable[[], Any]) -> Any:
+    """Return the process-wide client registered under ``name``, building it with ``factory`` on first use."""
+    client = _clients.get(name)
+    if client is None:
+        with _clients_lock:
+            client = _clients.get(name)
+            if client is None:
+                client = _clients[name] = factory()
+    return client
+
+
+def get_geocoding_session() -> PooledSession:
+    return get_client("geocoding", create_geocoding_session)
+
+
+def get_openmeteo_client() -> "openmeteo_requests.Client":
+    import openmeteo_requests
+
+    return get_client("openmeteo", lambda: openmeteo_requests.Client(session=create_openmeteo_session()))
+
+
+def close_clients() -> None:
+    with _clients_lock:
+        for client in _clients.values():
+            session = getattr(client, "_session", client)
+            session.close()
+        _clients.clear()
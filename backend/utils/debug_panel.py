@@ -0,0 +1,40 @@
+"""Timing breakdown shown under a page when ``DEBUG_PANEL_ENABLED`` is set."""
+import streamlit as st
+
+from backend.utils.rate_limit import rate_limit_stats
+from backend.utils.tracing import Trace, histogram_summaries
+from config.tracing import DEBUG_PANEL_ENABLED
+
+
+def render_debug_panel(last_trace: Trace | None) -> None:
+    """Spans of the page's most recent request, plus the process-wide latency histograms and rate limiters."""
+    if not DEBUG_PANEL_ENABLED:
+        return
+    import pandas as pd
+
+    with st.expander("Debug: request timings"):
+        if last_trace is None or not last_trace.spans:
+            st.caption("No request traced yet in this session.")
+        else:
+            st.write(f"**{last_trace.name}** ({last_trace.trace_id})")
+            started = min(record["start"] for record in last_trace.spans)
+            st.dataframe(pd.DataFrame([
+                {
+                    "span": record["name"],
+                    "start (ms)": round((record["start"] - started) * 1000, 1),
+                    "duration (ms)": round(record["duration_ms"], 1),
+                    "thread": record["thread"],
+                    "attributes": ", ".join(f"{key}={value}" for key, value in record["attributes"].items()),
+                }
+                for record in sorted(last_trace.spans, key=lambda record: record["start"])
+            ]), hide_index=True)
+
+        summaries = histogram_summaries()
+        if summaries:
+            st.write("**Latency histograms (this process)**")
+            st.dataframe(pd.DataFrame.from_dict(summaries, orient="index").round(1))
+
+        limits = rate_limit_stats()
+        if limits:
+            st.write("**Upstream rate limits (this process)**")
+            st.dataframe(pd.DataFrame.from_dict(limits, orient="index"))
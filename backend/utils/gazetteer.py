@@ -0,0 +1,117 @@
+import mmap
+import threading
+from bisect import bisect_left
+
+import numpy as np
+
+from backend.data_models.data_models import Place
+from backend.utils.geocoding import normalize_location_name, split_location_name
+from config.weather import GAZETTEER_PATH
+
+_gazetteer: "Gazetteer | None" = None
+_gazetteer_lock = threading.Lock()
+
+
+class Gazetteer:
+    """Read-only place-name index over a sorted, memory-mapped TSV file.
+
+    Each row is ``key, name, country_code, admin1_code, latitude, longitude, timezone, population``
+    where ``key`` is the normalized name. Rows are sorted by key bytes (largest population first
+    among equal keys), so exact and prefix lookups are binary searches over the mapped file and
+    only the row offsets are held in memory.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as file:
+            self._data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        ends = np.flatnonzero(np.frombuffer(self._data, dtype=np.uint8) == ord("\n"))
+        starts = np.concatenate(([0], ends[:-1] + 1))
+        if self._data[:1] == b"#":
+            starts, ends = starts[1:], ends[1:]
+
+        self._starts = starts.tolist()
+        self._ends = ends.tolist()
+        self._rows = range(len(self._starts))
+
+    def lookup(self, location: str) -> Place | None:
+        """Resolve a location such as "Atlanta" or "Kansas City, KS" to the best matching place.
+
+        Among places sharing a name, one whose country or admin1 code matches a qualifier after
+        the comma wins; without a qualifier the most populous one is returned. A qualifier that
+        matches none of them returns None, leaving the place to the online geocoder.
+        """
+        name, qualifiers = split_location_name(normalize_location_name(location))
+        key = name.encode()
+        if not key:
+            return None
+
+        candidates = []
+        row = bisect_left(self._rows, key, key=self._key_at)
+        while row < len(self._rows) and self._key_at(row) == key:
+            candidates.append(self._place_at(row))
+            row += 1
+
+        if not candidates:
+            return None
+
+        if not qualifiers:
+            return candidates[0]
+        for place in candidates:
+            if {place.country_code.casefold(), place.admin1_code.casefold()} & set(qualifiers):
+                return place
+        return None
+
+    def prefix_search(self, prefix: str, limit: int = 10) -> list[Place]:
+        """Places whose normalized name starts with ``prefix``, most populous first."""
+        key = split_location_name(normalize_location_name(prefix))[0].encode()
+        if not key:
+            return []
+
+        # 0xFF never occurs in UTF-8, so it sorts after every key sharing the prefix.
+        low = bisect_left(self._rows, key, key=self._key_at)
+        high = bisect_left(self._rows, key + b"\xff", lo=low, key=self._key_at)
+        rows = sorted(range(low, high), key=self._population_at, reverse=True)
+
+        places = []
+        for row in rows:
+            place = self._place_at(row)
+            if place not in places:
+                places.append(place)
+                if len(places) == limit:
+                    break
+        return places
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def _key_at(self, row: int) -> bytes:
+        start = self._starts[row]
+        return self._data[start:self._data.find(b"\t", start, self._ends[row])]
+
+    def _population_at(self, row: int) -> int:
+        end = self._ends[row]
+        return int(self._data[self._data.rfind(b"\t", self._starts[row], end) + 1:end])
+
+    def _place_at(self, row: int) -> Place:
+        fields = self._data[self._starts[row]:self._ends[row]].decode("utf-8").split("\t")
+        _, name, country_code, admin1_code, latitude, longitude, timezone, population = fields
+        return Place(name, country_code, admin1_code, float(latitude), float(longitude), timezone, int(population))
+
+
+def get_gazetteer() -> Gazetteer | None:
+    global _gazetteer
+    if _gazetteer is None and GAZETTEER_PATH:
+        with _gazetteer_lock:
+            if _gazetteer is None:
+                _gazetteer = Gazetteer(GAZETTEER_PATH)
+    return _gazetteer
+
+
+def suggest_locations(text: str, limit: int = 5) -> list[str]:
+    """Autocomplete labels for a partially typed location; empty once it already names a known place."""
+    gazetteer = get_gazetteer()
+    if gazetteer is None or not text.strip() or gazetteer.lookup(text) is not None:
+        return []
+    return [place.label for place in gazetteer.prefix_search(text, limit=limit)]
@@ -0,0 +1,125 @@
+"""Location name to coordinates: bundled gazetteer first, then the geocoding cache, then the Open-Meteo geocoding API."""
+import threading
+import unicodedata
+
+from backend.cache.sqlite_cache import SQLiteCache
+from backend.utils.clients import get_geocoding_session
+from backend.utils.rate_limit import limited, report_throttled
+from backend.utils.single_flight import SingleFlight
+from backend.utils.tracing import span
+from config.weather import (
+    GEOCODING_CACHE_MAX_ENTRIES, GEOCODING_CACHE_PATH, GEOCODING_QUALIFIED_RESULTS, GEOCODING_URL
+)
+
+_geocoding_cache: SQLiteCache | None = None
+_geocoding_cache_lock = threading.Lock()
+
+# Concurrent network lookups of one normalized name share a single request (async_weather uses it too).
+geocoding_flights = SingleFlight()
+
+
+def normalize_location_name(location: str) -> str:
+    """Reduce a free-form location to its cache key.
+
+    Case, accents and surrounding/repeated whitespace are folded in the name and in each qualifier
+    after it, so "Atlanta" and "atlanta " map to "atlanta" and "Paris,  TX" to "paris, tx", while
+    "Paris, TX" and "Paris, France" keep separate keys.
+    """
+    name = unicodedata.normalize("NFKD", location)
+    name = "".join(char for char in name if not unicodedata.combining(char))
+    parts = (" ".join(part.casefold().split()) for part in name.split(","))
+    return ", ".join(part for part in parts if part)
+
+
+def split_location_name(cache_key: str) -> tuple[str, list[str]]:
+    """A normalized location's place name and the qualifiers (state, country, ...) that follow it."""
+    name, *qualifiers = cache_key.split(", ")
+    return name, qualifiers
+
+
+def get_geocoding_cache() -> SQLiteCache:
+    global _geocoding_cache
+    if _geocoding_cache is None:
+        with _geocoding_cache_lock:
+            if _geocoding_cache is None:
+                _geocoding_cache = SQLiteCache(GEOCODING_CACHE_PATH, max_entries=GEOCODING_CACHE_MAX_ENTRIES)
+    return _geocoding_cache
+
+
+def _get_location_coordinates(city_name: str) -> tuple[float, float]:
+    with span("geocode") as attributes:
+        cache_key, coordinates = _resolve_location_offline(city_name)
+        attributes["source"] = "offline" if coordinates is not None else "network"
+        if coordinates is not None:
+            return coordinates
+
+        return geocoding_flights.do(cache_key, lambda: _geocode_online(cache_key))
+
+
+def _geocode_online(cache_key: str) -> tuple[float, float]:
+    # A lookup that finished between the offline check and claiming the flight has already filled the cache.
+    coordinates = get_geocoding_cache().get(cache_key)
+    if coordinates is not None:
+        return coordinates
+
+    with limited("geocoding"):
+        response = get_geocoding_session().get(GEOCODING_URL, params=_geocoding_params(cache_key))
+    return _read_geocoding_response(response, cache_key)
+
+
+def _resolve_location_offline(city_name: str) -> tuple[str, tuple[float, float] | None]:
+    """Coordinates from the bundled gazetteer or the geocoding cache, plus the normalized cache key."""
+    # The gazetteer keys its index with normalize_location_name, so it imports this module.
+    from backend.utils.gazetteer import get_gazetteer
+
+    cache_key = normalize_location_name(city_name)
+
+    gazetteer = get_gazetteer()
+    place = gazetteer.lookup(city_name) if gazetteer is not None else None
+    if place is not None:
+        return cache_key, (place.latitude, place.longitude)
+
+    return cache_key, get_geocoding_cache().get(cache_key)
+
+
+def _geocoding_params(cache_key: str) -> dict[str, any]:
+    # The API only searches place names, so a qualified lookup asks for several and picks one itself.
+    name, qualifiers = split_location_name(cache_key)
+    count = GEOCODING_QUALIFIED_RESULTS if qualifiers else 1
+    return {"name": name, "count": count, "language": "en", "format": "json"}
+
+
+def _matches_qualifiers(result: dict[str, any], qualifiers: list[str]) -> bool:
+    """Whether every qualifier names the result's country or one of its admin areas, in full or abbreviated."""
+    fields = [
+        normalize_location_name(str(result[field])) for field in
+        ("country_code", "country", "admin1", "admin2", "admin3", "admin4") if result.get(field)
+    ]
+    return all(any(_abbreviates(qualifier, field) for field in fields) for qualifier in qualifiers)
+
+
+def _abbreviates(qualifier: str, field: str) -> bool:
+    """``qualifier`` is ``field`` itself or, when short, an abbreviation of it ("tx" for "texas")."""
+    if qualifier == field:
+        return True
+    if len(qualifier) > 3 or not field.startswith(qualifier[:1]):
+        return False
+    letters = iter(field[1:])
+    return all(letter in letters for letter in qualifier[1:])
+
+
+def _read_geocoding_response(response, cache_key: str) -> tuple[float, float]:
+    if response.status_code == 429:
+        report_throttled("geocoding", response.headers.get("Retry-After"))
+    if response.status_code != 200:
+        raise Exception("Error getting location coordinates")
+
+    _, qualifiers = split_location_name(cache_key)
+    results = [result for result in response.json().get("results", []) if _matches_qualifiers(result, qualifiers)]
+    if results:
+        result = results[0]
+        coordinates = (result["latitude"], result["longitude"])
+        get_geocoding_cache().set(cache_key, coordinates)
+        return coordinates
+    else:
+        raise ValueError("City not found")
@@ -0,0 +1,154 @@
+import json
+from typing import Any
+
+import numpy as np
+
+from backend.prompts.forecast_encoder import digest_encoded_forecast
+from config.base import HISTORY_RECENT_TURNS, HISTORY_SUMMARY_CHARS, HISTORY_TOKEN_BUDGET
+
+# Rough characters-per-token ratio for English text and JSON; good enough to budget without a tokenizer call.
+CHARS_PER_TOKEN: int = 4
+SUMMARY_HEADER: str = "Summary of the earlier conversation:"
+
+
+def estimate_tokens(contents: Any) -> int:
+    return len(json.dumps(contents, default=str)) // CHARS_PER_TOKEN
+
+
+def digest_tool_result(result: Any) -> Any:
+    """Compact stand-in for a tool result: weather data becomes per-variable min/max/mean, other values are kept.
+
+    Encoded forecasts (what the weather tools return) keep their daily rollups and lose their hourly tables.
+    """
+    if isinstance(result, list):
+        return [digest_tool_result(item) for item in result]
+    if not isinstance(result, dict):
+        return result
+    if isinstance(result.get("data"), str):
+        return {**result, "data": digest_encoded_forecast(result["data"])}
+    if not isinstance(result.get("data"), dict):
+        return result
+
+    data = result["data"]
+    times = data.get("time") or []
+    summary = {}
+    for variable, values in data.items():
+        if variable == "time" or not values:
+            continue
+        column = np.asarray(values, dtype=np.float32)
+        summary[variable] = {
+            "min": round(float(np.nanmin(column)), 1),
+            "max": round(float(np.nanmax(column)), 1),
+            "mean": round(float(np.nanmean(column)), 1),
+        }
+    return {
+        **{key: value for key, value in result.items() if key != "data"},
+        "data": {"from": times[0] if times else None, "to": times[-1] if times else None, "summary": summary},
+    }
+
+
+class ConversationHistoryManager:
+    """Keeps the history sent to the model within a token budget.
+
+    The last ``recent_turns`` turns (a user message and everything up to the next one) are sent verbatim.
+    Older turns have their tool results replaced by digests and long text clipped; if the history is
+    still over budget, the oldest turns are folded into a single summary message, whose oldest lines are
+    dropped last. Recent turns are never cut, so they alone may exceed the budget.
+    """
+
+    def __init__(
+        self,
+        token_budget: int = HISTORY_TOKEN_BUDGET,
+        recent_turns: int = HISTORY_RECENT_TURNS,
+        summary_chars: int = HISTORY_SUMMARY_CHARS,
+    ):
+        self.token_budget = token_budget
+        self.recent_turns = recent_turns
+        self.summary_chars = summary_chars
+        self.requests = 0
+        self.tokens_saved = 0
+        self.last_stats: dict[str, int] = {}
+
+    def compact(self, history: list[dict]) -> list[dict]:
+        """Budgeted copy of ``history``; the input is left untouched."""
+        tokens_before = estimate_tokens(history)
+        turns = _split_turns(history)
+        split = max(len(turns) - self.recent_turns, 0)
+        older = [[self._compact_message(message) for message in turn] for turn in turns[:split]]
+        recent = turns[split:]
+
+        summary_lines = []
+        compacted = _assemble(older, recent, summary_lines)
+        while older and estimate_tokens(compacted) > self.token_budget:
+            summary_lines.extend(line for line in map(self._summary_line, older.pop(0)) if line)
+            compacted = _assemble(older, recent, summary_lines)
+        while summary_lines and estimate_tokens(compacted) > self.token_budget:
+            summary_lines.pop(0)
+            compacted = _assemble(older, recent, summary_lines)
+
+        tokens_after = estimate_tokens(compacted)
+        self.requests += 1
+        self.tokens_saved += tokens_before - tokens_after
+        self.last_stats = {
+            "tokens_before": tokens_before,
+            "tokens_after": tokens_after,
+            "tokens_saved": tokens_before - tokens_after,
+        }
+        return compacted
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            **self.last_stats,
+            "requests": self.requests,
+            "total_tokens_saved": self.tokens_saved,
+            "mean_tokens_saved": self.tokens_saved / self.requests if self.requests else 0.0,
+        }
+
+    def _compact_message(self, message: dict) -> dict:
+        return {**message, "parts": [self._compact_part(part) for part in message["parts"]]}
+
+    def _compact_part(self, part: Any) -> Any:
+        if isinstance(part, str):
+            return self._clip(part)
+        if isinstance(part, dict) and "function_response" in part:
+            function_response = part["function_response"]
+            response = function_response["response"]
+            return {
+                "function_response": {
+                    **function_response,
+                    "response": {**response, "result": digest_tool_result(response.get("result"))},
+                }
+            }
+        return part
+
+    def _summary_line(self, message: dict) -> str:
+        texts = [part for part in message["parts"] if isinstance(part, str)]
+        if texts:
+            return f"{message['role']}: {self._clip(' '.join(texts))}"
+        calls = [part["function_call"] for part in message["parts"] if isinstance(part, dict) and "function_call" in part]
+        if calls:
+            return "model called: " + ", ".join(
+                f"{call.name}({', '.join(f'{key}={value}' for key, value in dict(call.args).items())})" for call in calls
+            )
+        return ""
+
+    def _clip(self, text: str) -> str:
+        return text if len(text) <= self.summary_chars else text[:self.summary_chars].rstrip() + "…"
+
+
+def _split_turns(history: list[dict]) -> list[list[dict]]:
+    """Group messages into turns, each starting at a user message that carries text rather than tool results."""
+    turns: list[list[dict]] = []
+    for message in history:
+        starts_turn = message["role"] == "user" and any(isinstance(part, str) for part in message["parts"])
+        if starts_turn or not turns:
+            turns.append([])
+        turns[-1].append(message)
+    return turns
+
+
+def _assemble(older: list[list[dict]], recent: list[list[dict]], summary_lines: list[str]) -> list[dict]:
+    messages = [message for turn in older + recent for message in turn]
+    if summary_lines:
+        messages.insert(0, {"role": "user", "parts": ["\n".join([SUMMARY_HEADER, *summary_lines])]})
+    return messages
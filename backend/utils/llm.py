@@ -0,0 +1,198 @@
+"""Gemini round trips: the tool-calling loop behind Skye and the Weather_Man report.
+
+``google.generativeai`` is only needed for type hints here; the models themselves come from
+:mod:`config.gemini`.
+"""
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+import itertools
+import queue
+import threading
+import time
+from typing import TYPE_CHECKING
+
+from backend.cache.report_cache import get_report_cache
+from backend.prompts.build_prompt import generate_data_processor_user_prompt
+from backend.data_models.data_models import Tool
+from backend.utils.rate_limit import limited
+from backend.utils.tools import ToolRegistry
+from backend.utils.tracing import propagate, span
+from config.base import TOOL_CALL_CONCURRENCY
+
+if TYPE_CHECKING:
+    from google.generativeai import GenerativeModel
+
+
+def invoke_gemini_tooled_model(
+    model: "GenerativeModel", user_prompt: str, conversation_history: list, tools_list: ToolRegistry | list[Tool]
+) -> str:
+    conversation_history.append({"role": "user", "parts": [user_prompt]})
+
+    registry = _as_registry(tools_list)
+
+    with limited("gemini"), span("llm.tooled.generate_content", round=0):
+        response = model.generate_content(conversation_history)
+    function_calls = _get_function_calls(response)
+
+    round_index = 0
+    while function_calls:
+        _append_function_turn(conversation_history, function_calls, _execute_function_calls(function_calls, registry))
+        round_index += 1
+        with limited("gemini"), span("llm.tooled.generate_content", round=round_index):
+            response = model.generate_content(conversation_history)
+        function_calls = _get_function_calls(response)
+
+    return response.candidates[0].content.parts[0].text
+
+
+def stream_gemini_tooled_model(
+    model: "GenerativeModel", user_prompt: str, conversation_history: list, tools_list: ToolRegistry | list[Tool],
+    metrics: dict | None = None
+) -> Iterator[str]:
+    """Streaming variant of :func:`invoke_gemini_tooled_model` that yields answer text as it is generated.
+
+    Function calls arriving mid-stream are executed once that response ends and the model is streamed again with
+    their results. If ``metrics`` is given, ``time_to_first_token`` (seconds) is recorded in it.
+    """
+    started = time.perf_counter()
+    conversation_history.append({"role": "user", "parts": [user_prompt]})
+
+    registry = _as_registry(tools_list)
+
+    for round_index in itertools.count():
+        function_calls = []
+        streamed_text = []
+        for part in _stream_parts(model, conversation_history, round_index):
+            if part.function_call:
+                function_calls.append(part.function_call)
+            elif part.text:
+                if metrics is not None and "time_to_first_token" not in metrics:
+                    metrics["time_to_first_token"] = time.perf_counter() - started
+                streamed_text.append(part.text)
+                yield part.text
+
+        if not function_calls:
+            return
+        # Text already shown to the user belongs to the same model turn as the calls.
+        _append_function_turn(conversation_history, function_calls, _execute_function_calls(function_calls, registry),
+                              text="".join(streamed_text))
+
+
+def _stream_parts(model: "GenerativeModel", conversation_history: list, round_index: int) -> Iterator:
+    """Parts of one streamed response, read on a worker thread.
+
+    The ``generate_content`` span then times the model alone, not the consumer rendering each part, and a
+    consumer that stops early only makes the reader stop at the next chunk.
+    """
+    parts = queue.Queue()
+    stopped = threading.Event()
+
+    def read() -> None:
+        try:
+            with limited("gemini"), span("llm.tooled.generate_content", round=round_index, stream=True) as attributes:
+                for chunk in model.generate_content(conversation_history, stream=True):
+                    if stopped.is_set():
+                        attributes["abandoned"] = True
+                        break
+                    if chunk.candidates:
+                        for part in chunk.candidates[0].content.parts:
+                            parts.put(part)
+        except Exception as e:
+            parts.put(e)
+        finally:
+            parts.put(None)
+
+    threading.Thread(target=propagate(read), name="gemini-stream", daemon=True).start()
+    try:
+        while (part := parts.get()) is not None:
+            if isinstance(part, Exception):
+                raise part
+            yield part
+    finally:
+        stopped.set()
+
+
+def _append_function_turn(
+        conversation_history: list, function_calls: list, function_results: list, text: str = ""
+) -> None:
+    conversation_history.append({
+        "role": "model",
+        "parts": ([text] if text else []) + [{"function_call": function_call} for function_call in function_calls]
+    })
+
+    conversation_history.append({
+        "role": "user",
+        "parts": [
+            {
+                "function_response": {
+                    "name": function_call.name,
+                    "response": {"result": function_result}
+                }
+            }
+            for function_call, function_result in zip(function_calls, function_results)
+        ]
+    })
+
+
+def _get_function_calls(response) -> list:
+    return [part.function_call for part in response.candidates[0].content.parts if part.function_call]
+
+
+def _as_registry(tools_list: ToolRegistry | list[Tool]) -> ToolRegistry:
+    return tools_list if isinstance(tools_list, ToolRegistry) else ToolRegistry(tools_list)
+
+
+def _execute_function_calls(function_calls: list, registry: ToolRegistry) -> list:
+    """Run every tool call of one model turn, concurrently when there are several; results keep the call order.
+
+    Arguments are validated first, so a malformed call is answered with a structured error without running the tool.
+    """
+    def execute(function_call) -> any:
+        tool = registry.tools.get(function_call.name)
+        if tool is None:
+            return {"error": f"Function {function_call.name} not found"}
+        with span(f"tool.{function_call.name}") as attributes:
+            args, error = registry.validate(function_call.name, dict(function_call.args))
+            if error is not None:
+                attributes["error"] = "InvalidArguments"
+                return error
+            try:
+                return tool.function(**args)
+            except Exception as e:
+                attributes["error"] = type(e).__name__
+                return {"error": f"Function {function_call.name} failed: {e}"}
+
+    if len(function_calls) == 1:
+        return [execute(function_calls[0])]
+
+    with ThreadPoolExecutor(max_workers=min(TOOL_CALL_CONCURRENCY, len(function_calls))) as executor:
+        return list(executor.map(propagate(execute), function_calls))
+
+
+def invoke_gemini_data_processor_model(model: "GenerativeModel", user_prompt: str) -> str:
+    with limited("gemini"), span("llm.data_processor.generate_content"):
+        response = model.generate_content({"role": "user", "parts": [user_prompt]})
+    return response.candidates[0].content.parts[0].text
+
+
+def get_weather_report(model: "GenerativeModel", weather_result: dict[str, any], preferred_units: str) -> str:
+    """Weather_Man report for a fetched forecast.
+
+    Served from the shared report cache when the same location, date, units and forecast content were already
+    reported; reports for failed lookups are generated every time and never cached.
+    """
+    forecast = weather_result["data"]
+    location, event_date = weather_result["location"], weather_result["date"]
+
+    def prompt() -> str:
+        return generate_data_processor_user_prompt(weather_result, location, event_date, preferred_units)
+
+    if forecast is None:
+        return invoke_gemini_data_processor_model(model, prompt())
+
+    report_cache = get_report_cache()
+    report = report_cache.get(location, event_date, preferred_units, forecast)
+    if report is None:
+        report = invoke_gemini_data_processor_model(model, prompt())
+        report_cache.set(location, event_date, preferred_units, forecast, report)
+    return report
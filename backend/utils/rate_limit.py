@@ -0,0 +1,247 @@
+"""Process-wide token buckets in front of the upstream APIs.
+
+Open-Meteo forecast and geocoding requests and Gemini ``generate_content`` calls each take a token from their
+endpoint's bucket (budgets in :mod:`config.rate_limits`) before going out, so the process as a whole stays at
+the upstream limit however many sessions are active. Callers finding the bucket empty queue up; the queue is
+served round-robin across requests (keyed by the current trace), so one answer fanning out into many tool calls
+cannot starve another session. A 429 pauses the whole endpoint rather than letting every caller retry on its own.
+Time spent waiting is recorded as ``ratelimit.<endpoint>`` spans.
+"""
+import asyncio
+import concurrent.futures
+import threading
+import time
+from collections import OrderedDict, deque
+from collections.abc import AsyncIterator, Hashable, Iterator
+from concurrent.futures import Future
+from contextlib import asynccontextmanager, contextmanager
+
+from backend.utils.tracing import current_trace, span
+from config.rate_limits import (
+    RATE_LIMIT_ENABLED, RATE_LIMIT_MAX_WAIT_SECONDS, RATE_LIMIT_THROTTLED_PAUSE_SECONDS, RATE_LIMITS
+)
+
+_limiters: dict[str, "RateLimiter | None"] = {}
+_limiters_lock = threading.Lock()
+
+
+class RateLimitExceeded(Exception):
+    """A caller waited longer than ``RATE_LIMIT_MAX_WAIT_SECONDS`` for a token."""
+
+
+class RateLimiter:
+    """Token bucket refilled at ``rate`` per second up to ``burst``, with a fair queue of waiting callers.
+
+    Waiters are ``concurrent.futures.Future`` objects, so threads and coroutines queue together. Whoever is
+    waiting wakes when the next token is due and hands out every available token, one queue key at a time.
+    """
+
+    def __init__(self, name: str, rate: float, burst: int, max_wait: float = RATE_LIMIT_MAX_WAIT_SECONDS):
+        self.name = name
+        self.rate = rate
+        self.burst = max(burst, 1)
+        self.max_wait = max_wait
+        self._tokens = float(self.burst)
+        # Tokens accrue from this instant on; a pause moves it into the future.
+        self._refilled_at = time.monotonic()
+        self._queues: OrderedDict[Hashable, deque[Future]] = OrderedDict()
+        self._queued = 0
+        self._lock = threading.Lock()
+        self.granted = 0
+        self.rejected = 0
+        self.throttled = 0
+        self.max_queued = 0
+
+    def acquire(self, key: Hashable | None = None) -> None:
+        """Block until a token is granted; raises :class:`RateLimitExceeded` after ``max_wait`` seconds."""
+        with span(f"ratelimit.{self.name}") as attributes:
+            key, waiter = self._enqueue(key, attributes)
+            if waiter is None:
+                return
+            deadline = time.monotonic() + self.max_wait
+            try:
+                while not waiter.done():
+                    concurrent.futures.wait([waiter], timeout=self._next_wait(key, waiter, deadline))
+            except BaseException:
+                self._give_up(key, waiter)
+                raise
+
+    async def acquire_async(self, key: Hashable | None = None) -> None:
+        with span(f"ratelimit.{self.name}") as attributes:
+            key, waiter = self._enqueue(key, attributes)
+            if waiter is None:
+                return
+            deadline = time.monotonic() + self.max_wait
+            granted = asyncio.wrap_future(waiter)
+            try:
+                while not waiter.done():
+                    await asyncio.wait({granted}, timeout=self._next_wait(key, waiter, deadline))
+            except BaseException:
+                self._give_up(key, waiter)
+                raise
+
+    def pause(self, seconds: float) -> None:
+        """Hand out no tokens for ``seconds``, then restart from an empty bucket."""
+        with self._lock:
+            self.throttled += 1
+            self._refill(time.monotonic())
+            self._tokens = min(self._tokens, 0.0)
+            self._refilled_at = max(self._refilled_at, time.monotonic() + seconds)
+
+    def stats(self) -> dict[str, float]:
+        with self._lock:
+            self._refill(time.monotonic())
+            return {
+                "rate": self.rate,
+                "burst": self.burst,
+                "tokens": round(self._tokens, 2),
+                "queued": self._queued,
+                "max_queued": self.max_queued,
+                "granted": self.granted,
+                "rejected": self.rejected,
+                "throttled": self.throttled,
+            }
+
+    def _enqueue(self, key: Hashable | None, attributes: dict) -> tuple[Hashable, Future | None]:
+        """Take a token straight away if nobody is queued; otherwise join the queue for ``key``."""
+        if key is None:
+            trace = current_trace()
+            key = trace.trace_id if trace is not None else threading.get_ident()
+        with self._lock:
+            self._refill(time.monotonic())
+            if not self._queues and self._tokens >= 1:
+                self._grant()
+                attributes["queued"] = 0
+                return key, None
+            waiter = Future()
+            self._queues.setdefault(key, deque()).append(waiter)
+            self._queued += 1
+            self.max_queued = max(self.max_queued, self._queued)
+            attributes["queued"] = self._queued
+        return key, waiter
+
+    def _next_wait(self, key: Hashable, waiter: Future, deadline: float) -> float:
+        """Hand out the tokens that are due; seconds until this waiter should look again."""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            while self._queues and self._tokens >= 1:
+                queue_key, queue = next(iter(self._queues.items()))
+                granted = queue.popleft()
+                self._queued -= 1
+                if queue:
+                    self._queues.move_to_end(queue_key)
+                else:
+                    del self._queues[queue_key]
+                self._grant()
+                granted.set_result(None)
+            if waiter.done():
+                return 0.0
+            next_token = max(self._refilled_at - now, 0.0) + (1 - self._tokens) / self.rate
+
+        remaining = deadline - now
+        if remaining <= 0 and self._give_up(key, waiter, rejected=True):
+            raise RateLimitExceeded(f"No {self.name} request budget left after waiting {self.max_wait:g}s")
+        return max(min(next_token, remaining), 0.0)
+
+    def _give_up(self, key: Hashable, waiter: Future, rejected: bool = False) -> bool:
+        """Leave the queue unless a token was already granted; True if the waiter left without one."""
+        with self._lock:
+            if not waiter.cancel():
+                return False
+            self.rejected += rejected
+            queue = self._queues.get(key)
+            if queue is not None and waiter in queue:
+                queue.remove(waiter)
+                self._queued -= 1
+                if not queue:
+                    del self._queues[key]
+            return True
+
+    def _grant(self) -> None:
+        self._tokens -= 1
+        self.granted += 1
+
+    def _refill(self, now: float) -> None:
+        if now > self._refilled_at:
+            self._tokens = min(self.burst, self._tokens + (now - self._refilled_at) * self.rate)
+            self._refilled_at = now
+
+
+def get_rate_limiter(endpoint: str) -> RateLimiter | None:
+    """The process-wide limiter for ``endpoint``; None when the endpoint is unlimited or limits are off."""
+    try:
+        return _limiters[endpoint]
+    except KeyError:
+        pass
+    with _limiters_lock:
+        if endpoint not in _limiters:
+            rate, burst = RATE_LIMITS.get(endpoint, (0, 0))
+            _limiters[endpoint] = RateLimiter(endpoint, rate, burst) if RATE_LIMIT_ENABLED and rate > 0 else None
+        return _limiters[endpoint]
+
+
+def rate_limit_stats() -> dict[str, dict[str, float]]:
+    with _limiters_lock:
+        limiters = dict(_limiters)
+    return {name: limiter.stats() for name, limiter in sorted(limiters.items()) if limiter is not None}
+
+
+def reset_rate_limiters() -> None:
+    with _limiters_lock:
+        _limiters.clear()
+
+
+@contextmanager
+def limited(endpoint: str) -> Iterator[None]:
+    """Wait for a token for one ``endpoint`` call made inside the block; a 429 it raises pauses the endpoint."""
+    limiter = get_rate_limiter(endpoint)
+    if limiter is not None:
+        limiter.acquire()
+    try:
+        yield
+    except Exception as e:
+        if is_throttled(e):
+            report_throttled(endpoint)
+        raise
+
+
+@asynccontextmanager
+async def limited_async(endpoint: str) -> AsyncIterator[None]:
+    limiter = get_rate_limiter(endpoint)
+    if limiter is not None:
+        await limiter.acquire_async()
+    try:
+        yield
+    except Exception as e:
+        if is_throttled(e):
+            report_throttled(endpoint)
+        raise
+
+
+def report_throttled(endpoint: str, retry_after: str | float | None = None) -> None:
+    """Pause ``endpoint`` after the upstream answered 429, for ``Retry-After`` seconds when it sent one."""
+    limiter = get_rate_limiter(endpoint)
+    if limiter is None:
+        return
+    try:
+        seconds = float(retry_after)
+    except (TypeError, ValueError):
+        seconds = RATE_LIMIT_THROTTLED_PAUSE_SECONDS
+    limiter.pause(seconds)
+
+
+def is_throttled(error: BaseException) -> bool:
+    """Whether ``error`` (or an exception it wraps) is an upstream 429."""
+    seen = 0
+    while error is not None and seen < 5:
+        response = getattr(error, "response", None)
+        if 429 in (getattr(error, "code", None), getattr(error, "status_code", None),
+                   getattr(response, "status_code", None)):
+            return True
+        # Open-Meteo reports its limits in the error body: "Minutely API request limit exceeded. ..."
+        if "request limit exceeded" in str(error).lower():
+            return True
+        error = error.__cause__ or error.__context__
+        seen += 1
+    return False
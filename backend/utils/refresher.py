@@ -0,0 +1,140 @@
+"""Background refresh of the forecasts users ask for most.
+
+:class:`ForecastRefresher` scores each forecast grid point by how often it is requested, decaying older requests
+with a half-life. A daemon thread re-fetches the hottest points shortly before their cache entry expires, and
+straight away for a point that was just served past its TTL, so popular cities never show a cold miss. Refreshes
+go through the same single-flight and rate limiter as user requests.
+"""
+import logging
+import math
+import threading
+import time
+
+from backend.cache.forecast_cache import get_forecast_cache
+from backend.utils.tracing import span
+from config.weather import (
+    FORECAST_REFRESH_AHEAD_SECONDS, FORECAST_REFRESH_ENABLED, FORECAST_REFRESH_HALF_LIFE_SECONDS,
+    FORECAST_REFRESH_HOT_LOCATIONS, FORECAST_REFRESH_INTERVAL_SECONDS, FORECAST_REFRESH_MIN_REQUESTS
+)
+
+_logger = logging.getLogger(__name__)
+
+_forecast_refresher: "ForecastRefresher | None" = None
+_forecast_refresher_lock = threading.Lock()
+
+
+class ForecastRefresher:
+    def __init__(self, hot_locations: int = FORECAST_REFRESH_HOT_LOCATIONS,
+                 half_life: float = FORECAST_REFRESH_HALF_LIFE_SECONDS, min_requests: float = FORECAST_REFRESH_MIN_REQUESTS,
+                 refresh_ahead: float = FORECAST_REFRESH_AHEAD_SECONDS,
+                 interval: float = FORECAST_REFRESH_INTERVAL_SECONDS):
+        self.hot_locations = hot_locations
+        self.half_life = half_life
+        self.min_requests = min_requests
+        self.refresh_ahead = refresh_ahead
+        self.interval = interval
+        self.refreshed = 0
+        self.failed = 0
+
+        # Grid point -> (decayed request count, monotonic time it was last brought up to date).
+        self._scores: dict[tuple[float, float], tuple[float, float]] = {}
+        self._urgent: set[tuple[float, float]] = set()
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def record(self, points) -> None:
+        """Count one request for each grid point."""
+        now = time.monotonic()
+        with self._lock:
+            for point in points:
+                score, updated = self._scores.get(point, (0.0, now))
+                self._scores[point] = (self._decayed(score, now - updated) + 1, now)
+
+    def request_refresh(self, point: tuple[float, float]) -> None:
+        """Refresh ``point`` on the next pass, which starts right away."""
+        with self._lock:
+            self._urgent.add(point)
+        self._wake.set()
+
+    def hot_points(self) -> list[tuple[float, float]]:
+        """The most requested grid points, hottest first; points whose score has decayed away are forgotten."""
+        now = time.monotonic()
+        with self._lock:
+            scores = {point: self._decayed(score, now - updated) for point, (score, updated) in self._scores.items()}
+            self._scores = {
+                point: (score, now) for point, score in scores.items() if score >= self.min_requests / 8
+            }
+        ranked = sorted(scores, key=scores.get, reverse=True)[:self.hot_locations]
+        return [point for point in ranked if scores[point] >= self.min_requests]
+
+    def due_points(self, start_date: str) -> list[tuple[float, float]]:
+        """Points asked to be refreshed, plus hot points whose forecast is missing or expires within ``refresh_ahead``."""
+        with self._lock:
+            due, self._urgent = list(self._urgent), set()
+
+        forecast_cache = get_forecast_cache()
+        refresh_by = time.time() + self.refresh_ahead
+        for point in self.hot_points():
+            if point in due:
+                continue
+            entry = forecast_cache.lookup(*point, start_date, peek=True)
+            if entry is None or (entry.fresh_until is not None and entry.fresh_until <= refresh_by):
+                due.append(point)
+        return due
+
+    def refresh_due(self) -> int:
+        """One refresh pass; the number of forecasts fetched."""
+        # weather records requests here, so it is imported on use.
+        from backend.utils.weather import _forecast_window, refresh_forecasts
+
+        start_date, end_date = _forecast_window()
+        points = self.due_points(start_date)
+        if not points:
+            return 0
+        with span("forecast.refresh", points=len(points)) as attributes:
+            refreshed, failed = refresh_forecasts(points, start_date, end_date)
+            attributes["failed"] = failed
+        self.refreshed += refreshed
+        self.failed += failed
+        return refreshed
+
+    def start(self) -> None:
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="forecast-refresher", daemon=True)
+                self._thread.start()
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            tracked = len(self._scores)
+        return {"tracked": tracked, "refreshed": self.refreshed, "failed": self.failed}
+
+    def _run(self) -> None:
+        while True:
+            self._wake.wait(self.interval)
+            self._wake.clear()
+            try:
+                self.refresh_due()
+            except Exception:
+                # Failed fetches are counted by refresh_due; this is a pass that broke before or around them.
+                # The thread has no caller to raise to, so log it and let the next pass try again.
+                self.failed += 1
+                _logger.exception("Forecast refresh pass failed")
+
+    def _decayed(self, score: float, elapsed: float) -> float:
+        return score * math.pow(0.5, elapsed / self.half_life)
+
+
+def get_forecast_refresher() -> ForecastRefresher | None:
+    """The process-wide refresher, started on first use; None when background refresh is turned off."""
+    global _forecast_refresher
+    if not FORECAST_REFRESH_ENABLED:
+        return None
+    if _forecast_refresher is None:
+        with _forecast_refresher_lock:
+            if _forecast_refresher is None:
+                refresher = ForecastRefresher()
+                refresher.start()
+                _forecast_refresher = refresher
+    return _forecast_refresher
@@ -0,0 +1,90 @@
+"""Coalescing of concurrent identical upstream calls.
+
+The first caller for a key becomes its leader and makes the call; callers arriving while it is in flight wait
+for the same result instead of calling again. Results travel in ``concurrent.futures.Future`` objects, so
+threads (the sync weather path) and coroutines on any event loop (``async_weather``) share in-flight calls.
+Nothing is kept once a call finishes; caching finished results is left to the callers' caches.
+"""
+import asyncio
+import threading
+from collections.abc import Awaitable, Hashable
+from concurrent.futures import Future
+from typing import Any, Callable, TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    def __init__(self):
+        self._calls: dict[Hashable, Future] = {}
+        self._lock = threading.Lock()
+        self.leaders = 0
+        self.followers = 0
+
+    def claim(self, key: Hashable) -> tuple[Future, bool]:
+        """The future for ``key`` and whether the caller leads it (and must :meth:`resolve` it)."""
+        with self._lock:
+            future = self._calls.get(key)
+            if future is not None:
+                self.followers += 1
+                return future, False
+            future = self._calls[key] = Future()
+            self.leaders += 1
+            return future, True
+
+    def resolve(self, key: Hashable, result: Any = None, error: BaseException | None = None,
+                future: Future | None = None) -> None:
+        """Hand the leader's outcome to every waiting caller; a key that is no longer in flight is ignored.
+
+        With ``future``, only that claim is resolved, so a leader cleaning up after itself never settles a newer
+        claim on the same key.
+        """
+        with self._lock:
+            if future is None:
+                future = self._calls.pop(key, None)
+            elif self._calls.get(key) is future:
+                del self._calls[key]
+            else:
+                return
+        if future is None or future.done():
+            return
+        if error is None:
+            future.set_result(result)
+        else:
+            future.set_exception(_shareable(key, error))
+
+    def do(self, key: Hashable, function: Callable[[], T]) -> T:
+        future, is_leader = self.claim(key)
+        if not is_leader:
+            return future.result()
+        try:
+            result = function()
+        except BaseException as e:
+            self.resolve(key, error=e)
+            raise
+        self.resolve(key, result)
+        return result
+
+    async def do_async(self, key: Hashable, function: Callable[[], Awaitable[T]]) -> T:
+        future, is_leader = self.claim(key)
+        if not is_leader:
+            # Shielded: cancelling the wrapper would cancel the shared future for every other caller.
+            return await asyncio.shield(asyncio.wrap_future(future))
+        try:
+            result = await function()
+        except BaseException as e:
+            self.resolve(key, error=e)
+            raise
+        self.resolve(key, result)
+        return result
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._calls)
+
+
+def _shareable(key: Hashable, error: BaseException) -> Exception:
+    # A leader's cancellation or interrupt is its own; waiting callers get an ordinary failure instead.
+    if isinstance(error, Exception):
+        return error
+    return RuntimeError(f"Shared call for {key!r} was interrupted")
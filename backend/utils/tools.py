@@ -0,0 +1,142 @@
+"""Declarative registry of the chatbot's tools.
+
+Each :class:`Tool`'s ``params`` are turned into a Gemini function declaration once, when the registry is built,
+rather than the SDK re-inspecting Python signatures every time a model is built. Calls the model makes are checked
+against the same specs before anything runs. Arguments are coerced where the intent is unambiguous (a lone string
+for an array, ``2025/06/01`` for a date), and a call that still does not fit comes back as a structured error in
+microseconds, with no tool execution and no network. A param spec holds ``type``, ``description`` and
+``required``, optionally a ``format`` (``"date"``) and a ``validator`` returning an error message or None.
+"""
+from collections.abc import Iterable
+from datetime import datetime
+from typing import Any, Callable
+
+from backend.data_models.data_models import Tool
+
+# Param types used in Tool specs -> JSON schema for the function declaration.
+_SCHEMA_TYPES: dict[str, dict[str, Any]] = {
+    "string": {"type": "string"},
+    "integer": {"type": "integer"},
+    "number": {"type": "number"},
+    "boolean": {"type": "boolean"},
+    "array of strings": {"type": "array", "items": {"type": "string"}},
+}
+
+
+class ToolRegistry:
+    def __init__(self, tools: list[Tool]):
+        for tool in tools:
+            for param_name, param_info in tool.params.items():
+                if param_info["type"] not in _SCHEMA_TYPES:
+                    raise ValueError(f"Unsupported type {param_info['type']!r} for {tool.name}.{param_name}")
+        self.tools: dict[str, Tool] = {tool.name: tool for tool in tools}
+        self.declarations: list[dict[str, Any]] = [_declaration(tool) for tool in tools]
+
+    def __iter__(self):
+        return iter(self.tools.values())
+
+    def __len__(self) -> int:
+        return len(self.tools)
+
+    def validate(self, name: str, args: dict[str, Any]) -> tuple[dict[str, Any], dict[str, Any] | None]:
+        """Coerced arguments for a call to ``name``, and the structured error if they cannot be used."""
+        tool = self.tools.get(name)
+        if tool is None:
+            return args, {"error": f"Function {name} not found"}
+
+        coerced: dict[str, Any] = {}
+        problems: dict[str, str] = {}
+        for param_name, value in args.items():
+            param_info = tool.params.get(param_name)
+            if param_info is None:
+                problems[param_name] = "unexpected argument"
+                continue
+            try:
+                coerced[param_name] = _coerce(value, param_info)
+            except ValueError as e:
+                problems[param_name] = str(e)
+                continue
+            validator: Callable[[Any], str | None] | None = param_info.get("validator")
+            problem = validator(coerced[param_name]) if validator is not None else None
+            if problem:
+                problems[param_name] = problem
+
+        for param_name, param_info in tool.params.items():
+            if param_info.get("required", False) and param_name not in args:
+                problems[param_name] = "missing required argument"
+
+        if problems:
+            return coerced, {"error": f"Invalid arguments for {name}", "invalid_arguments": problems}
+        return coerced, None
+
+    def execute(self, name: str, args: dict[str, Any]) -> Any:
+        """Run the tool on validated arguments; a structured error instead if they do not validate."""
+        coerced, error = self.validate(name, args)
+        if error is not None:
+            return error
+        return self.tools[name].function(**coerced)
+
+
+def _declaration(tool: Tool) -> dict[str, Any]:
+    description = f"{tool.description} {tool.constraints}".strip()
+    properties = {
+        param_name: {**_SCHEMA_TYPES[param_info["type"]], "description": param_info["description"]}
+        for param_name, param_info in tool.params.items()
+    }
+    declaration: dict[str, Any] = {"name": tool.name, "description": description}
+    if properties:
+        declaration["parameters"] = {
+            "type": "object",
+            "properties": properties,
+            "required": [name for name, info in tool.params.items() if info.get("required", False)],
+        }
+    return declaration
+
+
+def _coerce(value: Any, param_info: dict[str, Any]) -> Any:
+    param_type = param_info["type"]
+    if param_type == "string":
+        value = _coerce_string(value)
+        return _coerce_date(value) if param_info.get("format") == "date" else value
+    if param_type == "array of strings":
+        if isinstance(value, str):
+            value = [value]
+        elif not isinstance(value, Iterable) or isinstance(value, dict):
+            raise ValueError(f"expected a list of strings, got {type(value).__name__}")
+        values = [_coerce_string(item) for item in value]
+        if not values:
+            raise ValueError("expected at least one value")
+        return values
+    if param_type == "boolean":
+        if isinstance(value, str) and value.strip().lower() in ("true", "false"):
+            return value.strip().lower() == "true"
+        if not isinstance(value, bool):
+            raise ValueError(f"expected true or false, got {value!r}")
+        return value
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"expected a {param_type}, got {value!r}") from None
+    if param_type == "integer":
+        if not number.is_integer():
+            raise ValueError(f"expected an integer, got {value!r}")
+        return int(number)
+    return number
+
+
+def _coerce_string(value: Any) -> str:
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        value = str(value)
+    if not isinstance(value, str):
+        raise ValueError(f"expected a string, got {type(value).__name__}")
+    value = value.strip()
+    if not value:
+        raise ValueError("expected a non-empty string")
+    return value
+
+
+def _coerce_date(value: str) -> str:
+    try:
+        return datetime.fromisoformat(value.replace("/", "-")).date().isoformat()
+    except ValueError:
+        raise ValueError(f"expected a date in YYYY-MM-DD format, got {value!r}") from None
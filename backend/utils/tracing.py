@@ -0,0 +1,189 @@
+"""Lightweight spans and latency histograms for the request path.
+
+A page opens a :func:`trace` around one user request; :func:`span` blocks inside it (geocoding, forecast fetch,
+transform, each ``generate_content`` and each tool call) record their duration into a per-name
+:class:`Histogram` and into the trace, so one slow answer can be broken down afterwards. Spans outside a trace
+still feed the histograms. The current trace and span travel in ``contextvars``; code handing work to a thread
+pool wraps it with :func:`propagate` so those spans keep their parent.
+"""
+import contextvars
+import itertools
+import json
+import threading
+import time
+from bisect import bisect_left
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import Any, Callable, TypeVar
+
+from config.tracing import TRACE_EXPORT_PATH, TRACE_HISTOGRAM_BUCKETS_MS, TRACE_MAX_SPANS, TRACING_ENABLED
+
+T = TypeVar("T")
+
+_current_trace: contextvars.ContextVar["Trace | None"] = contextvars.ContextVar("current_trace", default=None)
+_current_span: contextvars.ContextVar[int | None] = contextvars.ContextVar("current_span", default=None)
+_ids = itertools.count(1)
+
+_histograms: dict[str, "Histogram"] = {}
+_histograms_lock = threading.Lock()
+_export_lock = threading.Lock()
+
+
+class Histogram:
+    """Fixed-bucket latency histogram; percentiles are the upper bound of the bucket they fall in."""
+
+    def __init__(self, buckets_ms: tuple[float, ...] = TRACE_HISTOGRAM_BUCKETS_MS):
+        self.buckets_ms = buckets_ms
+        self.counts = [0] * (len(buckets_ms) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.min_ms = float("inf")
+        self.max_ms = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, duration_ms: float) -> None:
+        with self._lock:
+            self.counts[bisect_left(self.buckets_ms, duration_ms)] += 1
+            self.count += 1
+            self.total_ms += duration_ms
+            self.min_ms = min(self.min_ms, duration_ms)
+            self.max_ms = max(self.max_ms, duration_ms)
+
+    def percentile(self, fraction: float) -> float:
+        with self._lock:
+            if not self.count:
+                return 0.0
+            rank = fraction * self.count
+            seen = 0
+            for index, count in enumerate(self.counts):
+                seen += count
+                if seen >= rank:
+                    return min(self.buckets_ms[index], self.max_ms) if index < len(self.buckets_ms) else self.max_ms
+            return self.max_ms
+
+    def summary(self) -> dict[str, float]:
+        return {
+            "count": self.count,
+            "mean_ms": self.total_ms / self.count if self.count else 0.0,
+            "min_ms": self.min_ms if self.count else 0.0,
+            "p50_ms": self.percentile(0.5),
+            "p95_ms": self.percentile(0.95),
+            "p99_ms": self.percentile(0.99),
+            "max_ms": self.max_ms,
+        }
+
+
+class Trace:
+    """Spans finished while handling one request, oldest first."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.trace_id = f"{time.time_ns():x}-{next(_ids)}"
+        self.spans: list[dict[str, Any]] = []
+        self._lock = threading.Lock()
+
+    def add(self, record: dict[str, Any]) -> None:
+        with self._lock:
+            if len(self.spans) < TRACE_MAX_SPANS:
+                self.spans.append(record)
+
+
+@contextmanager
+def trace(name: str, **attributes: Any) -> Iterator[Trace]:
+    """Root span for one request; spans started inside it (in this context) are collected on the yielded trace."""
+    current = Trace(name)
+    token = _current_trace.set(current)
+    try:
+        with span(name, **attributes):
+            yield current
+    finally:
+        _reset(_current_trace, token)
+
+
+@contextmanager
+def span(name: str, **attributes: Any) -> Iterator[dict[str, Any]]:
+    """Time the block into the ``name`` histogram; the yielded dict collects extra attributes for the record."""
+    if not TRACING_ENABLED:
+        yield attributes
+        return
+
+    span_id = next(_ids)
+    parent_id = _current_span.get()
+    token = _current_span.set(span_id)
+    started_at = time.time()
+    started = time.perf_counter()
+    try:
+        yield attributes
+    except BaseException as e:
+        attributes["error"] = type(e).__name__
+        raise
+    finally:
+        duration_ms = (time.perf_counter() - started) * 1000
+        _reset(_current_span, token)
+        get_histogram(name).observe(duration_ms)
+
+        current = _current_trace.get()
+        record = {
+            "trace_id": current.trace_id if current else None,
+            "span_id": span_id,
+            "parent_id": parent_id,
+            "name": name,
+            "start": started_at,
+            "duration_ms": duration_ms,
+            "thread": threading.current_thread().name,
+            "attributes": attributes,
+        }
+        if current is not None:
+            current.add(record)
+        if TRACE_EXPORT_PATH:
+            _export(TRACE_EXPORT_PATH, record)
+
+
+def propagate(function: Callable[..., T]) -> Callable[..., T]:
+    """``function`` bound to a copy of the caller's context, for handing to another thread."""
+    context = contextvars.copy_context()
+    return lambda *args, **kwargs: context.copy().run(function, *args, **kwargs)
+
+
+def current_trace() -> Trace | None:
+    return _current_trace.get()
+
+
+def get_histogram(name: str) -> Histogram:
+    histogram = _histograms.get(name)
+    if histogram is None:
+        with _histograms_lock:
+            histogram = _histograms.setdefault(name, Histogram())
+    return histogram
+
+
+def histogram_summaries() -> dict[str, dict[str, float]]:
+    with _histograms_lock:
+        histograms = dict(_histograms)
+    return {name: histograms[name].summary() for name in sorted(histograms)}
+
+
+def export_histograms(path: str) -> None:
+    """Append one JSON line per histogram with its current summary."""
+    exported_at = time.time()
+    for name, summary in histogram_summaries().items():
+        _export(path, {"histogram": name, "exported_at": exported_at, **summary})
+
+
+def reset_histograms() -> None:
+    with _histograms_lock:
+        _histograms.clear()
+
+
+def _export(path: str, record: dict[str, Any]) -> None:
+    line = json.dumps(record, default=str)
+    with _export_lock, open(path, "a", encoding="utf-8") as export_file:
+        export_file.write(line + "\n")
+
+
+def _reset(variable: contextvars.ContextVar, token: contextvars.Token) -> None:
+    # A streaming generator abandoned mid-way is closed from whatever context collects it.
+    try:
+        variable.reset(token)
+    except ValueError:
+        pass
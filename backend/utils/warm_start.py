@@ -0,0 +1,51 @@
+"""Prefetch of a configured city list when a process starts.
+
+Every page calls :func:`warm_start`; the first call in a process reads ``WARM_START_CITIES_PATH`` and fetches those
+forecasts on a background thread, through the batch path, so geocoding runs concurrently and the forecasts go out in
+as few upstream requests as possible. Requests arriving meanwhile join the in-flight fetches instead of repeating
+them. Forecasts saved by the previous process are already restored by :func:`get_forecast_cache`.
+"""
+import threading
+from datetime import datetime
+
+from backend.utils.tracing import span
+from backend.utils.weather import get_forecast_batch
+from config.weather import WARM_START_CITIES_PATH
+
+_warm_started = False
+_warm_start_lock = threading.Lock()
+
+
+def read_city_list(path: str) -> list[str]:
+    """Cities listed in ``path``, one per line; blank lines and ``#`` comments are skipped."""
+    with open(path, encoding="utf-8") as cities_file:
+        lines = (line.split("#", 1)[0].strip() for line in cities_file)
+        return list(dict.fromkeys(line for line in lines if line))
+
+
+def prefetch_cities(cities: list[str]) -> int:
+    """Fetch today's forecast for every city; returns how many succeeded."""
+    with span("warm_start.prefetch", cities=len(cities)) as attributes:
+        results = get_forecast_batch(cities, datetime.now().strftime("%Y-%m-%d"))
+        prefetched = sum(result["error"] is None for result in results)
+        attributes["prefetched"] = prefetched
+    return prefetched
+
+
+def warm_start(cities_path: str = WARM_START_CITIES_PATH) -> threading.Thread | None:
+    """Start prefetching the city list, once per process; the thread doing it, or None if there is nothing to do."""
+    global _warm_started
+    with _warm_start_lock:
+        if _warm_started or not cities_path:
+            return None
+        _warm_started = True
+
+    try:
+        cities = read_city_list(cities_path)
+    except OSError:
+        return None
+    if not cities:
+        return None
+    thread = threading.Thread(target=prefetch_cities, args=(cities,), name="forecast-warm-start", daemon=True)
+    thread.start()
+    return thread
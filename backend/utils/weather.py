@@ -0,0 +1,366 @@
+"""Open-Meteo forecasts for the pages and the chatbot tools.
+
+Geocoding lives in :mod:`backend.utils.geocoding`; the asyncio variants in :mod:`backend.utils.async_weather`.
+Nothing here imports the LLM stack, so weather-only pages stay light.
+"""
+import contextvars
+from collections.abc import Iterator
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+import numpy as np
+
+from backend.cache.forecast_cache import get_forecast_cache
+from backend.data_models.data_models import Forecast
+from backend.prompts.forecast_encoder import encode_weather_result
+from backend.utils.clients import get_openmeteo_client
+from backend.utils.geocoding import _get_location_coordinates
+from backend.utils.rate_limit import limited
+from backend.utils.refresher import get_forecast_refresher
+from backend.utils.single_flight import SingleFlight
+from backend.utils.tracing import propagate, span
+from config.weather import (
+    GEOCODING_CONCURRENCY, FORECAST_URL, FORECAST_BATCH_SIZE, FORECAST_FLIGHT_WAIT_SECONDS, HOURLY_VARIABLES
+)
+
+# In-flight forecast fetches by (lat, lon, start_date) grid point, shared with async_weather.
+forecast_flights = SingleFlight()
+
+# Timezone whose calendar "today" means for date validation and the forecast window; "" is server local time.
+_event_timezone: contextvars.ContextVar[str] = contextvars.ContextVar("event_timezone", default="")
+
+
+@contextmanager
+def dates_in_timezone(timezone: str) -> Iterator[None]:
+    """Check event dates against the calendar of ``timezone`` (e.g. the one the chat prompt was rendered for)."""
+    token = _event_timezone.set(timezone)
+    try:
+        yield
+    finally:
+        _event_timezone.reset(token)
+
+
+def _convert_date_str_to_datetime(date_str: str) -> datetime:
+    return datetime.strptime(date_str, "%Y-%m-%d")
+
+
+def _today() -> datetime.date:
+    timezone = _event_timezone.get()
+    return datetime.now(ZoneInfo(timezone)).date() if timezone else datetime.now().date()
+
+
+def _datetime_is_valid(date: datetime.date) -> bool:
+    today = _today()
+    event_date = date.date()
+    return today <= event_date <= today + timedelta(days=6)
+
+
+def _build_forecast(response) -> Forecast:
+    """Convert an Open-Meteo response into a Forecast on the location's own clock.
+
+    The time axis is a single ``arange`` over the response's epoch seconds; local dates and hours
+    are derived from it together with the response's UTC offset, so nothing is formatted or parsed
+    per hour.
+    """
+    hourly = response.Hourly()
+    time_axis = np.arange(hourly.Time(), hourly.TimeEnd(), hourly.Interval(), dtype=np.int64)
+    values = np.stack([hourly.Variables(i).ValuesAsNumpy() for i in range(len(HOURLY_VARIABLES))])
+    timezone = response.Timezone()
+    return Forecast(
+        time_axis, values, HOURLY_VARIABLES, response.UtcOffsetSeconds(), timezone.decode() if timezone else None
+    )
+
+
+def get_weather_info(location: str, event_date: str) -> dict[str, any]:
+    return _forecast_result_to_dict(get_forecast(location, event_date))
+
+
+def get_weather_info_batch(locations: list[str], event_date: str) -> list[dict[str, any]]:
+    """Weather for several locations at once, e.g. to compare candidate cities for an event.
+
+    Results are returned in the order of ``locations``; a location that cannot be resolved or fetched
+    carries its own ``error`` without affecting the others.
+    """
+    return [_forecast_result_to_dict(result) for result in get_forecast_batch(locations, event_date)]
+
+
+def get_event_weather_info(location: str, event_date: str) -> dict[str, any]:
+    """Tool-sized weather: ``event_date`` hour by hour, every other day as min/max/mean rollups, as compact text."""
+    return encode_weather_result(get_forecast(location, event_date))
+
+
+def get_event_weather_info_batch(locations: list[str], event_date: str) -> list[dict[str, any]]:
+    return [encode_weather_result(result) for result in get_forecast_batch(locations, event_date)]
+
+
+def get_forecast(location: str, event_date: str) -> dict[str, any]:
+    return get_forecast_batch([location], event_date)[0]
+
+
+def get_forecast_batch(locations: list[str], event_date: str) -> list[dict[str, any]]:
+    """Forecasts for many locations: geocoded concurrently, cache misses fetched in as few upstream calls as possible."""
+    date_error = _validate_event_date(event_date)
+    if date_error:
+        return [_error_result(location, event_date, date_error) for location in locations]
+
+    start_date_str, end_date_str = _forecast_window()
+    results, pending = _group_by_grid_point(locations, event_date, _geocode_all(locations))
+    claimed: dict[tuple[float, float], Future] = {}
+
+    try:
+        leading, following = _claim_grid_points(results, pending, locations, event_date, start_date_str, claimed)
+        for chunk in _chunk_grid_points(leading):
+            try:
+                forecasts = _fetch_forecasts(chunk, start_date_str, end_date_str)
+            except Exception as e:
+                forecasts = e
+            _store_fetched_forecasts(results, pending, chunk, forecasts, locations, event_date, start_date_str)
+    finally:
+        _release_grid_points(claimed, start_date_str)
+
+    done, _ = wait(following.values(), timeout=FORECAST_FLIGHT_WAIT_SECONDS)
+    for point, future in following.items():
+        if future in done:
+            _fill_forecast_results(results, pending, [point], _shared_outcome(future), locations, event_date)
+
+    # A fetch that has not answered in time is repeated here rather than waited on any longer.
+    late = [point for point, future in following.items() if future not in done]
+    for chunk in _chunk_grid_points(late):
+        try:
+            forecasts = _fetch_forecasts(chunk, start_date_str, end_date_str)
+        except Exception as e:
+            forecasts = e
+        _store_fetched_forecasts(results, pending, chunk, forecasts, locations, event_date, start_date_str, share=False)
+
+    return results
+
+
+def _group_by_grid_point(
+        locations: list[str], event_date: str, geocoded: list[tuple[float, float] | Exception]
+) -> tuple[list[dict[str, any] | None], dict[tuple[float, float], list[int]]]:
+    """Fill in results for geocoding failures; group the remaining indices by forecast grid point."""
+    forecast_cache = get_forecast_cache()
+    results: list[dict[str, any] | None] = [None] * len(locations)
+    pending: dict[tuple[float, float], list[int]] = {}
+
+    for index, (location, coordinates) in enumerate(zip(locations, geocoded)):
+        if isinstance(coordinates, Exception):
+            results[index] = _error_result(location, event_date, f"Unable to fetch weather information: {coordinates}")
+        else:
+            pending.setdefault(forecast_cache.snap(*coordinates), []).append(index)
+
+    return results, pending
+
+
+def _claim_grid_points(
+        results: list[dict[str, any] | None], pending: dict[tuple[float, float], list[int]], locations: list[str],
+        event_date: str, start_date: str, claimed: dict[tuple[float, float], Future]
+) -> tuple[list[tuple[float, float]], dict[tuple[float, float], Future]]:
+    """Fill cache hits and split the other grid points into those this caller fetches and those another caller
+    is already fetching.
+
+    Each point is claimed before the cache is read, so a fetch that finishes in between is never repeated. Claims
+    are recorded in ``claimed`` as they are made, for :func:`_release_grid_points` to settle whatever happens
+    after. With background refresh on, an entry past its TTL is served as a hit and handed to the refresher.
+    """
+    forecast_cache = get_forecast_cache()
+    refresher = get_forecast_refresher()
+    if refresher is not None:
+        refresher.record(pending)
+    leading: list[tuple[float, float]] = []
+    following: dict[tuple[float, float], Future] = {}
+
+    for lat, lon in pending:
+        future, is_leader = forecast_flights.claim((lat, lon, start_date))
+        if not is_leader:
+            following[(lat, lon)] = future
+            continue
+        claimed[(lat, lon)] = future
+
+        entry = forecast_cache.lookup(lat, lon, start_date)
+        if entry is None or (entry.is_stale and refresher is None):
+            leading.append((lat, lon))
+            continue
+
+        forecast_flights.resolve((lat, lon, start_date), entry.forecast)
+        if entry.is_stale:
+            refresher.request_refresh((lat, lon))
+        _fill_forecast_results(results, pending, [(lat, lon)], [entry.forecast], locations, event_date, from_cache=True)
+
+    return leading, following
+
+
+def _release_grid_points(claimed: dict[tuple[float, float], Future], start_date: str) -> None:
+    """Fail any claimed point left unresolved, so its followers never wait forever."""
+    error = RuntimeError("Forecast fetch ended without a result")
+    for (lat, lon), future in claimed.items():
+        forecast_flights.resolve((lat, lon, start_date), error=error, future=future)
+
+
+def _shared_outcome(future: Future) -> list[Forecast] | Exception:
+    try:
+        return [future.result()]
+    except Exception as e:
+        return e
+
+
+def _chunk_grid_points(pending: list[tuple[float, float]] | dict[tuple[float, float], list[int]]) -> list[list[tuple[float, float]]]:
+    grid_points = list(pending)
+    return [grid_points[offset:offset + FORECAST_BATCH_SIZE] for offset in range(0, len(grid_points), FORECAST_BATCH_SIZE)]
+
+
+def _store_fetched_forecasts(
+        results: list[dict[str, any] | None], pending: dict[tuple[float, float], list[int]],
+        chunk: list[tuple[float, float]], forecasts: list[Forecast] | Exception, locations: list[str],
+        event_date: str, start_date: str, share: bool = True
+) -> None:
+    _cache_fetched_forecasts(chunk, forecasts, start_date, share=share)
+    _fill_forecast_results(results, pending, chunk, forecasts, locations, event_date)
+
+
+def _cache_fetched_forecasts(
+        chunk: list[tuple[float, float]], forecasts: list[Forecast] | Exception, start_date: str, share: bool = True
+) -> None:
+    """Store a fetched chunk and, when ``share``, hand it (or its error) to the callers waiting on those points.
+
+    A follower that gave up waiting fetches without a claim of its own, so it passes ``share=False`` and leaves
+    the flights to their leaders.
+    """
+    if isinstance(forecasts, Exception):
+        if share:
+            for lat, lon in chunk:
+                forecast_flights.resolve((lat, lon, start_date), error=forecasts)
+        return
+
+    forecast_cache = get_forecast_cache()
+    for (lat, lon), forecast in zip(chunk, forecasts):
+        forecast_cache.set(lat, lon, start_date, forecast)
+        if share:
+            forecast_flights.resolve((lat, lon, start_date), forecast)
+
+
+def refresh_forecasts(points: list[tuple[float, float]], start_date: str, end_date: str) -> tuple[int, int]:
+    """Fetch and cache ``points`` whatever is cached for them; (refreshed, failed) counts.
+
+    Points another caller is already fetching are left to that fetch.
+    """
+    claimed: dict[tuple[float, float], Future] = {}
+    refreshed = failed = 0
+    try:
+        for point in points:
+            future, is_leader = forecast_flights.claim((*point, start_date))
+            if is_leader:
+                claimed[point] = future
+        leading = list(claimed)
+        for chunk in _chunk_grid_points(leading):
+            try:
+                forecasts = _fetch_forecasts(chunk, start_date, end_date)
+            except Exception as e:
+                forecasts = e
+            _cache_fetched_forecasts(chunk, forecasts, start_date)
+            if isinstance(forecasts, Exception):
+                failed += len(chunk)
+            else:
+                refreshed += len(chunk)
+    finally:
+        _release_grid_points(claimed, start_date)
+    return refreshed, failed
+
+
+def _fill_forecast_results(
+        results: list[dict[str, any] | None], pending: dict[tuple[float, float], list[int]],
+        chunk: list[tuple[float, float]], forecasts: list[Forecast] | Exception, locations: list[str],
+        event_date: str, from_cache: bool = False
+) -> None:
+    if isinstance(forecasts, Exception):
+        for point in chunk:
+            for index in pending[point]:
+                results[index] = _error_result(locations[index], event_date, f"Unable to fetch weather information: {forecasts}")
+        return
+
+    for point, forecast in zip(chunk, forecasts):
+        for index in pending[point]:
+            results[index] = _forecast_result(locations[index], event_date, forecast, from_cache=from_cache)
+
+
+def _geocode_all(locations: list[str]) -> list[tuple[float, float] | Exception]:
+    def geocode(location: str) -> tuple[float, float] | Exception:
+        try:
+            return _get_location_coordinates(location)
+        except Exception as e:
+            return e
+
+    if len(locations) <= 1:
+        return [geocode(location) for location in locations]
+
+    with ThreadPoolExecutor(max_workers=min(len(locations), GEOCODING_CONCURRENCY)) as executor:
+        return list(executor.map(propagate(geocode), locations))
+
+
+def _fetch_forecasts(coordinates: list[tuple[float, float]], start_date: str, end_date: str) -> list[Forecast]:
+    """One Open-Meteo request for every coordinate pair; responses come back in request order."""
+    client = get_openmeteo_client()
+    with limited("forecast"), span("forecast.fetch", points=len(coordinates)):
+        responses = client.weather_api(FORECAST_URL, params=_forecast_params(coordinates, start_date, end_date))
+    return _build_forecasts(responses, len(coordinates))
+
+
+def _forecast_window() -> tuple[str, str]:
+    start = _today()
+    end = start + timedelta(days=6)
+    return start.strftime('%Y-%m-%d'), end.strftime('%Y-%m-%d')
+
+
+def _forecast_params(coordinates: list[tuple[float, float]], start_date: str, end_date: str) -> dict[str, any]:
+    return {
+        "latitude": [lat for lat, _ in coordinates],
+        "longitude": [lon for _, lon in coordinates],
+        "hourly": list(HOURLY_VARIABLES),
+        "start_date": start_date,
+        "end_date": end_date,
+        "timezone": "auto",
+    }
+
+
+def _build_forecasts(responses: list, expected: int) -> list[Forecast]:
+    if len(responses) != expected:
+        raise ValueError(f"Expected {expected} forecasts, received {len(responses)}")
+    with span("forecast.transform", points=expected):
+        return [_build_forecast(response) for response in responses]
+
+
+def _validate_event_date(event_date: str) -> str | None:
+    try:
+        event_datetime = _convert_date_str_to_datetime(event_date)
+    except ValueError as e:
+        return f"Invalid date format. Expected YYYY-MM-DD: {e}"
+
+    if not _datetime_is_valid(event_datetime):
+        return "Event date must be within the next 7 days (today through 6 days from now)"
+    return None
+
+
+def _forecast_result(location: str, event_date: str, forecast: Forecast, from_cache: bool) -> dict[str, any]:
+    return {
+        "error": None,
+        "data": forecast,
+        "location": location,
+        "date": event_date,
+        "from_cache": from_cache
+    }
+
+
+def _error_result(location: str, event_date: str, error: str) -> dict[str, any]:
+    return {
+        "error": error,
+        "data": None,
+        "location": location,
+        "date": event_date,
+    }
+
+
+def _forecast_result_to_dict(result: dict[str, any]) -> dict[str, any]:
+    if result["data"] is None:
+        return result
+    return {**result, "data": result["data"].to_dict()}
@@ -0,0 +1,65 @@
+"""Tabular views of forecasts for the Weather_Info charts."""
+import numpy as np
+import pandas as pd
+
+from backend.data_models.data_models import Forecast
+
+HOUR_LABELS: np.ndarray = np.array([f"{hour:02d}:00" for hour in range(24)])
+
+
+class HourlyWeatherFrame:
+    """A forecast as a DataFrame indexed by (date, hour), built once per fetch and kept in the session.
+
+    Hour labels are precomputed, so chart filters are plain index slices. Each (date, start, end) slice is
+    memoized, which makes Streamlit reruns from slider and date changes cost a dict lookup.
+    """
+
+    def __init__(self, frame: pd.DataFrame):
+        self.frame = frame
+        self.dates: list[str] = frame.index.get_level_values("date").unique().tolist() if not frame.empty else []
+        self._slices: dict[tuple[str, int, int], pd.DataFrame] = {}
+
+    @classmethod
+    def from_forecast(cls, forecast: Forecast) -> "HourlyWeatherFrame":
+        local_times = forecast.local_times()
+        days = local_times.astype("datetime64[D]")
+        hours = (local_times - days).astype("timedelta64[h]").astype(np.int64)
+
+        # Building the index from level codes skips the string factorization MultiIndex.from_arrays would do.
+        unique_days, day_codes = np.unique(days, return_inverse=True)
+        index = pd.MultiIndex(
+            levels=[np.datetime_as_string(unique_days), np.arange(24)], codes=[day_codes, hours], names=("date", "hour")
+        )
+        columns = {"hour_label": HOUR_LABELS[hours]}
+        columns.update(zip(forecast.variables, forecast.values))
+        frame = pd.DataFrame(columns, index=index)
+        return cls(frame if frame.index.is_monotonic_increasing else frame.sort_index())
+
+    @classmethod
+    def empty(cls) -> "HourlyWeatherFrame":
+        index = pd.MultiIndex(levels=[[], np.arange(24)], codes=[[], []], names=("date", "hour"))
+        return cls(pd.DataFrame(index=index))
+
+    @property
+    def is_empty(self) -> bool:
+        return self.frame.empty
+
+    def hours(self, date: str, start_hour: int, end_hour: int) -> pd.DataFrame:
+        """Rows of ``date`` from ``start_hour`` to ``end_hour`` inclusive, indexed by hour; empty if none match."""
+        key = (date, start_hour, end_hour)
+        hours = self._slices.get(key)
+        if hours is None:
+            day = self.frame.xs(date, level="date") if date in self.dates else self.frame.iloc[:0].droplevel("date")
+            hours = self._slices[key] = day.loc[start_hour:end_hour]
+        return hours
+
+
+def process_weather_data(weather_info: dict) -> HourlyWeatherFrame:
+    if weather_info.get("error") or weather_info.get("data") is None:
+        return HourlyWeatherFrame.empty()
+
+    return HourlyWeatherFrame.from_forecast(weather_info["data"])
+
+
+def filter_by_hour_range(weather_frame: HourlyWeatherFrame, date: str, start_hour: int, end_hour: int) -> pd.DataFrame:
+    return weather_frame.hours(date, start_hour, end_hour)
@@ -0,0 +1,93 @@
+"""Per-request latency of building an Open-Meteo session per call (the old behaviour) versus the shared, pooled client.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_clients [--requests 200] [--url https://api.open-meteo.com/v1/forecast]
+
+Without ``--url`` a local keep-alive HTTP server stands in for Open-Meteo, so the numbers isolate session
+construction, SQLite cache setup and TCP connects. Against the real API the saved TLS handshakes add to the gap.
+Every request uses distinct parameters so the HTTP cache never answers for either variant.
+"""
+import argparse
+import statistics
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from os import path
+
+from backend.utils.clients import close_clients, create_openmeteo_session, get_client
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        body = b"{}"
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def _start_local_server() -> ThreadingHTTPServer:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def _time_per_call_sessions(url: str, requests: int, cache_dir: str) -> list[float]:
+    timings = []
+    for i in range(requests):
+        start = time.perf_counter()
+        session = create_openmeteo_session(cache_name=path.join(cache_dir, "per_call"))
+        session.get(url, params={"per_call": i})
+        session.close()
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def _time_shared_session(url: str, requests: int, cache_dir: str) -> list[float]:
+    factory = lambda: create_openmeteo_session(cache_name=path.join(cache_dir, "shared"))
+    timings = []
+    for i in range(requests):
+        start = time.perf_counter()
+        get_client("benchmark_openmeteo", factory).get(url, params={"shared": i})
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def _summarize(label: str, timings: list[float]) -> float:
+    milliseconds = [timing * 1000 for timing in timings]
+    percentiles = statistics.quantiles(milliseconds, n=100)
+    mean = statistics.fmean(milliseconds)
+    print(f"{label:<22} mean {mean:8.3f} ms   p50 {percentiles[49]:8.3f} ms   p95 {percentiles[94]:8.3f} ms")
+    return mean
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--url", default=None, help="Endpoint to call; defaults to a local stand-in server")
+    args = parser.parse_args()
+
+    server = None if args.url else _start_local_server()
+    url = args.url or f"http://127.0.0.1:{server.server_address[1]}/v1/forecast"
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        before = _summarize("session per request", _time_per_call_sessions(url, args.requests, cache_dir))
+        after = _summarize("shared pooled session", _time_shared_session(url, args.requests, cache_dir))
+        close_clients()
+
+    print(f"speedup {before / after:.1f}x over {args.requests} requests to {url}")
+    if server is not None:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
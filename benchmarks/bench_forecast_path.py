@@ -0,0 +1,226 @@
+"""Per-stage cost of the forecast path, from the upstream response to the prompt text, for several forecast sizes.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_forecast_path [--hours 24 168 384] [--repeat 200]
+    python -m benchmarks.bench_forecast_path --save            # write benchmarks/baselines/forecast_path.json
+    python -m benchmarks.bench_forecast_path --compare [--fail-over 50]
+
+Upstream calls are answered with ``SyntheticResponse`` and geocoding with fixed coordinates, so only local work is
+measured. ``get_weather_info (miss)`` starts from an empty forecast cache each time; ``(hit)`` is served from it.
+Each stage reports the minimum and median wall time (garbage collection paused), plus the tracemalloc peak and
+the number of blocks still alive after one traced run. CPython does not count total allocations, so the peak
+stands in for them.
+
+``--compare`` prints the change in minimum time against the saved baseline, as the least noisy of the two,
+after scaling both runs by a fixed calibration loop. Times more than ``--fail-over`` percent slower are marked
+REGRESSION and make the run exit non-zero. Calibration only partly cancels out hardware differences, so save a
+fresh baseline on the machine that will run the comparisons.
+"""
+import argparse
+import gc
+import json
+import os
+import statistics
+import time
+import tracemalloc
+from collections.abc import Iterator
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Callable
+from unittest.mock import patch
+
+from backend.cache.forecast_cache import ForecastCache
+from backend.cache.memory_cache import MemoryCache
+from backend.prompts.build_prompt import generate_data_processor_user_prompt
+from backend.prompts.forecast_encoder import encode_forecast, encode_weather_result
+from backend.replay.synthetic import SyntheticResponse
+from backend.utils.rate_limit import RateLimiter
+from backend.utils.weather import _build_forecast, get_forecast, get_weather_info
+from backend.utils.weather_frames import HourlyWeatherFrame, filter_by_hour_range, process_weather_data
+
+BASELINE_PATH: str = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines", "forecast_path.json")
+COORDINATES: tuple[float, float] = (33.749, -84.388)
+
+_active_cache: list[ForecastCache | None] = [None]
+
+
+class _FakeOpenMeteoClient:
+    def __init__(self, hours: int):
+        self.hours = hours
+
+    def weather_api(self, url: str, params: dict[str, Any]) -> list[SyntheticResponse]:
+        return [SyntheticResponse(self.hours) for _ in params["latitude"]]
+
+
+def build_stages(hours: int) -> dict[str, Callable[[], Any]]:
+    """Zero-argument callables for each stage, with their inputs prepared up front; run them inside ``synthetic_upstream``."""
+    response = SyntheticResponse(hours)
+    event_date = datetime.now().strftime("%Y-%m-%d")
+    forecast = _build_forecast(response)
+    focus_date = forecast.dates[0]
+    weather_result = {"error": None, "data": forecast, "location": "Atlanta", "date": focus_date}
+    frame = process_weather_data(weather_result)
+
+    def cold_fetch() -> dict[str, Any]:
+        _active_cache[0] = _empty_forecast_cache()
+        return get_weather_info("Atlanta", event_date)
+
+    def warm_fetch() -> dict[str, Any]:
+        _active_cache[0] = warm_cache
+        return get_weather_info("Atlanta", event_date)
+
+    warm_cache = _empty_forecast_cache()
+    with synthetic_upstream(hours):
+        warm_fetch()
+    return {
+        "get_weather_info (miss)": cold_fetch,
+        "get_weather_info (hit)": warm_fetch,
+        "_build_forecast": lambda: _build_forecast(response),
+        "Forecast.to_dict": forecast.to_dict,
+        "process_weather_data": lambda: process_weather_data(weather_result),
+        "filter_by_hour_range x3": lambda: [filter_by_hour_range(frame, focus_date, 6, 22) for _ in range(3)],
+        "filter_by_hour_range cold x3": lambda: [
+            filter_by_hour_range(HourlyWeatherFrame(frame.frame), slice_date, 6, 22) for slice_date in frame.dates[1:4]
+        ],
+        "encode_forecast": lambda: encode_forecast(forecast),
+        "encode_weather_result": lambda: encode_weather_result(weather_result),
+        "data processor prompt": lambda: generate_data_processor_user_prompt(weather_result, "Atlanta", focus_date, "metric"),
+    }
+
+
+@contextmanager
+def synthetic_upstream(hours: int) -> Iterator[None]:
+    """Answer forecast fetches with ``hours``-long synthetic responses, geocode to fixed coordinates and use
+    whichever forecast cache the running stage installed in ``_active_cache``.
+
+    Fetches still take a rate-limit token, from a bucket that never runs dry, so only its bookkeeping is timed.
+    The background refresher stays off, so no thread fetches behind the measurements."""
+    limiters = {"forecast": RateLimiter("forecast", rate=1e12, burst=10 ** 12)}
+    with patch("backend.utils.weather.get_openmeteo_client", return_value=_FakeOpenMeteoClient(hours)), \
+            patch.dict("backend.utils.rate_limit._limiters", limiters), \
+            patch("backend.utils.weather.get_forecast_refresher", return_value=None), \
+            patch("backend.utils.weather._get_location_coordinates", return_value=COORDINATES), \
+            patch("backend.utils.weather.get_forecast_cache", side_effect=lambda: _active_cache[0]):
+        yield
+
+
+def _empty_forecast_cache() -> ForecastCache:
+    return ForecastCache(MemoryCache(max_entries=16), grid_degrees=0.1)
+
+
+def measure(stage: Callable[[], Any], repeat: int) -> dict[str, float]:
+    stage()
+    samples = []
+    gc.collect()
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            stage()
+            samples.append(time.perf_counter() - start)
+    finally:
+        gc.enable()
+
+    tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot()
+        tracemalloc.reset_peak()
+        base, _ = tracemalloc.get_traced_memory()
+        result = stage()
+        _, peak = tracemalloc.get_traced_memory()
+        retained_blocks = sum(stat.count_diff for stat in tracemalloc.take_snapshot().compare_to(before, "filename"))
+    finally:
+        tracemalloc.stop()
+    del result
+
+    return {
+        "min_us": min(samples) * 1e6,
+        "median_us": statistics.median(samples) * 1e6,
+        "peak_kib": (peak - base) / 1024,
+        "retained_blocks": retained_blocks,
+    }
+
+
+def run(hours_list: list[int], repeat: int) -> dict[str, Any]:
+    results = {}
+    for hours in hours_list:
+        stages = build_stages(hours)
+        with synthetic_upstream(hours):
+            results[str(hours)] = {name: measure(stage, repeat) for name, stage in stages.items()}
+    return {"calibration_us": measure(_calibration_workload, repeat)["min_us"], "hours": results}
+
+
+def _calibration_workload() -> int:
+    """Fixed pure-Python loop; comparisons divide by its time to cancel out machine speed and CPU throttling."""
+    total = 0
+    for i in range(20000):
+        total += i * i
+    return total
+
+
+def compare(results: dict[str, Any], baseline: dict[str, Any], fail_over: float) -> list[str]:
+    """Print each stage against the baseline and return the stages slower than ``fail_over`` percent.
+
+    Times are scaled by the ratio of the two runs' calibration times before comparing.
+    """
+    speed = baseline["calibration_us"] / results["calibration_us"]
+    print(f"calibration {baseline['calibration_us']:.1f} -> {results['calibration_us']:.1f} us")
+    regressions = []
+    for hours, stages in results["hours"].items():
+        print(f"\n{hours} hours")
+        for name, current in stages.items():
+            previous = baseline["hours"].get(hours, {}).get(name)
+            if previous is None:
+                print(f"  {name:<30} {current['min_us']:10.1f} us   (no baseline)")
+                continue
+            change = (current["min_us"] * speed / previous["min_us"] - 1) * 100
+            flag = "  REGRESSION" if change > fail_over else ""
+            print(
+                f"  {name:<30} {previous['min_us']:10.1f} -> {current['min_us']:10.1f} us  {change:+7.1f}%"
+                f"   peak {previous['peak_kib']:8.1f} -> {current['peak_kib']:8.1f} KiB{flag}"
+            )
+            if flag:
+                regressions.append(f"{hours}h {name}")
+    return regressions
+
+
+def report(results: dict[str, Any]) -> None:
+    for hours, stages in results["hours"].items():
+        print(f"\n{hours} hours")
+        for name, current in stages.items():
+            print(
+                f"  {name:<30} min {current['min_us']:10.1f} us   median {current['median_us']:10.1f} us   peak {current['peak_kib']:8.1f} KiB"
+                f"   retained {current['retained_blocks']:6d} blocks"
+            )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--hours", type=int, nargs="+", default=[24, 168, 384])
+    parser.add_argument("--repeat", type=int, default=200)
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--save", action="store_true", help="Write the results as the new baseline")
+    parser.add_argument("--compare", action="store_true", help="Compare the results with the saved baseline")
+    parser.add_argument("--fail-over", type=float, default=50.0, help="Slowdown in percent treated as a regression")
+    args = parser.parse_args()
+
+    results = run(args.hours, args.repeat)
+    if not args.compare:
+        report(results)
+    else:
+        with open(args.baseline, encoding="utf-8") as baseline_file:
+            regressions = compare(results, json.load(baseline_file), args.fail_over)
+        if regressions:
+            print("\n".join(("", "Regressions:", *regressions)))
+            raise SystemExit(1)
+
+    if args.save:
+        os.makedirs(os.path.dirname(args.baseline), exist_ok=True)
+        with open(args.baseline, "w", encoding="utf-8") as baseline_file:
+            json.dump(results, baseline_file, indent=2, sort_keys=True)
+        print(f"\nBaseline written to {args.baseline}")
+
+
+if __name__ == "__main__":
+    main()
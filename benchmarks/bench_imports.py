@@ -0,0 +1,98 @@
+"""Import time of each backend module and of each page's import block, each measured in a fresh interpreter.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_imports [--repeat 5] [--check]
+
+Times come from ``python -X importtime`` (sum of the top-level cumulative entries, median over ``--repeat``
+runs). ``--check`` exits non-zero when a target listed in ``LLM_FREE_TARGETS`` loads the Gemini SDK or when a
+target exceeds ``--max-ms``, so it can run in CI as a regression guard.
+"""
+import argparse
+import ast
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT: str = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+MODULES: tuple[str, ...] = (
+    "backend.utils.geocoding",
+    "backend.utils.weather",
+    "backend.utils.async_weather",
+    "backend.utils.llm",
+    "backend.utils.utils",
+    "config.gemini",
+)
+PAGES: tuple[str, ...] = ("Home_Page.py", "pages/Weather_Info.py", "pages/Weather_Man.py", "pages/Skye.py")
+
+# Modules that only weather-only code paths use must never pull these in.
+LLM_PACKAGES: tuple[str, ...] = ("google.generativeai", "google.ai.generativelanguage")
+LLM_FREE_TARGETS: tuple[str, ...] = (
+    "backend.utils.geocoding", "backend.utils.weather", "backend.utils.async_weather", "backend.utils.llm",
+    "backend.utils.utils", "Home_Page.py", "pages/Weather_Info.py",
+)
+
+
+def import_source(target: str) -> str:
+    """The statements that import ``target``: the module itself, or a page's top-level import statements."""
+    if not target.endswith(".py"):
+        return f"import {target}"
+    with open(os.path.join(ROOT, target), encoding="utf-8") as page:
+        tree = ast.parse(page.read())
+    return "\n".join(ast.unparse(node) for node in tree.body if isinstance(node, (ast.Import, ast.ImportFrom)))
+
+
+def measure(target: str) -> tuple[float, set[str]]:
+    """Milliseconds spent importing ``target`` in a fresh interpreter, and the modules loaded by then."""
+    script = f"{import_source(target)}\nimport json, sys\nprint(json.dumps(sorted(sys.modules)))"
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", script], cwd=ROOT, capture_output=True, text=True, check=True
+    )
+    return _top_level_microseconds(completed.stderr) / 1000, set(json.loads(completed.stdout.splitlines()[-1]))
+
+
+def loaded_llm_packages(modules: set[str]) -> list[str]:
+    return sorted(name for name in LLM_PACKAGES if name in modules)
+
+
+def _top_level_microseconds(importtime_log: str) -> int:
+    """Sum the cumulative time of imports made directly by the script (entries not nested under another)."""
+    total = 0
+    for line in importtime_log.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.removeprefix("import time:").split("|")
+        if not name[1:].startswith(" "):
+            total += int(cumulative)
+    return total
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--check", action="store_true", help="Fail on LLM imports in weather-only targets")
+    parser.add_argument("--max-ms", type=float, default=None, help="With --check, fail any target slower than this")
+    args = parser.parse_args()
+
+    failures = []
+    for target in (*MODULES, *PAGES):
+        runs = [measure(target) for _ in range(args.repeat)]
+        milliseconds = statistics.median(ms for ms, _ in runs)
+        llm = loaded_llm_packages(runs[-1][1])
+        print(f"{target:<30} {milliseconds:8.1f} ms   {'loads ' + ', '.join(llm) if llm else 'no LLM stack'}")
+
+        if target in LLM_FREE_TARGETS and llm:
+            failures.append(f"{target} imports {', '.join(llm)}")
+        if args.max_ms is not None and milliseconds > args.max_ms:
+            failures.append(f"{target} took {milliseconds:.1f} ms (budget {args.max_ms:.1f} ms)")
+
+    if args.check and failures:
+        print("\n".join(("", "FAILED:", *failures)))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
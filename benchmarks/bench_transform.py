@@ -0,0 +1,65 @@
+"""Per-forecast cost of turning an Open-Meteo response into the app's in-memory form.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_transform [--hours 168] [--repeat 500]
+
+``legacy`` is the previous per-hour loop (fromtimestamp/strftime, strptime, two more strftime calls and
+one dict per hour). ``forecast`` is the vectorized ``_build_forecast``; ``forecast + to_dict`` adds the
+conversion done at the tool/prompt edge.
+"""
+import argparse
+import time
+from collections import defaultdict
+from datetime import datetime
+
+from backend.replay.synthetic import SyntheticResponse
+from backend.utils.weather import _build_forecast
+from config.weather import HOURLY_VARIABLES
+
+
+def legacy_transform(response) -> dict:
+    hourly = response.Hourly()
+    timestamps = range(hourly.Time(), hourly.TimeEnd(), hourly.Interval())
+    hourly_data = {"time": [datetime.fromtimestamp(t).strftime('%Y-%m-%d %H:%M:%S') for t in timestamps]}
+    for i, variable in enumerate(HOURLY_VARIABLES):
+        hourly_data[variable] = hourly.Variables(i).ValuesAsNumpy().tolist()
+
+    daily_grouped = defaultdict(list)
+    for i in range(len(hourly_data["time"])):
+        dt = datetime.strptime(hourly_data["time"][i], '%Y-%m-%d %H:%M:%S')
+        hour_dict = {"hour": dt.strftime('%H:%M:%S')}
+        for variable in HOURLY_VARIABLES:
+            hour_dict[variable] = hourly_data[variable][i]
+        daily_grouped[dt.strftime('%Y-%m-%d')].append(hour_dict)
+    return dict(daily_grouped)
+
+
+def _time(function, response, repeat: int) -> float:
+    function(response)
+    start = time.perf_counter()
+    for _ in range(repeat):
+        function(response)
+    return (time.perf_counter() - start) / repeat
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--hours", type=int, default=168)
+    parser.add_argument("--repeat", type=int, default=500)
+    args = parser.parse_args()
+
+    response = SyntheticResponse(args.hours)
+    legacy = _time(legacy_transform, response, args.repeat)
+    results = {
+        "legacy": legacy,
+        "forecast": _time(_build_forecast, response, args.repeat),
+        "forecast + to_dict": _time(lambda r: _build_forecast(r).to_dict(), response, args.repeat),
+    }
+
+    for label, seconds in results.items():
+        print(f"{label:<20} {seconds * 1e6:10.1f} us/forecast   {legacy / seconds:6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,18 +1,28 @@
 import os
 import dotenv
-import streamlit as st
 
 dotenv.load_dotenv()
 
 ENV = os.getenv("ENV", "prod").lower()
 CHATBOT_NAME = "Skye"
 
+# Tool calls from one model turn that run at the same time.
+TOOL_CALL_CONCURRENCY: int = int(os.getenv("TOOL_CALL_CONCURRENCY", "8"))
+
+# Chat history sent with each request: the most recent turns verbatim, older ones digested and summarized
+# until the estimate fits the budget.
+HISTORY_TOKEN_BUDGET: int = int(os.getenv("HISTORY_TOKEN_BUDGET", "8000"))
+HISTORY_RECENT_TURNS: int = int(os.getenv("HISTORY_RECENT_TURNS", "4"))
+HISTORY_SUMMARY_CHARS: int = int(os.getenv("HISTORY_SUMMARY_CHARS", "300"))
+
 def get_api_key(secret_key_name: str) -> str:
     """Fetch API key from environment (dev) or Streamlit secrets (prod)."""
     if ENV == "dev":
         key = os.getenv(secret_key_name)
         source = "environment variables"
     else:
+        import streamlit as st
+
         key = st.secrets.get(secret_key_name)
         source = "Streamlit secrets"
     
@@ -1,9 +1,19 @@
+import os
+import threading
+from datetime import date, datetime
+from typing import Any, Callable
+from functools import cache
+from zoneinfo import ZoneInfo, available_timezones
+
 import google.generativeai as genai
 
-from backend.utils.utils import get_weather_info
+from backend.utils.tools import ToolRegistry
+from backend.utils.weather import _validate_event_date, get_event_weather_info, get_event_weather_info_batch
 from config.base import get_api_key, CHATBOT_NAME
 from backend.data_models.data_models import Tool
 from backend.prompts.build_prompt import generate_tooled_system_prompt, generate_data_processor_system_prompt
+from backend.replay.gemini import create_model
+from config.replay import UPSTREAM_MODE
 
 GEMINI_MODEL: str = "gemini-2.5-flash"
 MODEL_CONFIG: genai.GenerationConfig = genai.GenerationConfig(
@@ -12,9 +22,9 @@ MODEL_CONFIG: genai.GenerationConfig = genai.GenerationConfig(
 
 TOOLS_LIST: list[Tool] = [
     Tool(
-        name="get_weather_info",
-        function=get_weather_info,
-        description="Fetches 7-day hourly weather forecast data for a specific location. Returns temperature (in Celsius), relative humidity, cloud cover, wind speed (in km/h), precipitation in the last hour (in mm), snowfall in the last hour (in mm), and precipitation probability.",
+        name="get_event_weather_info",
+        function=get_event_weather_info,
+        description="Fetches the weather forecast for a specific location: hourly values for the requested date, plus the daily min/max/mean of each value for the other days of the coming week. Covers temperature (in Celsius), relative humidity, cloud cover, wind speed (in km/h), precipitation in the last hour (in mm), snowfall in the last hour (in mm), and precipitation probability.",
         params={
             "location": {
                 "type": "string",
@@ -24,13 +34,15 @@ TOOLS_LIST: list[Tool] = [
             "event_date": {
                 "type": "string",
                 "description": "Date for the weather forecast in YYYY-MM-DD format (e.g., '2024-12-25').",
-                "required": True
+                "required": True,
+                "format": "date",
+                "validator": _validate_event_date
             }
         },
         constraints=(
             "Only works for dates within the next 7 days (today through 6 days from now). "
             "Date must be in YYYY-MM-DD format. "
-            "Returns full 7-day forecast regardless of requested date. "
+            "Hourly detail is only returned for the requested date; call again with another date to see that day hour by hour. "
             "If past dates or dates beyond 7 days are requested, will return an error."
         ),
         usage_examples=[
@@ -39,26 +51,102 @@ TOOLS_LIST: list[Tool] = [
             "User is planning an outdoor event and needs forecast data",
             "User asks about temperature, precipitation, or wind conditions"
         ]
+    ),
+    Tool(
+        name="get_event_weather_info_batch",
+        function=get_event_weather_info_batch,
+        description="Fetches the same forecast as get_event_weather_info for several locations in a single call. Returns one result per location, in the order given, each with its own error field.",
+        params={
+            "locations": {
+                "type": "array of strings",
+                "description": "City names to compare (e.g., ['Seattle', 'Portland', 'San Diego']).",
+                "required": True
+            },
+            "event_date": {
+                "type": "string",
+                "description": "Date for the weather forecast in YYYY-MM-DD format (e.g., '2024-12-25').",
+                "required": True,
+                "format": "date",
+                "validator": _validate_event_date
+            }
+        },
+        constraints=(
+            "Same date rules as get_event_weather_info. "
+            "Prefer this over several get_event_weather_info calls whenever more than one location is needed. "
+            "A location that cannot be found only fails its own entry."
+        ),
+        usage_examples=[
+            "User is choosing between several cities for an event",
+            "User asks to compare the weather in two or more places"
+        ]
     )
 ]
 
+# Function declarations built once from TOOLS_LIST; model calls are validated against the same specs.
+TOOL_REGISTRY: ToolRegistry = ToolRegistry(TOOLS_LIST)
+
 GEMINI_SECRET_KEY_NAME: str = "GEMINI_API_SECRET"
-GEMINI_API_SECRET: str = get_api_key(GEMINI_SECRET_KEY_NAME)
+# Timezone whose calendar day the tooled prompt's "today/tomorrow" block is rendered for; "" is server local time.
+PROMPT_TIMEZONE: str = os.getenv("PROMPT_TIMEZONE", "")
 
-tooled_system_prompt = generate_tooled_system_prompt(CHATBOT_NAME, TOOLS_LIST)
-data_processor_system_prompt = generate_data_processor_system_prompt()
+_models: dict[tuple[str, str | None], tuple[date | None, Any]] = {}
+_models_lock = threading.Lock()
+_genai_configured = False
 
-genai.configure(api_key=GEMINI_API_SECRET)
 
-tooled_model: genai.GenerativeModel = genai.GenerativeModel(
-    model_name=GEMINI_MODEL,
-    generation_config=MODEL_CONFIG,
-    tools=[tool.function for tool in TOOLS_LIST],
-    system_instruction=tooled_system_prompt
-)
+def get_tooled_model(timezone: str = PROMPT_TIMEZONE) -> genai.GenerativeModel:
+    """Chat model with the weather tools, built on first use and rebuilt once the date in ``timezone`` changes."""
+    return _get_model("tooled", timezone, lambda now: genai.GenerativeModel(
+        model_name=GEMINI_MODEL,
+        generation_config=MODEL_CONFIG,
+        tools=_tool_library(),
+        system_instruction=generate_tooled_system_prompt(CHATBOT_NAME, TOOLS_LIST, now)
+    ))
+
+
+def get_data_processor_model() -> genai.GenerativeModel:
+    """Weather_Man report model; its prompt does not depend on the date, so it is built once."""
+    return _get_model("data_processor", None, lambda now: genai.GenerativeModel(
+        model_name=GEMINI_MODEL,
+        generation_config=MODEL_CONFIG,
+        system_instruction=generate_data_processor_system_prompt()
+    ))
+
+
+@cache
+def _tool_library() -> genai.types.FunctionLibrary:
+    """The registry's declarations in the SDK's form, converted once and shared by every tooled model."""
+    return genai.types.FunctionLibrary(tools=[{"function_declarations": TOOL_REGISTRY.declarations}])
+
+
+def resolve_prompt_timezone(timezone: str | None) -> str:
+    """``timezone`` if it is a known IANA name (e.g. the browser's), else ``PROMPT_TIMEZONE``."""
+    return timezone if timezone in _known_timezones() else PROMPT_TIMEZONE
+
+
+@cache
+def _known_timezones() -> frozenset[str]:
+    return frozenset(available_timezones())
+
+
+def _get_model(name: str, timezone: str | None, build: Callable[[datetime | None], genai.GenerativeModel]) -> Any:
+    """Cached model per (name, timezone), rebuilt when that timezone's date moves on; ``None`` builds it once."""
+    now = None
+    if timezone is not None:
+        now = datetime.now(ZoneInfo(timezone)) if timezone else datetime.now()
+    day = now.date() if now else None
+
+    with _models_lock:
+        cached = _models.get((name, timezone))
+        if cached is None or cached[0] != day:
+            _configure_genai()
+            cached = _models[(name, timezone)] = (day, create_model(name, lambda: build(now)))
+    return cached[1]
+
 
-data_processor_model: genai.GenerativeModel = genai.GenerativeModel(
-    model_name=GEMINI_MODEL,
-    generation_config=MODEL_CONFIG,
-    system_instruction=data_processor_system_prompt
-)
\ No newline at end of file
+def _configure_genai() -> None:
+    """Read the API key and configure the client on first model build; replayed runs need neither."""
+    global _genai_configured
+    if not _genai_configured and UPSTREAM_MODE != "replay":
+        genai.configure(api_key=get_api_key(GEMINI_SECRET_KEY_NAME))
+    _genai_configured = True
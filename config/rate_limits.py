@@ -0,0 +1,21 @@
+import os
+
+
+def _budget(prefix: str, rate: str, burst: str) -> tuple[float, int]:
+    return float(os.getenv(f"{prefix}_RATE_PER_SECOND", rate)), int(os.getenv(f"{prefix}_RATE_BURST", burst))
+
+
+# Requests per second and burst each upstream endpoint gets from the whole process (backend/utils/rate_limit.py).
+# Open-Meteo's free tier allows 600 calls a minute per API; Gemini's budget depends on the key's tier.
+# A rate of 0 leaves the endpoint unlimited.
+RATE_LIMITS: dict[str, tuple[float, int]] = {
+    "forecast": _budget("FORECAST", "10", "10"),
+    "geocoding": _budget("GEOCODING", "10", "10"),
+    "gemini": _budget("GEMINI", "2", "4"),
+}
+RATE_LIMIT_ENABLED: bool = os.getenv("RATE_LIMIT_ENABLED", "true").lower() == "true"
+
+# A caller still queued after this long gets RateLimitExceeded instead of a token.
+RATE_LIMIT_MAX_WAIT_SECONDS: float = float(os.getenv("RATE_LIMIT_MAX_WAIT_SECONDS", "30"))
+# How long an endpoint stops handing out tokens after a 429 that carries no Retry-After.
+RATE_LIMIT_THROTTLED_PAUSE_SECONDS: float = float(os.getenv("RATE_LIMIT_THROTTLED_PAUSE_SECONDS", "5"))
@@ -0,0 +1,27 @@
+import os
+
+# "live" calls Open-Meteo and Gemini directly. "record" routes HTTP through the local stand-in, which forwards
+# to the real services and saves every response; "replay" serves only saved responses and never touches the
+# network. Latency and error injection apply to replayed responses.
+UPSTREAM_MODE: str = os.getenv("UPSTREAM_MODE", "live").lower()
+if UPSTREAM_MODE not in ("live", "record", "replay"):
+    raise ValueError(f"Unknown UPSTREAM_MODE: {UPSTREAM_MODE}")
+
+REPLAY_FIXTURES_DIR: str = os.getenv(
+    "REPLAY_FIXTURES_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "tests", "fixtures", "replay")
+)
+REPLAY_HOST: str = os.getenv("REPLAY_HOST", "127.0.0.1")
+REPLAY_PORT: int = int(os.getenv("REPLAY_PORT", "8765"))
+REPLAY_LATENCY_SECONDS: float = float(os.getenv("REPLAY_LATENCY_SECONDS", "0"))
+REPLAY_LATENCY_JITTER_SECONDS: float = float(os.getenv("REPLAY_LATENCY_JITTER_SECONDS", "0"))
+REPLAY_ERROR_RATE: float = float(os.getenv("REPLAY_ERROR_RATE", "0"))
+REPLAY_SEED: int = int(os.getenv("REPLAY_SEED", "0"))
+
+# Stand-in path prefix -> real service. Requests to http://REPLAY_HOST:REPLAY_PORT/<prefix>/... map onto it.
+REPLAY_UPSTREAMS: dict[str, str] = {
+    "geocoding": "https://geocoding-api.open-meteo.com",
+    "forecast": "https://api.open-meteo.com",
+}
+# Query parameters left out of fixture keys, so recordings keep matching as the forecast window moves.
+REPLAY_VOLATILE_PARAMS: tuple[str, ...] = ("start_date", "end_date")
@@ -0,0 +1,21 @@
+import os
+
+from config.base import ENV
+
+# Spans around geocoding, forecast fetches, transforms, LLM round trips and tool calls feed in-process latency
+# histograms (backend/utils/tracing.py). Set to "false" to make every span a no-op.
+TRACING_ENABLED: bool = os.getenv("TRACING_ENABLED", "true").lower() == "true"
+
+# Finished spans are appended here as JSON lines when set.
+TRACE_EXPORT_PATH: str = os.getenv("TRACE_EXPORT_PATH", "")
+
+# Histogram bucket upper bounds, in milliseconds; slower spans land in a final overflow bucket.
+TRACE_HISTOGRAM_BUCKETS_MS: tuple[float, ...] = (
+    1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000, 20000, 60000
+)
+
+# Spans kept per request trace for the debug panel.
+TRACE_MAX_SPANS: int = int(os.getenv("TRACE_MAX_SPANS", "500"))
+
+# Timing expander under the Skye, Weather_Man and Weather_Info pages.
+DEBUG_PANEL_ENABLED: bool = os.getenv("DEBUG_PANEL_ENABLED", "true" if ENV == "dev" else "false").lower() == "true"
@@ -0,0 +1,88 @@
+import os
+
+from config.replay import REPLAY_HOST, REPLAY_PORT, UPSTREAM_MODE
+
+ASSETS_DIR: str = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "assets")
+
+# Outside "live" mode both services are reached through the local record/replay stand-in (config/replay.py).
+_REPLAY_BASE_URL: str = f"http://{REPLAY_HOST}:{REPLAY_PORT}"
+
+GEOCODING_URL: str = (
+    "https://geocoding-api.open-meteo.com/v1/search" if UPSTREAM_MODE == "live"
+    else f"{_REPLAY_BASE_URL}/geocoding/v1/search"
+)
+
+GEOCODING_CACHE_PATH: str = os.getenv("GEOCODING_CACHE_PATH", ".geocoding_cache.sqlite")
+GEOCODING_CACHE_MAX_ENTRIES: int = int(os.getenv("GEOCODING_CACHE_MAX_ENTRIES", "10000"))
+# Candidates asked for when a location carries a qualifier ("Paris, TX"), which is matched locally.
+GEOCODING_QUALIFIED_RESULTS: int = int(os.getenv("GEOCODING_QUALIFIED_RESULTS", "10"))
+
+# Bundled GeoNames extract (cities with population >= 100k); set to "" to always geocode over the network.
+GAZETTEER_PATH: str = os.getenv("GAZETTEER_PATH", os.path.join(ASSETS_DIR, "gazetteer.tsv"))
+
+FORECAST_URL: str = (
+    "https://api.open-meteo.com/v1/forecast" if UPSTREAM_MODE == "live" else f"{_REPLAY_BASE_URL}/forecast/v1/forecast"
+)
+FORECAST_HTTP_CACHE_PATH: str = os.getenv("FORECAST_HTTP_CACHE_PATH", ".cache")
+# The HTTP cache is off by default outside "live" mode so every call reaches the stand-in and its injected latency.
+FORECAST_HTTP_CACHE_EXPIRE_SECONDS: int = int(
+    os.getenv("FORECAST_HTTP_CACHE_EXPIRE_SECONDS", "3600" if UPSTREAM_MODE == "live" else "0")
+)
+
+# Shared by every session in the process; one keep-alive pool per upstream host.
+HTTP_POOL_SIZE: int = int(os.getenv("HTTP_POOL_SIZE", "16"))
+HTTP_TIMEOUT_SECONDS: float = float(os.getenv("HTTP_TIMEOUT_SECONDS", "10"))
+HTTP_MAX_RETRIES: int = int(os.getenv("HTTP_MAX_RETRIES", "5"))
+HTTP_BACKOFF_FACTOR: float = float(os.getenv("HTTP_BACKOFF_FACTOR", "0.2"))
+
+HOURLY_VARIABLES: tuple[str, ...] = (
+    "temperature_2m", "relative_humidity_2m", "cloud_cover", "wind_speed_10m", "precipitation", "snowfall",
+    "precipitation_probability"
+)
+
+# Decimal places each variable is rounded to when forecasts are written into prompts and tool responses.
+VARIABLE_DECIMALS: dict[str, int] = {
+    "temperature_2m": 1, "relative_humidity_2m": 0, "cloud_cover": 0, "wind_speed_10m": 1, "precipitation": 1,
+    "snowfall": 2, "precipitation_probability": 0
+}
+
+# "memory" shares forecasts between the sessions of one process; "sqlite" also shares them between processes.
+FORECAST_CACHE_BACKEND: str = os.getenv("FORECAST_CACHE_BACKEND", "memory").lower()
+FORECAST_CACHE_PATH: str = os.getenv("FORECAST_CACHE_PATH", ".forecast_cache.sqlite")
+FORECAST_CACHE_TTL_SECONDS: int = int(os.getenv("FORECAST_CACHE_TTL_SECONDS", "1800"))
+# How long a caller waits on another caller's fetch of the same grid point before fetching it itself.
+FORECAST_FLIGHT_WAIT_SECONDS: float = float(os.getenv("FORECAST_FLIGHT_WAIT_SECONDS", "45"))
+FORECAST_CACHE_MAX_ENTRIES: int = int(os.getenv("FORECAST_CACHE_MAX_ENTRIES", "1000"))
+# Coordinates are snapped to this grid (degrees, ~11 km at 0.1) so nearby lookups share one forecast.
+FORECAST_GRID_DEGREES: float = float(os.getenv("FORECAST_GRID_DEGREES", "0.1"))
+
+# Hot locations are refreshed in the background shortly before their forecast expires (backend/utils/refresher.py).
+# An expired entry is still served for up to FORECAST_STALE_SECONDS while its refresh runs; 0 turns that off.
+FORECAST_REFRESH_ENABLED: bool = os.getenv("FORECAST_REFRESH_ENABLED", "true").lower() == "true"
+FORECAST_STALE_SECONDS: int = int(os.getenv("FORECAST_STALE_SECONDS", "600"))
+FORECAST_REFRESH_AHEAD_SECONDS: int = int(os.getenv("FORECAST_REFRESH_AHEAD_SECONDS", "120"))
+FORECAST_REFRESH_INTERVAL_SECONDS: float = float(os.getenv("FORECAST_REFRESH_INTERVAL_SECONDS", "30"))
+# Grid points kept warm: the most requested ones, counted with this half-life, once asked for at least twice.
+FORECAST_REFRESH_HOT_LOCATIONS: int = int(os.getenv("FORECAST_REFRESH_HOT_LOCATIONS", "50"))
+FORECAST_REFRESH_HALF_LIFE_SECONDS: float = float(os.getenv("FORECAST_REFRESH_HALF_LIFE_SECONDS", "3600"))
+FORECAST_REFRESH_MIN_REQUESTS: float = float(os.getenv("FORECAST_REFRESH_MIN_REQUESTS", "2"))
+
+# The "memory" forecast cache is saved here periodically and reloaded when a process starts; off ("") by default.
+# The file is unpickled at startup, so only point this at a path writable by nobody but the app.
+FORECAST_SNAPSHOT_PATH: str = os.getenv("FORECAST_SNAPSHOT_PATH", "")
+FORECAST_SNAPSHOT_INTERVAL_SECONDS: float = float(os.getenv("FORECAST_SNAPSHOT_INTERVAL_SECONDS", "300"))
+# Optional text file of cities (one per line, "#" comments) whose forecasts a new process fetches at startup.
+WARM_START_CITIES_PATH: str = os.getenv("WARM_START_CITIES_PATH", "")
+
+# Weather_Man reports, keyed by location, date, units and forecast content; same backend choices as forecasts.
+REPORT_CACHE_BACKEND: str = os.getenv("REPORT_CACHE_BACKEND", "memory").lower()
+REPORT_CACHE_PATH: str = os.getenv("REPORT_CACHE_PATH", ".report_cache.sqlite")
+REPORT_CACHE_TTL_SECONDS: int = int(os.getenv("REPORT_CACHE_TTL_SECONDS", "3600"))
+REPORT_CACHE_MAX_ENTRIES: int = int(os.getenv("REPORT_CACHE_MAX_ENTRIES", "500"))
+
+GEOCODING_CONCURRENCY: int = int(os.getenv("GEOCODING_CONCURRENCY", "8"))
+# Locations per multi-coordinate forecast request, keeping URLs well under server limits.
+FORECAST_BATCH_SIZE: int = int(os.getenv("FORECAST_BATCH_SIZE", "50"))
+
+# Upstream requests the async backend keeps in flight at once, per event loop.
+ASYNC_MAX_CONCURRENCY: int = int(os.getenv("ASYNC_MAX_CONCURRENCY", "32"))
@@ -1,11 +1,22 @@
 import streamlit as st
 
-from backend.utils.utils import invoke_gemini_tooled_model
-from config.gemini import tooled_model, TOOLS_LIST
+from backend.utils.debug_panel import render_debug_panel
+from backend.utils.history import ConversationHistoryManager
+from backend.utils.llm import stream_gemini_tooled_model
+from backend.utils.tracing import trace
+from backend.utils.warm_start import warm_start
+from backend.utils.weather import dates_in_timezone
+from config.gemini import get_tooled_model, resolve_prompt_timezone, TOOL_REGISTRY
 from config.base import CHATBOT_NAME
 
+warm_start()
+
 if "chat_history" not in st.session_state:
     st.session_state.chat_history = []
+if "model_history" not in st.session_state:
+    st.session_state.model_history = []
+if "history_manager" not in st.session_state:
+    st.session_state.history_manager = ConversationHistoryManager()
 
 st.set_page_config(page_title=f"{CHATBOT_NAME} - Event Planner Chatbot", layout="wide")
 st.title("Smart Event Planner Chatbot")
@@ -30,11 +41,21 @@ if prompt:
     with st.chat_message("user", avatar="👤"):
         st.markdown(prompt)
 
-    chat = [message["message_content"] for message in st.session_state.chat_history]
+    # Dates in the prompt ("today", "tomorrow") follow the user's browser clock when it reports a known timezone.
+    timezone = resolve_prompt_timezone(st.context.timezone)
+    chat = st.session_state.history_manager.compact(st.session_state.model_history)
+    compacted_length = len(chat)
+
+    # The tools check event dates against the same calendar day the prompt was rendered for.
+    with st.chat_message("model", avatar="🤖"), trace("skye.answer") as answer_trace, dates_in_timezone(timezone):
+        metrics = {}
+        response = st.write_stream(stream_gemini_tooled_model(get_tooled_model(timezone), prompt, chat, TOOL_REGISTRY, metrics))
+        st.session_state.time_to_first_token = metrics.get("time_to_first_token")
+    st.session_state.skye_trace = answer_trace
+
+    st.session_state.model_history.extend(chat[compacted_length:])
+    st.session_state.model_history.append({"role": "model", "parts": [response]})
 
-    with st.chat_message("model", avatar="🤖"):
-        with st.spinner("Thinking..."):
-            response = invoke_gemini_tooled_model(tooled_model, prompt, chat, TOOLS_LIST)
-            st.markdown(response)
+    st.session_state.chat_history.append({"message_content": {"role": "model", "parts": [response]}, "avatar": "🤖"})
 
-    st.session_state.chat_history.append({"message_content": {"role": "model", "parts": [response]}, "avatar": "🤖"})
\ No newline at end of file
+render_debug_panel(st.session_state.get("skye_trace"))
@@ -1,29 +1,12 @@
 import streamlit as st
 import pandas as pd
 from datetime import datetime
-from backend.utils.utils import get_weather_info
-
-
-def _process_weather_data(weather_info: dict) -> pd.DataFrame:
-    if weather_info.get("error") or not weather_info.get("data"):
-        return pd.DataFrame()
-
-    all_records = []
-    for date, hourly_data in weather_info["data"].items():
-        for record in hourly_data:
-            record_copy = record.copy()
-            record_copy["date"] = date
-            all_records.append(record_copy)
-
-    return pd.DataFrame(all_records)
-
-
-def _filter_by_hour_range(df: pd.DataFrame, date: str, start_hour: int, end_hour: int) -> pd.DataFrame:
-    date_df = df[df["date"] == date].copy()
-    date_df["hour_num"] = date_df["hour"].str.split(":").str[0].astype(int)
-    filtered_df = date_df[(date_df["hour_num"] >= start_hour) & (date_df["hour_num"] <= end_hour)]
-    filtered_df["hour_label"] = filtered_df["hour_num"].apply(lambda x: f"{int(x):02d}:00")
-    return filtered_df.sort_values("hour_num")
+from backend.utils.async_weather import get_forecast_async, run_sync
+from backend.utils.debug_panel import render_debug_panel
+from backend.utils.gazetteer import suggest_locations
+from backend.utils.tracing import trace
+from backend.utils.warm_start import warm_start
+from backend.utils.weather_frames import HourlyWeatherFrame, filter_by_hour_range, process_weather_data
 
 
 def display_temperature_humidity_chart(df: pd.DataFrame) -> None:
@@ -75,12 +58,14 @@ st.set_page_config(
     page_icon="🌤️",
 )
 
-necessary_session_keys = ["weather_data_df", "location", "available_dates"]
+warm_start()
+
+necessary_session_keys = ["weather_frame", "location", "available_dates"]
 
 for key in necessary_session_keys:
     if key not in st.session_state:
-        if key == "weather_data_df":
-            st.session_state[key] = pd.DataFrame()
+        if key == "weather_frame":
+            st.session_state[key] = HourlyWeatherFrame.empty()
         elif key == "location":
             st.session_state[key] = ""
         elif key == "available_dates":
@@ -97,23 +82,29 @@ location_input = st.text_input(
     placeholder="Enter city name"
 )
 
+location_suggestions = suggest_locations(location_input)
+if location_suggestions:
+    selected_suggestion = st.pills("Did you mean:", options=location_suggestions)
+    if selected_suggestion:
+        location_input = selected_suggestion
+
 col1, col2, col3 = st.columns(3)
 
 with col2:
     if st.button("Fetch Weather Data"):
         if location_input:
-            with st.spinner(f"Fetching weather data for {location_input}..."):
+            with st.spinner(f"Fetching weather data for {location_input}..."), trace("weather_info.fetch") as fetch_trace:
+                st.session_state.weather_info_trace = fetch_trace
                 try:
                     today_date = datetime.now().strftime("%Y-%m-%d")
-                    weather_response = get_weather_info(location_input, today_date)
+                    weather_response = run_sync(get_forecast_async(location_input, today_date))
 
                     if weather_response.get("error"):
                         st.error(f"Error fetching data: {weather_response['error']}")
                     else:
-                        st.session_state.weather_data_df = _process_weather_data(weather_response)
+                        st.session_state.weather_frame = process_weather_data(weather_response)
                         st.session_state.location = location_input
-                        st.session_state.available_dates = sorted(
-                            st.session_state.weather_data_df["date"].unique().tolist())
+                        st.session_state.available_dates = st.session_state.weather_frame.dates
                         st.success(f"Successfully loaded weather data for {location_input}!")
                 except Exception as e:
                     st.error(f"Failed to fetch weather data: {str(e)}")
@@ -122,7 +113,7 @@ with col2:
 
 st.divider()
 
-if not st.session_state.weather_data_df.empty:
+if not st.session_state.weather_frame.is_empty:
     st.header("Weather Graphs")
     st.write(f"**Location:** {st.session_state.location}")
 
@@ -156,8 +147,8 @@ if not st.session_state.weather_data_df.empty:
         )
 
     if start_hour_1 <= end_hour_1:
-        filtered_data_1 = _filter_by_hour_range(
-            st.session_state.weather_data_df,
+        filtered_data_1 = filter_by_hour_range(
+            st.session_state.weather_frame,
             selected_date_1,
             start_hour_1,
             end_hour_1
@@ -200,8 +191,8 @@ if not st.session_state.weather_data_df.empty:
         )
 
     if start_hour_2 <= end_hour_2:
-        filtered_data_2 = _filter_by_hour_range(
-            st.session_state.weather_data_df,
+        filtered_data_2 = filter_by_hour_range(
+            st.session_state.weather_frame,
             selected_date_2,
             start_hour_2,
             end_hour_2
@@ -244,8 +235,8 @@ if not st.session_state.weather_data_df.empty:
         )
 
     if start_hour_3 <= end_hour_3:
-        filtered_data_3 = _filter_by_hour_range(
-            st.session_state.weather_data_df,
+        filtered_data_3 = filter_by_hour_range(
+            st.session_state.weather_frame,
             selected_date_3,
             start_hour_3,
             end_hour_3
@@ -258,4 +249,6 @@ if not st.session_state.weather_data_df.empty:
         st.error("Start hour must be less than or equal to end hour")
 
 else:
-    st.info("Enter a location and click 'Fetch Weather Data' to view visualizations")
\ No newline at end of file
+    st.info("Enter a location and click 'Fetch Weather Data' to view visualizations")
+
+render_debug_panel(st.session_state.get("weather_info_trace"))
@@ -1,9 +1,15 @@
 import streamlit as st
 from datetime import datetime, timedelta
 
-from backend.utils.utils import get_weather_info, invoke_gemini_data_processor_model
-from backend.prompts.build_prompt import generate_data_processor_user_prompt
-from config.gemini import data_processor_model
+from backend.utils.async_weather import get_forecast_async, run_sync
+from backend.utils.llm import get_weather_report
+from backend.utils.debug_panel import render_debug_panel
+from backend.utils.gazetteer import suggest_locations
+from backend.utils.tracing import trace
+from backend.utils.warm_start import warm_start
+from config.gemini import get_data_processor_model
+
+warm_start()
 
 st.set_page_config(page_title="Weather Man", layout="wide")
 
@@ -21,6 +27,12 @@ with st.container():
             placeholder="e.g., Atlanta, New York, Tokyo...",
         )
 
+        location_suggestions = suggest_locations(location)
+        if location_suggestions:
+            selected_suggestion = st.pills("Did you mean:", options=location_suggestions)
+            if selected_suggestion:
+                location = selected_suggestion
+
     with col2:
         date = st.date_input(
             label="Date (within 7 days)",
@@ -41,11 +53,13 @@ with center_button:
     get_forecast = st.button("🔍 Get Forecast", use_container_width=True)
 
 if get_forecast:
-    with st.spinner("Fetching weather data..."):
-        weather_info = get_weather_info(location, date.strftime("%Y-%m-%d"))
-        prompt = generate_data_processor_user_prompt(weather_info, location, date, preferred_units)
-        response = invoke_gemini_data_processor_model(data_processor_model, prompt)
+    with st.spinner("Fetching weather data..."), trace("weather_man.report") as report_trace:
+        weather_info = run_sync(get_forecast_async(location, date.strftime("%Y-%m-%d")))
+        response = get_weather_report(get_data_processor_model(), weather_info, preferred_units)
 
     st.markdown("---")
     st.subheader("📄 Forecast Report")
     st.markdown(response)
+    st.session_state.weather_man_trace = report_trace
+
+render_debug_panel(st.session_state.get("weather_man_trace"))
@@ -0,0 +1,212 @@
+import asyncio
+import threading
+import time
+from datetime import datetime
+from unittest.mock import Mock, patch
+
+import pytest
+
+from backend.replay.synthetic import SyntheticResponse
+
+
+class FakeAsyncUpstream:
+    """Async session and Open-Meteo client stand-in that records how many requests overlap"""
+
+    def __init__(self, delay: float = 0.05, coordinates: dict | None = None):
+        self.delay = delay
+        self.coordinates = coordinates or {}
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.geocoding_calls = 0
+        self.forecast_calls = 0
+
+    async def _request(self):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.in_flight -= 1
+
+    async def get(self, url, params=None):
+        self.geocoding_calls += 1
+        await self._request()
+        response = Mock()
+        response.status_code = 200
+        if params["name"] in self.coordinates:
+            latitude, longitude = self.coordinates[params["name"]]
+            response.json.return_value = {"results": [{"latitude": latitude, "longitude": longitude}]}
+        else:
+            response.json.return_value = {}
+        return response
+
+    async def weather_api(self, url, params=None):
+        self.forecast_calls += 1
+        await self._request()
+        return [SyntheticResponse(hours=24, seed=seed) for seed in range(len(params["latitude"]))]
+
+
+def _patch_upstream(upstream: FakeAsyncUpstream, concurrency: int = 32):
+    semaphores = {}
+
+    def resources():
+        loop = asyncio.get_running_loop()
+        semaphore = semaphores.setdefault(loop, asyncio.Semaphore(concurrency))
+        return upstream, upstream, semaphore
+
+    return patch("backend.utils.async_weather._get_loop_resources", side_effect=resources)
+
+
+class TestAsyncGeocoding:
+    """Test the async location lookup"""
+
+    def test_concurrent_lookups_overlap(self):
+        """Test that independent lookups are in flight at the same time"""
+        from backend.utils.async_weather import _get_location_coordinates_async
+
+        cities = [f"city {i}" for i in range(10)]
+        upstream = FakeAsyncUpstream(delay=0.1, coordinates={city: (i, i) for i, city in enumerate(cities)})
+
+        async def lookup_all():
+            return await asyncio.gather(*(_get_location_coordinates_async(city) for city in cities))
+
+        with _patch_upstream(upstream):
+            start = time.perf_counter()
+            coordinates = asyncio.run(lookup_all())
+            elapsed = time.perf_counter() - start
+
+        assert coordinates == [(i, i) for i in range(10)]
+        assert upstream.max_in_flight == 10
+        assert elapsed < 0.5
+
+    def test_semaphore_bounds_in_flight_requests(self):
+        """Test that no more than the configured number of requests run at once"""
+        from backend.utils.async_weather import _get_location_coordinates_async
+
+        cities = [f"city {i}" for i in range(12)]
+        upstream = FakeAsyncUpstream(delay=0.02, coordinates={city: (i, i) for i, city in enumerate(cities)})
+
+        async def lookup_all():
+            return await asyncio.gather(*(_get_location_coordinates_async(city) for city in cities))
+
+        with _patch_upstream(upstream, concurrency=3):
+            asyncio.run(lookup_all())
+
+        assert upstream.max_in_flight == 3
+
+    def test_lookup_uses_and_fills_cache(self):
+        """Test that a resolved location is not requested again"""
+        from backend.utils.async_weather import _get_location_coordinates_async
+
+        upstream = FakeAsyncUpstream(delay=0, coordinates={"london": (51.5085, -0.1257)})
+
+        with _patch_upstream(upstream):
+            first = asyncio.run(_get_location_coordinates_async("London"))
+            second = asyncio.run(_get_location_coordinates_async("  LONDON "))
+
+        assert first == second == (51.5085, -0.1257)
+        assert upstream.geocoding_calls == 1
+
+    def test_unknown_city_raises(self):
+        """Test that an empty geocoding result raises like the sync lookup"""
+        from backend.utils.async_weather import _get_location_coordinates_async
+
+        with _patch_upstream(FakeAsyncUpstream(delay=0)):
+            with pytest.raises(ValueError, match="City not found"):
+                asyncio.run(_get_location_coordinates_async("XYZ123InvalidCity"))
+
+
+class TestAsyncWeatherInfo:
+    """Test the async weather functions and the sync shim"""
+
+    def test_weather_info_matches_sync_shape(self):
+        """Test that the async result has the same keys as the sync one"""
+        from backend.utils.async_weather import get_weather_info_async
+
+        upstream = FakeAsyncUpstream(delay=0, coordinates={"london": (51.5085, -0.1257)})
+        event_date = datetime.now().strftime("%Y-%m-%d")
+
+        with _patch_upstream(upstream):
+            result = asyncio.run(get_weather_info_async("London", event_date))
+
+        assert result["error"] is None
+        assert result["location"] == "London"
+        assert len(result["data"]["time"]) == 24
+
+    def test_batch_reports_errors_per_location(self):
+        """Test that a failed geocode does not affect the other locations"""
+        from backend.utils.async_weather import get_weather_info_batch_async
+
+        upstream = FakeAsyncUpstream(delay=0, coordinates={"london": (51.5085, -0.1257), "tokyo": (35.6895, 139.6917)})
+        event_date = datetime.now().strftime("%Y-%m-%d")
+
+        with _patch_upstream(upstream):
+            results = asyncio.run(get_weather_info_batch_async(["London", "XYZ123InvalidCity", "Tokyo"], event_date))
+
+        assert upstream.forecast_calls == 1
+        assert results[0]["error"] is None and results[2]["error"] is None
+        assert "City not found" in results[1]["error"]
+
+    def test_cache_calls_kept_off_the_loop(self, isolated_geocoding_cache, isolated_forecast_cache):
+        """Test that the (possibly SQLite-backed) caches are read and written from worker threads"""
+        from backend.utils.async_weather import get_weather_info_async
+
+        upstream = FakeAsyncUpstream(delay=0, coordinates={"london": (51.5085, -0.1257)})
+        event_date = datetime.now().strftime("%Y-%m-%d")
+        threads = set()
+
+        def on_thread(method):
+            def call(*args, **kwargs):
+                threads.add(threading.current_thread())
+                return method(*args, **kwargs)
+            return call
+
+        async def main():
+            result = await get_weather_info_async("London", event_date)
+            return result, threading.current_thread()
+
+        with _patch_upstream(upstream), \
+                patch.object(isolated_geocoding_cache, "get", on_thread(isolated_geocoding_cache.get)), \
+                patch.object(isolated_geocoding_cache, "set", on_thread(isolated_geocoding_cache.set)), \
+                patch.object(isolated_forecast_cache, "lookup", on_thread(isolated_forecast_cache.lookup)), \
+                patch.object(isolated_forecast_cache, "set", on_thread(isolated_forecast_cache.set)):
+            result, loop_thread = asyncio.run(main())
+
+        assert result["error"] is None
+        assert threads and loop_thread not in threads
+
+    def test_invalid_date_skips_upstream(self):
+        """Test that an invalid date is reported without any request"""
+        from backend.utils.async_weather import get_weather_info_async
+
+        upstream = FakeAsyncUpstream(delay=0)
+        with _patch_upstream(upstream):
+            result = asyncio.run(get_weather_info_async("London", "not a date"))
+
+        assert "Invalid date format" in result["error"]
+        assert upstream.geocoding_calls == upstream.forecast_calls == 0
+
+    def test_run_sync_overlaps_calls_from_threads(self):
+        """Test that blocking callers on several threads share the background loop concurrently"""
+        from backend.utils.async_weather import get_forecast_async, run_sync
+
+        cities = [f"city {i}" for i in range(8)]
+        upstream = FakeAsyncUpstream(delay=0.1, coordinates={city: (i, i) for i, city in enumerate(cities)})
+        event_date = datetime.now().strftime("%Y-%m-%d")
+        results = [None] * len(cities)
+
+        def fetch(index):
+            results[index] = run_sync(get_forecast_async(cities[index], event_date))
+
+        with _patch_upstream(upstream):
+            start = time.perf_counter()
+            threads = [threading.Thread(target=fetch, args=(i,)) for i in range(len(cities))]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            elapsed = time.perf_counter() - start
+
+        assert all(result["error"] is None for result in results)
+        assert upstream.max_in_flight == len(cities)
+        assert elapsed < 0.8
@@ -0,0 +1,28 @@
+from benchmarks.bench_forecast_path import compare, run
+
+
+def _baseline(min_us: float, calibration_us: float = 100.0) -> dict:
+    return {
+        "calibration_us": calibration_us,
+        "hours": {"24": {"encode_forecast": {"min_us": min_us, "median_us": min_us, "peak_kib": 1.0, "retained_blocks": 0}}},
+    }
+
+
+class TestForecastPathBenchmark:
+    """Test the forecast path microbenchmarks"""
+
+    def test_every_stage_measured(self):
+        """Test that a short run reports time and memory for each stage"""
+        results = run([24], repeat=2)
+
+        stages = results["hours"]["24"]
+        assert {"get_weather_info (miss)", "get_weather_info (hit)", "process_weather_data",
+                "filter_by_hour_range x3", "data processor prompt"} <= set(stages)
+        for metrics in stages.values():
+            assert metrics["min_us"] > 0
+            assert metrics["peak_kib"] >= 0
+
+    def test_regressions_flagged_after_calibration(self):
+        """Test that slowdowns count only beyond what the calibration loop explains"""
+        assert compare(_baseline(200.0), _baseline(100.0), fail_over=50.0) == ["24h encode_forecast"]
+        assert compare(_baseline(200.0, calibration_us=200.0), _baseline(100.0), fail_over=50.0) == []
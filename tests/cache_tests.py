@@ -0,0 +1,238 @@
+import pytest
+from unittest.mock import Mock, patch
+
+
+class TestNormalizeLocationName:
+    """Test the geocoding cache key normalization"""
+
+    @pytest.mark.parametrize("location", ["Atlanta", "atlanta ", "  ATLANTA", "Atlanta,"])
+    def test_variants_share_key(self, location):
+        """Test that spelling variants of the same city normalize to one key"""
+        from backend.utils.geocoding import normalize_location_name
+        assert normalize_location_name(location) == "atlanta"
+
+    @pytest.mark.parametrize("location", ["Paris, TX", "paris,tx", "  PARIS ,  Tx "])
+    def test_qualifier_kept(self, location):
+        """Test that a state or country qualifier is folded like the name but kept in the key"""
+        from backend.utils.geocoding import normalize_location_name
+        assert normalize_location_name(location) == "paris, tx"
+
+    def test_qualified_places_do_not_share_key(self):
+        """Test that the same name in different places gets different keys"""
+        from backend.utils.geocoding import normalize_location_name
+        assert normalize_location_name("Paris, TX") != normalize_location_name("Paris, France")
+
+    def test_inner_whitespace_collapsed(self):
+        """Test that repeated inner whitespace is collapsed"""
+        from backend.utils.geocoding import normalize_location_name
+        assert normalize_location_name("New   York") == "new york"
+
+
+class TestSQLiteCache:
+    """Test the persistent SQLite-backed cache"""
+
+    def test_get_set_and_counters(self, tmp_path):
+        """Test that lookups are recorded as hits and misses"""
+        from backend.cache.sqlite_cache import SQLiteCache
+        cache = SQLiteCache(str(tmp_path / "cache.sqlite"), max_entries=10)
+
+        assert cache.get("atlanta") is None
+        cache.set("atlanta", (33.749, -84.388))
+        assert cache.get("atlanta") == (33.749, -84.388)
+
+        stats = cache.stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["hit_rate"] == 0.5
+        assert stats["entries"] == 1
+
+    def test_survives_restart(self, tmp_path):
+        """Test that entries written by one instance are visible to a new one"""
+        from backend.cache.sqlite_cache import SQLiteCache
+        path = str(tmp_path / "cache.sqlite")
+
+        first = SQLiteCache(path, max_entries=10)
+        first.set("london", (51.5085, -0.1257))
+        first.close()
+
+        second = SQLiteCache(path, max_entries=10)
+        assert second.get("london") == (51.5085, -0.1257)
+        assert second.hits == 1
+
+    def test_lru_eviction(self, tmp_path):
+        """Test that the least recently used entry is evicted once the bound is exceeded"""
+        from backend.cache.sqlite_cache import SQLiteCache
+        path = str(tmp_path / "cache.sqlite")
+        cache = SQLiteCache(path, max_entries=2)
+
+        with patch("backend.cache.sqlite_cache.time.time", side_effect=[1.0, 2.0, 3.0, 4.0]):
+            cache.set("a", 1)
+            cache.set("b", 2)
+            assert cache.get("a") == 1
+            cache.set("c", 3)
+
+        assert len(cache) == 2
+        fresh = SQLiteCache(path, max_entries=2)
+        assert fresh.get("a") == 1
+        assert fresh.get("b") is None
+        assert fresh.get("c") == 3
+
+    def test_ttl_expiry(self, tmp_path):
+        """Test that entries are not served after their TTL"""
+        from backend.cache.sqlite_cache import SQLiteCache
+        cache = SQLiteCache(str(tmp_path / "cache.sqlite"), max_entries=10, ttl=60)
+
+        with patch("backend.cache.sqlite_cache.time.time", side_effect=[0.0, 30.0, 61.0]):
+            cache.set("tokyo", (35.6895, 139.6917))
+            assert cache.get("tokyo") == (35.6895, 139.6917)
+            assert cache.get("tokyo") is None
+
+
+class TestCachedGeocoding:
+    """Test that geocoding goes through the cache"""
+
+    @patch('requests.Session.get')
+    def test_repeat_lookups_hit_cache(self, mock_get, isolated_geocoding_cache):
+        """Test that normalized repeat lookups only reach the API once"""
+        from backend.utils.geocoding import _get_location_coordinates
+
+        mock_response = Mock()
+        mock_response.status_code = 200
+        mock_response.json.return_value = {"results": [{"latitude": 33.749, "longitude": -84.388}]}
+        mock_get.return_value = mock_response
+
+        for location in ["Atlanta", "atlanta ", "  ATLANTA"]:
+            assert _get_location_coordinates(location) == (33.749, -84.388)
+
+        mock_get.assert_called_once()
+        assert mock_get.call_args.kwargs["params"]["name"] == "atlanta"
+        assert isolated_geocoding_cache.stats()["hits"] == 2
+
+    @patch('requests.Session.get')
+    def test_qualifier_picks_result(self, mock_get, isolated_geocoding_cache):
+        """Test that a qualified lookup searches the name and keeps the result in the named place"""
+        from backend.utils.geocoding import _get_location_coordinates
+
+        mock_response = Mock()
+        mock_response.status_code = 200
+        mock_response.json.return_value = {"results": [
+            {"latitude": 45.52345, "longitude": -122.67621, "country_code": "US", "admin1": "Oregon"},
+            {"latitude": 43.66147, "longitude": -70.25533, "country_code": "US", "admin1": "Maine"},
+        ]}
+        mock_get.return_value = mock_response
+
+        assert _get_location_coordinates("Portland, ME") == (43.66147, -70.25533)
+        assert mock_get.call_args.kwargs["params"]["name"] == "portland"
+        assert isolated_geocoding_cache.get("portland, me") == (43.66147, -70.25533)
+        assert isolated_geocoding_cache.get("portland") is None
+
+    @patch('requests.Session.get')
+    def test_unmatched_qualifier_not_found(self, mock_get, isolated_geocoding_cache):
+        """Test that results outside the named place are not used"""
+        from backend.utils.geocoding import _get_location_coordinates
+
+        mock_response = Mock()
+        mock_response.status_code = 200
+        mock_response.json.return_value = {"results": [
+            {"latitude": 48.85341, "longitude": 2.3488, "country_code": "FR", "country": "France"},
+        ]}
+        mock_get.return_value = mock_response
+
+        with pytest.raises(ValueError, match="City not found"):
+            _get_location_coordinates("Paris, Japan")
+
+    @patch('requests.Session.get')
+    def test_not_found_is_not_cached(self, mock_get, isolated_geocoding_cache):
+        """Test that failed lookups are retried rather than cached"""
+        from backend.utils.geocoding import _get_location_coordinates
+
+        mock_response = Mock()
+        mock_response.status_code = 200
+        mock_response.json.return_value = {"results": []}
+        mock_get.return_value = mock_response
+
+        for _ in range(2):
+            with pytest.raises(ValueError, match="City not found"):
+                _get_location_coordinates("Atlantis")
+
+        assert mock_get.call_count == 2
+        assert len(isolated_geocoding_cache) == 0
+
+
+class TestMemoryCache:
+    """Test the in-process LRU cache"""
+
+    def test_lru_eviction_and_stats(self):
+        """Test that the least recently used entry is evicted and lookups are counted"""
+        from backend.cache.memory_cache import MemoryCache
+        cache = MemoryCache(max_entries=2)
+
+        cache.set("a", 1)
+        cache.set("b", 2)
+        assert cache.get("a") == 1
+        cache.set("c", 3)
+
+        assert cache.get("b") is None
+        assert cache.get("c") == 3
+        assert cache.stats() == {"hits": 2, "misses": 1, "hit_rate": 2 / 3, "entries": 2, "max_entries": 2}
+
+    def test_ttl_expiry(self):
+        """Test that entries are not served after their TTL"""
+        from backend.cache.memory_cache import MemoryCache
+        cache = MemoryCache(max_entries=2, ttl=60)
+
+        with patch("backend.cache.memory_cache.time.time", side_effect=[0.0, 30.0, 61.0]):
+            cache.set("a", 1)
+            assert cache.get("a") == 1
+            assert cache.get("a") is None
+
+
+class TestForecastCache:
+    """Test the cross-session forecast cache"""
+
+    def test_nearby_coordinates_share_key(self):
+        """Test that coordinates in the same grid cell map to one entry"""
+        from backend.cache.forecast_cache import ForecastCache
+        from backend.cache.memory_cache import MemoryCache
+        cache = ForecastCache(MemoryCache(max_entries=10), grid_degrees=0.1)
+
+        assert cache.snap(40.71427, -74.00597) == (40.7, -74.0)
+        assert cache.key(40.71427, -74.00597, "2024-06-01") == cache.key(40.7128, -74.006, "2024-06-01")
+        assert cache.key(40.71427, -74.00597, "2024-06-01") != cache.key(40.71427, -74.00597, "2024-06-02")
+        assert cache.key(40.71427, -74.00597, "2024-06-01") != cache.key(40.81, -74.00597, "2024-06-01")
+
+    def test_sqlite_backend_round_trip(self, tmp_path):
+        """Test that forecasts survive pickling through the shared SQLite backend"""
+        import numpy as np
+        from backend.cache.forecast_cache import ForecastCache
+        from backend.cache.sqlite_cache import SQLiteCache
+        from backend.data_models.data_models import Forecast
+
+        path = str(tmp_path / "forecasts.sqlite")
+        forecast = Forecast(np.arange(0, 48 * 3600, 3600), np.ones((1, 48)), ("temperature_2m",), -3600, "Etc/GMT+1")
+        ForecastCache(SQLiteCache(path, max_entries=10), 0.1).set(33.749, -84.388, "2024-06-01", forecast)
+
+        restored = ForecastCache(SQLiteCache(path, max_entries=10), 0.1).get(33.74, -84.39, "2024-06-01")
+        assert restored.to_dict() == forecast.to_dict()
+        assert restored.timezone == "Etc/GMT+1"
+
+    @patch('backend.utils.weather._get_location_coordinates')
+    @patch('backend.utils.weather.get_openmeteo_client')
+    def test_one_upstream_fetch_for_many_requests(self, mock_get_client, mock_get_coords, isolated_forecast_cache):
+        """Test that repeated requests for the same grid cell are served from the shared cache"""
+        from datetime import datetime
+        from backend.utils.weather import get_forecast
+        from backend.replay.synthetic import SyntheticResponse
+
+        mock_get_coords.side_effect = [(40.71427, -74.00597), (40.7128, -74.006), (40.71427, -74.00597)]
+        mock_client = Mock()
+        mock_client.weather_api.return_value = [SyntheticResponse(hours=168)]
+        mock_get_client.return_value = mock_client
+
+        event_date = datetime.now().strftime("%Y-%m-%d")
+        results = [get_forecast(location, event_date) for location in ["New York", "NYC", "new york"]]
+
+        mock_client.weather_api.assert_called_once()
+        assert mock_client.weather_api.call_args.kwargs["params"]["latitude"] == [40.7]
+        assert [result["from_cache"] for result in results] == [False, True, True]
+        assert isolated_forecast_cache.stats()["hit_rate"] == 2 / 3
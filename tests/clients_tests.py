@@ -0,0 +1,52 @@
+import threading
+from unittest.mock import Mock
+
+
+class TestClientRegistry:
+    """Test the process-wide client registry"""
+
+    def test_factory_called_once_across_threads(self):
+        """Test that concurrent first use builds a single shared client"""
+        from backend.utils import clients
+
+        factory = Mock(side_effect=lambda: object())
+        results = []
+        barrier = threading.Barrier(8)
+
+        def worker():
+            barrier.wait()
+            results.append(clients.get_client("registry_test", factory))
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        factory.assert_called_once()
+        assert all(result is results[0] for result in results)
+        clients._clients.pop("registry_test")
+
+    def test_pooled_session_configuration(self):
+        """Test that sessions are mounted with the configured pool size, retries and timeout"""
+        from backend.utils.clients import create_geocoding_session
+
+        session = create_geocoding_session(pool_size=3)
+        adapter = session.get_adapter("https://geocoding-api.open-meteo.com")
+
+        assert adapter._pool_maxsize == 3
+        assert adapter.max_retries.total > 0
+        assert adapter.timeout > 0
+        session.close()
+
+    def test_openmeteo_session_configuration(self, tmp_path):
+        """Test that the HTTP-cached forecast session gets the same pool, retries and timeout"""
+        from backend.utils.clients import create_openmeteo_session
+
+        session = create_openmeteo_session(cache_name=str(tmp_path / "http_cache"), pool_size=3)
+        adapter = session.get_adapter("https://api.open-meteo.com")
+
+        assert adapter._pool_maxsize == 3
+        assert adapter.max_retries.total > 0
+        assert adapter.timeout > 0
+        session.close()
@@ -0,0 +1,53 @@
+import pytest
+
+from backend.cache import forecast_cache, report_cache
+from backend.cache.memory_cache import MemoryCache
+from backend.cache.sqlite_cache import SQLiteCache
+from backend.utils import gazetteer, geocoding, rate_limit, refresher
+
+
+@pytest.fixture(autouse=True)
+def isolated_geocoding_cache(tmp_path, monkeypatch):
+    """Point the geocoding cache at a throwaway database so tests never share entries"""
+    cache = SQLiteCache(str(tmp_path / "geocoding.sqlite"), max_entries=100)
+    monkeypatch.setattr(geocoding, "_geocoding_cache", cache)
+    yield cache
+    cache.close()
+
+
+@pytest.fixture(autouse=True)
+def isolated_forecast_cache(monkeypatch):
+    """Start every test without forecasts cached by a previous one"""
+    cache = forecast_cache.ForecastCache(MemoryCache(max_entries=100, ttl=1800), grid_degrees=0.1)
+    monkeypatch.setattr(forecast_cache, "_forecast_cache", cache)
+    return cache
+
+
+@pytest.fixture(autouse=True)
+def isolated_report_cache(monkeypatch):
+    """Start every test without reports generated by a previous one"""
+    cache = report_cache.ReportCache(MemoryCache(max_entries=100, ttl=3600))
+    monkeypatch.setattr(report_cache, "_report_cache", cache)
+    return cache
+
+
+@pytest.fixture(autouse=True)
+def empty_gazetteer(tmp_path, monkeypatch):
+    """Resolve every location over the (mocked) network unless a test loads the bundled gazetteer"""
+    path = tmp_path / "gazetteer.tsv"
+    path.write_text("#key\tname\tcountry_code\tadmin1_code\tlatitude\tlongitude\ttimezone\tpopulation\n")
+    monkeypatch.setattr(gazetteer, "_gazetteer", gazetteer.Gazetteer(str(path)))
+
+
+@pytest.fixture(autouse=True)
+def unlimited_upstreams(monkeypatch):
+    """Leave upstream calls unthrottled unless a test installs its own rate limiters"""
+    monkeypatch.setattr(rate_limit, "_limiters", {})
+    monkeypatch.setattr(rate_limit, "RATE_LIMITS", {})
+
+
+@pytest.fixture(autouse=True)
+def no_background_refresh(monkeypatch):
+    """Keep the forecast refresher thread out of tests that do not drive it themselves"""
+    monkeypatch.setattr(refresher, "FORECAST_REFRESH_ENABLED", False)
+    monkeypatch.setattr(refresher, "_forecast_refresher", None)
@@ -0,0 +1,129 @@
+import numpy as np
+import pytest
+
+from backend.data_models.data_models import Forecast
+from backend.prompts.forecast_encoder import digest_encoded_forecast, encode_forecast, encode_weather_result
+from config.weather import HOURLY_VARIABLES, VARIABLE_DECIMALS
+
+
+@pytest.fixture
+def week_forecast():
+    """Fixture providing a 7-day forecast with float32 noise in every variable"""
+    from backend.utils.weather import _build_forecast
+    from backend.replay.synthetic import SyntheticResponse
+    return _build_forecast(SyntheticResponse(hours=168))
+
+
+class TestEncodeForecast:
+    """Test the compact forecast encoding used in prompts and tool responses"""
+
+    def test_hourly_tables_per_day(self, week_forecast):
+        """Test that every day gets a header line and 24 rows with the columns stated once per day"""
+        lines = encode_forecast(week_forecast).splitlines()
+        assert lines[0] == "timezone: America/New_York (UTC-04:00)"
+        assert lines[1] == f"hourly {week_forecast.dates[0]}"
+        assert lines[2] == ",".join(("hour", *HOURLY_VARIABLES))
+        assert sum(line.startswith("hourly ") for line in lines) == len(week_forecast.dates)
+
+    def test_values_rounded_per_variable(self):
+        """Test per-variable precision, trailing zeros, negative zero and missing values"""
+        time = np.arange(1717200000, 1717200000 + 3 * 3600, 3600)
+        values = np.array([[12.350000381469727, -0.04, 20.0], [65.4, 70.6, np.nan]], dtype=np.float32)
+        forecast = Forecast(time, values, ("temperature_2m", "relative_humidity_2m"), timezone="GMT")
+
+        rows = encode_forecast(forecast).splitlines()[3:]
+
+        assert rows == ["00,12.4,65", "01,0,71", "02,20,"]
+
+    def test_event_date_hourly_other_days_rolled_up(self, week_forecast):
+        """Test that only the event date is hourly and the other days are min/max/mean rows"""
+        event_date = week_forecast.dates[3]
+        lines = encode_forecast(week_forecast, event_date).splitlines()
+
+        assert [line for line in lines if line.startswith("hourly ")] == [f"hourly {event_date}"]
+        daily = lines[lines.index("daily min/max/mean") + 2:]
+        assert [row.split(",")[0] for row in daily] == [date for date in week_forecast.dates if date != event_date]
+        low, high, mean = map(float, daily[0].split(",")[1].split("/"))
+        assert low <= mean <= high
+
+    def test_prompt_size_reduction(self, week_forecast):
+        """Test that the encoding is much smaller than the dict repr it replaces"""
+        before = len(str({"error": None, "data": week_forecast.to_dict()}))
+        full = len(encode_forecast(week_forecast))
+        event = len(encode_forecast(week_forecast, week_forecast.dates[1]))
+
+        assert before / full > 3
+        assert before / event > 10
+
+
+class TestDigestEncodedForecast:
+    """Test folding encoded hourly tables into daily rollups"""
+
+    @pytest.mark.parametrize("event_day", [None, 3])
+    def test_hourly_tables_become_daily_rows(self, week_forecast, event_day):
+        """Test that every day ends up as one rollup row matching the encoder's own, up to rounding of the mean"""
+        event_date = None if event_day is None else week_forecast.dates[event_day]
+        digest = digest_encoded_forecast(encode_forecast(week_forecast, event_date)).splitlines()
+        rolled_up = encode_forecast(week_forecast, "1900-01-01").splitlines()
+
+        assert digest[:3] == rolled_up[:3]
+        assert len(digest) == len(rolled_up)
+        for row, expected in zip(digest[3:], rolled_up[3:]):
+            for variable, cell, expected_cell in zip(HOURLY_VARIABLES, row.split(",")[1:], expected.split(",")[1:]):
+                low, high, mean = map(float, cell.split("/"))
+                expected_low, expected_high, expected_mean = map(float, expected_cell.split("/"))
+                assert (low, high) == (expected_low, expected_high)
+                # The digest averages hourly values that were already rounded to the variable's precision.
+                assert mean == pytest.approx(expected_mean, abs=1.01 * 10 ** -VARIABLE_DECIMALS.get(variable, 1))
+
+    def test_missing_values_skipped(self):
+        """Test that empty cells are left out of the rollups"""
+        time = np.arange(1717200000, 1717200000 + 3 * 3600, 3600)
+        forecast = Forecast(time, np.array([[1.0, np.nan, 3.0]]), ("temperature_2m",), timezone="GMT")
+
+        assert digest_encoded_forecast(encode_forecast(forecast)).splitlines()[3] == "2024-06-01,1/3/2"
+
+    def test_rollup_only_text_unchanged(self, week_forecast):
+        """Test that text without hourly tables is returned as it is"""
+        text = encode_forecast(week_forecast, "1900-01-01")
+        assert digest_encoded_forecast(text) == text
+
+
+class TestEncodeWeatherResult:
+    """Test the tool-response wrapper"""
+
+    def test_forecast_replaced_by_text(self, week_forecast):
+        """Test that the forecast becomes event-focused text and other keys are kept"""
+        result = {"error": None, "data": week_forecast, "location": "New York", "date": week_forecast.dates[2]}
+        encoded = encode_weather_result(result)
+        assert encoded["location"] == "New York"
+        assert encoded["data"] == encode_forecast(week_forecast, week_forecast.dates[2])
+
+    def test_error_result_unchanged(self):
+        """Test that error results pass through"""
+        result = {"error": "City not found", "data": None, "location": "XYZ", "date": "2025-01-01"}
+        assert encode_weather_result(result) is result
+
+
+class TestDataProcessorPrompt:
+    """Test that the Weather_Man prompt embeds the encoded forecast"""
+
+    def test_prompt_contains_encoding_not_repr(self, week_forecast):
+        """Test that the prompt carries the event-day encoding instead of a dict repr"""
+        from backend.prompts.build_prompt import generate_data_processor_user_prompt
+
+        event_date = week_forecast.dates[1]
+        result = {"error": None, "data": week_forecast, "location": "New York", "date": event_date}
+        prompt = generate_data_processor_user_prompt(result, "New York", event_date, "Metric")
+
+        assert encode_forecast(week_forecast, event_date) in prompt
+        assert "{'" not in prompt
+
+    def test_prompt_reports_errors(self):
+        """Test that a failed lookup is stated in the prompt"""
+        from backend.prompts.build_prompt import generate_data_processor_user_prompt
+
+        result = {"error": "City not found", "data": None, "location": "XYZ", "date": "2025-01-01"}
+        prompt = generate_data_processor_user_prompt(result, "XYZ", "2025-01-01", "Metric")
+
+        assert "unavailable (City not found)" in prompt
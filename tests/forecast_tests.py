@@ -0,0 +1,73 @@
+import json
+
+import numpy as np
+import pytest
+
+VARIABLES = ("temperature_2m", "precipitation")
+
+
+@pytest.fixture
+def two_day_forecast():
+    """Fixture providing 48 hourly values starting at 2024-06-01 00:00 UTC"""
+    from backend.data_models.data_models import Forecast
+    start = 1717200000
+    time = np.arange(start, start + 48 * 3600, 3600)
+    values = np.vstack([np.arange(48, dtype=np.float64), np.zeros(48)])
+    return Forecast(time, values, VARIABLES)
+
+
+class TestForecast:
+    """Test the columnar forecast container"""
+
+    def test_compact_storage(self, two_day_forecast):
+        """Test that values are float32 and the time axis is int64"""
+        assert two_day_forecast.values.dtype == np.float32
+        assert two_day_forecast.time.dtype == np.int64
+        assert two_day_forecast.values.shape == (2, 48)
+        assert not hasattr(two_day_forecast, "__dict__")
+
+    def test_day_index(self, two_day_forecast):
+        """Test that hours are indexed by local calendar day"""
+        assert two_day_forecast.dates == ["2024-06-01", "2024-06-02"]
+        assert two_day_forecast.day_offsets.tolist() == [0, 24, 48]
+
+    def test_day_index_respects_utc_offset(self):
+        """Test that a negative UTC offset shifts day boundaries"""
+        from backend.data_models.data_models import Forecast
+        time = np.arange(1717200000, 1717200000 + 48 * 3600, 3600)
+        forecast = Forecast(time, np.zeros((2, 48)), VARIABLES, utc_offset_seconds=-4 * 3600)
+        assert forecast.dates == ["2024-05-31", "2024-06-01", "2024-06-02"]
+        assert forecast.day_offsets.tolist() == [0, 4, 28, 48]
+
+    def test_day_is_a_view(self, two_day_forecast):
+        """Test that per-day slices share memory with the full forecast"""
+        day = two_day_forecast.day("2024-06-02")
+        assert len(day) == 24
+        assert day["temperature_2m"][0] == 24.0
+        assert np.shares_memory(day.values, two_day_forecast.values)
+        assert day.to_dict()["time"][0] == "2024-06-02 00:00:00"
+
+    def test_to_dict_and_json(self, two_day_forecast):
+        """Test the plain-Python columnar conversion"""
+        data = two_day_forecast.to_dict()
+        assert list(data) == ["time", *VARIABLES]
+        assert data["time"][1] == "2024-06-01 01:00:00"
+        assert data["temperature_2m"][:3] == [0.0, 1.0, 2.0]
+        assert json.loads(two_day_forecast.to_json()) == data
+
+    def test_to_dataframe(self, two_day_forecast):
+        """Test the DataFrame conversion used by the Weather_Info page"""
+        df = two_day_forecast.to_dataframe()
+        assert list(df.columns) == ["date", "hour", *VARIABLES]
+        assert len(df) == 48
+        assert df.iloc[25]["date"] == "2024-06-02"
+        assert df.iloc[25]["hour"] == "01:00:00"
+
+    def test_daily_rollups(self, two_day_forecast):
+        """Test per-day min/max/mean, skipping missing hours"""
+        two_day_forecast.values[0, 0] = np.nan
+        rollups = two_day_forecast.daily_rollups()
+        assert rollups["min"][0].tolist() == [1.0, 24.0]
+        assert rollups["max"][0].tolist() == [23.0, 47.0]
+        assert rollups["mean"][0].tolist() == [12.0, 35.5]
+        assert rollups["mean"][1].tolist() == [0.0, 0.0]
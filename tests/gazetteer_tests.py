@@ -0,0 +1,99 @@
+import pytest
+from unittest.mock import patch
+
+
+@pytest.fixture
+def bundled_gazetteer(monkeypatch):
+    """Fixture loading the gazetteer shipped in assets/"""
+    from backend.utils import gazetteer
+    from config.weather import GAZETTEER_PATH
+    index = gazetteer.Gazetteer(GAZETTEER_PATH)
+    monkeypatch.setattr(gazetteer, "_gazetteer", index)
+    return index
+
+
+class TestGazetteerLookup:
+    """Test exact place-name resolution against the bundled index"""
+
+    @pytest.mark.parametrize("location", ["Atlanta", "atlanta ", "Atlanta, GA"])
+    def test_normalized_variants(self, bundled_gazetteer, location):
+        """Test that spelling variants resolve to the same place"""
+        place = bundled_gazetteer.lookup(location)
+        assert place.name == "Atlanta"
+        assert place.country_code == "US"
+        assert place.timezone == "America/New_York"
+
+    def test_accents_ignored(self, bundled_gazetteer):
+        """Test that accent-free spellings match accented names"""
+        assert bundled_gazetteer.lookup("Sao Paulo").name == "São Paulo"
+
+    def test_most_populous_wins(self, bundled_gazetteer):
+        """Test that ambiguous names resolve to the most populous place"""
+        assert bundled_gazetteer.lookup("Paris").country_code == "FR"
+
+    def test_qualifier_disambiguates(self, bundled_gazetteer):
+        """Test that a state or country qualifier picks the matching place"""
+        assert bundled_gazetteer.lookup("Kansas City").admin1_code == "MO"
+        assert bundled_gazetteer.lookup("Kansas City, KS").admin1_code == "KS"
+
+    @pytest.mark.parametrize("location", ["Paris, TX", "Portland, ME"])
+    def test_unmatched_qualifier(self, bundled_gazetteer, location):
+        """Test that a qualifier naming none of the bundled places is left to the online geocoder"""
+        assert bundled_gazetteer.lookup(location) is None
+
+    def test_unknown_place(self, bundled_gazetteer):
+        """Test that unknown names return None"""
+        assert bundled_gazetteer.lookup("XYZ123InvalidCity") is None
+        assert bundled_gazetteer.lookup("") is None
+
+
+class TestGazetteerPrefixSearch:
+    """Test autocomplete prefix search"""
+
+    def test_prefix_matches_sorted_by_population(self, bundled_gazetteer):
+        """Test that results share the prefix and are ordered by population"""
+        places = bundled_gazetteer.prefix_search("san", limit=5)
+        assert len(places) == 5
+        assert all(place.name.lower().startswith("san") for place in places)
+        populations = [place.population for place in places]
+        assert populations == sorted(populations, reverse=True)
+
+    def test_aliases_not_duplicated(self, bundled_gazetteer):
+        """Test that a city indexed under two keys is suggested once"""
+        places = bundled_gazetteer.prefix_search("new york")
+        assert [place.name for place in places].count("New York City") == 1
+
+    def test_suggestions_only_for_partial_input(self, bundled_gazetteer):
+        """Test that suggestions disappear once the input names a known place"""
+        from backend.utils.gazetteer import suggest_locations
+        assert "San Francisco, CA, US" in suggest_locations("san fr")
+        assert suggest_locations("San Francisco") == []
+        assert suggest_locations("  ") == []
+
+
+class TestOfflineGeocoding:
+    """Test that known places never reach the geocoding API"""
+
+    @patch('requests.Session.get')
+    def test_known_city_resolved_locally(self, mock_get, bundled_gazetteer):
+        """Test that a bundled city is resolved without a network call"""
+        from backend.utils.geocoding import _get_location_coordinates
+
+        lat, lon = _get_location_coordinates("Atlanta, GA")
+
+        assert (lat, lon) == (33.749, -84.38798)
+        mock_get.assert_not_called()
+
+    @patch('requests.Session.get')
+    def test_unmatched_qualifier_geocoded_online(self, mock_get, bundled_gazetteer):
+        """Test that a bundled name with a foreign qualifier is not answered with the bundled place"""
+        from backend.utils.geocoding import _get_location_coordinates
+
+        mock_get.return_value.status_code = 200
+        mock_get.return_value.json.return_value = {"results": [
+            {"latitude": 48.85341, "longitude": 2.3488, "country_code": "FR", "admin1": "Île-de-France"},
+            {"latitude": 33.66094, "longitude": -95.55551, "country_code": "US", "admin1": "Texas"},
+        ]}
+
+        assert _get_location_coordinates("Paris, TX") == (33.66094, -95.55551)
+        mock_get.assert_called_once()
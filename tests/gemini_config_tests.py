@@ -0,0 +1,82 @@
+from datetime import datetime
+from unittest.mock import patch
+from zoneinfo import ZoneInfo
+
+import pytest
+
+
+@pytest.fixture
+def gemini_config(monkeypatch):
+    """Fixture providing config.gemini with an empty model cache and a fake API key"""
+    import config.gemini as gemini_config
+    monkeypatch.setattr(gemini_config, "_models", {})
+    monkeypatch.setattr(gemini_config, "_genai_configured", False)
+    monkeypatch.setattr(gemini_config, "get_api_key", lambda name: "test-key")
+    return gemini_config
+
+
+def _frozen_now(moment: datetime):
+    """Patch config.gemini's clock to ``moment``, converted into whatever timezone is asked for"""
+    class FrozenDatetime(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return moment.astimezone(tz) if tz else moment.replace(tzinfo=None)
+
+    return patch("config.gemini.datetime", FrozenDatetime)
+
+
+def _system_prompt(model) -> str:
+    return model._system_instruction.parts[0].text
+
+
+class TestModelFactories:
+    """Test the lazy, date-aware model factories"""
+
+    def test_models_built_lazily_and_cached(self, gemini_config):
+        """Test that the key is only read when a model is first needed and models are reused"""
+        with patch("google.generativeai.configure") as mock_configure:
+            assert gemini_config._models == {}
+            model = gemini_config.get_data_processor_model()
+
+            assert gemini_config.get_data_processor_model() is model
+            mock_configure.assert_called_once_with(api_key="test-key")
+
+    def test_tooled_prompt_rebuilt_after_midnight(self, gemini_config):
+        """Test that a new calendar day produces a model with the new dates"""
+        utc = ZoneInfo("UTC")
+        with patch("google.generativeai.configure"):
+            with _frozen_now(datetime(2025, 3, 9, 23, 30, tzinfo=utc)):
+                before = gemini_config.get_tooled_model("UTC")
+                assert gemini_config.get_tooled_model("UTC") is before
+            with _frozen_now(datetime(2025, 3, 10, 0, 5, tzinfo=utc)):
+                after = gemini_config.get_tooled_model("UTC")
+
+        assert after is not before
+        assert "Sunday, March 09, 2025" in _system_prompt(before)
+        assert "Monday, March 10, 2025" in _system_prompt(after)
+
+    def test_date_follows_requested_timezone(self, gemini_config):
+        """Test that each timezone gets the date on its own clock"""
+        moment = datetime(2025, 3, 10, 2, 0, tzinfo=ZoneInfo("UTC"))
+        with patch("google.generativeai.configure"), _frozen_now(moment):
+            tokyo = gemini_config.get_tooled_model("Asia/Tokyo")
+            los_angeles = gemini_config.get_tooled_model("America/Los_Angeles")
+
+        assert "Monday, March 10, 2025" in _system_prompt(tokyo)
+        assert "Sunday, March 09, 2025" in _system_prompt(los_angeles)
+
+    def test_unknown_timezone_falls_back(self, gemini_config):
+        """Test that browser-reported timezones are only used when valid"""
+        assert gemini_config.resolve_prompt_timezone("Europe/Paris") == "Europe/Paris"
+        assert gemini_config.resolve_prompt_timezone("Mars/Olympus_Mons") == gemini_config.PROMPT_TIMEZONE
+        assert gemini_config.resolve_prompt_timezone(None) == gemini_config.PROMPT_TIMEZONE
+
+
+class TestToolsList:
+    """Test the tools the chat model is given"""
+
+    def test_tool_names_match_functions(self):
+        """Test that each tool is declared under its function's name, the name the model calls it by"""
+        from config.gemini import TOOLS_LIST
+
+        assert [tool.name for tool in TOOLS_LIST] == [tool.function.__name__ for tool in TOOLS_LIST]
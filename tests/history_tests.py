@@ -0,0 +1,133 @@
+from unittest.mock import Mock
+
+from backend.prompts.forecast_encoder import encode_weather_result
+from backend.replay.synthetic import SyntheticResponse
+from backend.utils.history import ConversationHistoryManager, digest_tool_result, estimate_tokens
+from backend.utils.weather import _build_forecast
+
+
+def _weather_result(location: str, hours: int = 168) -> dict:
+    return {
+        "error": None,
+        "location": location,
+        "date": "2025-01-01",
+        "data": {
+            "time": [f"2025-01-{1 + hour // 24:02d} {hour % 24:02d}:00:00" for hour in range(hours)],
+            "temperature_2m": [float(hour % 24) for hour in range(hours)],
+            "precipitation": [0.0] * hours,
+        },
+    }
+
+
+def _tool_turn(question: str, location: str, answer: str) -> list[dict]:
+    function_call = Mock()
+    function_call.name = "get_weather_info"
+    function_call.args = {"location": location, "event_date": "2025-01-01"}
+    return [
+        {"role": "user", "parts": [question]},
+        {"role": "model", "parts": [{"function_call": function_call}]},
+        {"role": "user", "parts": [{
+            "function_response": {"name": "get_weather_info", "response": {"result": _weather_result(location)}}
+        }]},
+        {"role": "model", "parts": [answer]},
+    ]
+
+
+class TestDigestToolResult:
+    """Test the compact stand-in for tool results"""
+
+    def test_weather_data_reduced_to_rollups(self):
+        """Test that hourly columns become per-variable min/max/mean"""
+        digest = digest_tool_result(_weather_result("London"))
+
+        assert digest["location"] == "London"
+        assert digest["data"]["from"] == "2025-01-01 00:00:00"
+        assert digest["data"]["to"] == "2025-01-07 23:00:00"
+        assert digest["data"]["summary"]["temperature_2m"] == {"min": 0.0, "max": 23.0, "mean": 11.5}
+        assert estimate_tokens(digest) < estimate_tokens(_weather_result("London")) / 20
+
+    def test_batch_and_error_results(self):
+        """Test that lists are digested per item and error results are kept as they are"""
+        error = {"error": "City not found", "data": None, "location": "XYZ", "date": "2025-01-01"}
+
+        digest = digest_tool_result([_weather_result("London"), error])
+
+        assert "summary" in digest[0]["data"]
+        assert digest[1] == error
+
+    def test_encoded_tool_result_digested(self):
+        """Test that the weather tools' encoded forecast keeps its daily rollups and loses the hourly table"""
+        forecast = _build_forecast(SyntheticResponse(hours=168))
+        event_date = forecast.dates[2]
+        result = encode_weather_result({"error": None, "data": forecast, "location": "New York", "date": event_date})
+
+        digest = digest_tool_result(result)
+
+        lines = digest["data"].splitlines()
+        assert digest["location"] == "New York"
+        assert lines[0] == result["data"].splitlines()[0]
+        assert not any(line.startswith("hourly ") for line in lines)
+        assert [row.split(",")[0] for row in lines[3:]] == forecast.dates
+        assert estimate_tokens(digest) < estimate_tokens(result) / 1.5
+
+
+class TestConversationHistoryManager:
+    """Test history compaction"""
+
+    def test_small_history_sent_verbatim(self):
+        """Test that a history within budget and window is unchanged"""
+        history = [{"role": "user", "parts": ["Hi"]}, {"role": "model", "parts": ["Hello!"]}]
+        manager = ConversationHistoryManager(token_budget=1000, recent_turns=4)
+
+        assert manager.compact(history) == history
+        assert manager.stats()["tokens_saved"] == 0
+
+    def test_old_tool_payloads_digested_recent_kept(self):
+        """Test that tool results outside the recent window are replaced by digests"""
+        history = _tool_turn("London?", "London", "Mild.") + _tool_turn("Tokyo?", "Tokyo", "Warm.")
+        manager = ConversationHistoryManager(token_budget=100000, recent_turns=1)
+
+        compacted = manager.compact(history)
+
+        old_result = compacted[2]["parts"][0]["function_response"]["response"]["result"]
+        recent_result = compacted[6]["parts"][0]["function_response"]["response"]["result"]
+        assert "summary" in old_result["data"]
+        assert recent_result == _weather_result("Tokyo")
+        assert len(history[2]["parts"][0]["function_response"]["response"]["result"]["data"]["time"]) == 168
+
+    def test_over_budget_turns_folded_into_summary(self):
+        """Test that the oldest turns become one summary message until the history fits"""
+        history = []
+        for i in range(10):
+            history += [{"role": "user", "parts": [f"Question {i} " + "x" * 400]}, {"role": "model", "parts": [f"Answer {i}"]}]
+        manager = ConversationHistoryManager(token_budget=400, recent_turns=2, summary_chars=40)
+
+        compacted = manager.compact(history)
+
+        assert compacted[0]["parts"][0].startswith("Summary of the earlier conversation:")
+        assert "user: Question 7" in compacted[0]["parts"][0]
+        assert compacted[-4:] == history[-4:]
+        assert estimate_tokens(compacted) <= 400
+
+    def test_function_calls_summarized_by_name_and_args(self):
+        """Test that folded tool turns keep which tools were called"""
+        history = _tool_turn("London?", "London", "Mild.") + [{"role": "user", "parts": ["Thanks"]}]
+        manager = ConversationHistoryManager(token_budget=100, recent_turns=1)
+
+        summary = manager.compact(history)[0]["parts"][0]
+
+        assert "model called: get_weather_info(location=London, event_date=2025-01-01)" in summary
+        assert "model: Mild." in summary
+
+    def test_savings_recorded_per_request(self):
+        """Test that token savings are reported for the last request and accumulated"""
+        history = _tool_turn("London?", "London", "Mild.") + _tool_turn("Tokyo?", "Tokyo", "Warm.")
+        manager = ConversationHistoryManager(token_budget=100000, recent_turns=1)
+
+        manager.compact(history)
+        manager.compact(history)
+        stats = manager.stats()
+
+        assert stats["tokens_saved"] == stats["tokens_before"] - stats["tokens_after"] > 0
+        assert stats["requests"] == 2
+        assert stats["total_tokens_saved"] == 2 * stats["tokens_saved"]
@@ -0,0 +1,26 @@
+import pytest
+
+from benchmarks.bench_imports import LLM_FREE_TARGETS, loaded_llm_packages, measure
+
+
+class TestImportBoundaries:
+    """Test that weather-only code paths stay independent of the LLM stack"""
+
+    @pytest.mark.parametrize("target", LLM_FREE_TARGETS)
+    def test_no_gemini_sdk(self, target):
+        """Test that importing the target in a fresh interpreter does not load the Gemini SDK"""
+        _, modules = measure(target)
+        assert loaded_llm_packages(modules) == []
+
+    def test_utils_shim_is_lazy(self):
+        """Test that the compatibility module resolves names from the split modules on access"""
+        from backend.utils import geocoding, llm, utils, weather
+
+        assert utils.get_weather_info is weather.get_weather_info
+        assert utils._get_location_coordinates is geocoding._get_location_coordinates
+        assert utils.stream_gemini_tooled_model is llm.stream_gemini_tooled_model
+        with pytest.raises(AttributeError):
+            utils.not_a_backend_function
+
+        _, modules = measure("backend.utils.utils")
+        assert "backend.utils.weather" not in modules
@@ -0,0 +1,218 @@
+import threading
+import time
+from unittest.mock import Mock
+
+from backend.data_models.data_models import Tool
+
+
+def _function_call_part(name: str, **args) -> Mock:
+    function_call = Mock()
+    function_call.name = name
+    function_call.args = args
+    part = Mock()
+    part.function_call = function_call
+    return part
+
+
+def _text_part(text: str) -> Mock:
+    part = Mock()
+    part.function_call = None
+    part.text = text
+    return part
+
+
+def _response(*parts) -> Mock:
+    response = Mock()
+    response.candidates = [Mock()]
+    response.candidates[0].content.parts = list(parts)
+    return response
+
+
+WEATHER_PARAMS = {
+    "location": {"type": "string", "description": "City name", "required": True},
+    "event_date": {"type": "string", "description": "YYYY-MM-DD", "required": True, "format": "date"},
+}
+
+
+def _weather_tool(function) -> Tool:
+    return Tool(name="get_weather_info", function=function, description="", params=WEATHER_PARAMS, constraints="",
+                usage_examples=[])
+
+
+class TestInvokeGeminiTooledModel:
+    """Test the tool-calling loop"""
+
+    def test_plain_answer_needs_one_call(self):
+        """Test that a response without function calls is returned directly"""
+        from backend.utils.llm import invoke_gemini_tooled_model
+
+        model = Mock()
+        model.generate_content.return_value = _response(_text_part("Sunny all week"))
+
+        answer = invoke_gemini_tooled_model(model, "Weather?", [], [])
+
+        assert answer == "Sunny all week"
+        model.generate_content.assert_called_once()
+
+    def test_parallel_function_calls_answered_in_one_turn(self):
+        """Test that every function call of a turn is run and answered in a single follow-up request"""
+        from backend.utils.llm import invoke_gemini_tooled_model
+
+        cities = ["London", "Tokyo", "Paris"]
+        model = Mock()
+        model.generate_content.side_effect = [
+            _response(*(_function_call_part("get_weather_info", location=city, event_date="2025-01-01") for city in cities)),
+            _response(_text_part("Paris looks best")),
+        ]
+        history = []
+
+        answer = invoke_gemini_tooled_model(
+            model, "Which city?", history, [_weather_tool(lambda location, event_date: {"location": location})]
+        )
+
+        assert answer == "Paris looks best"
+        assert model.generate_content.call_count == 2
+        assert [part["function_call"].name for part in history[1]["parts"]] == ["get_weather_info"] * 3
+        responses = [part["function_response"] for part in history[2]["parts"]]
+        assert [response["response"]["result"]["location"] for response in responses] == cities
+
+    def test_function_calls_run_concurrently(self):
+        """Test that slow tools from one turn overlap instead of running back to back"""
+        from backend.utils.llm import invoke_gemini_tooled_model
+
+        in_flight = 0
+        max_in_flight = 0
+        lock = threading.Lock()
+
+        def slow_weather(location, event_date):
+            nonlocal in_flight, max_in_flight
+            with lock:
+                in_flight += 1
+                max_in_flight = max(max_in_flight, in_flight)
+            time.sleep(0.1)
+            with lock:
+                in_flight -= 1
+            return {"location": location}
+
+        model = Mock()
+        model.generate_content.side_effect = [
+            _response(*(_function_call_part("get_weather_info", location=str(i), event_date="2025-01-01") for i in range(4))),
+            _response(_text_part("done")),
+        ]
+
+        start = time.perf_counter()
+        invoke_gemini_tooled_model(model, "Compare", [], [_weather_tool(slow_weather)])
+
+        assert max_in_flight == 4
+        assert time.perf_counter() - start < 0.3
+
+    def test_unknown_and_failing_functions_reported_per_call(self):
+        """Test that a missing or raising tool yields an error result without dropping the others"""
+        from backend.utils.llm import invoke_gemini_tooled_model
+
+        def weather(location, event_date):
+            if location == "Nowhere":
+                raise RuntimeError("boom")
+            return {"location": location}
+
+        model = Mock()
+        model.generate_content.side_effect = [
+            _response(
+                _function_call_part("get_weather_info", location="London", event_date="2025-01-01"),
+                _function_call_part("get_weather_info", location="Nowhere", event_date="2025-01-01"),
+                _function_call_part("get_traffic_info", location="London"),
+            ),
+            _response(_text_part("done")),
+        ]
+        history = []
+
+        invoke_gemini_tooled_model(model, "Plan", history, [_weather_tool(weather)])
+
+        results = [part["function_response"]["response"]["result"] for part in history[2]["parts"]]
+        assert results[0] == {"location": "London"}
+        assert "boom" in results[1]["error"]
+        assert results[2] == {"error": "Function get_traffic_info not found"}
+
+
+class TestStreamGeminiTooledModel:
+    """Test the streaming tool-calling loop"""
+
+    def test_text_chunks_yielded_in_order(self):
+        """Test that answer text is yielded chunk by chunk"""
+        from backend.utils.llm import stream_gemini_tooled_model
+
+        model = Mock()
+        model.generate_content.return_value = iter([_response(_text_part("Sunny ")), _response(_text_part("all week"))])
+        metrics = {}
+
+        chunks = list(stream_gemini_tooled_model(model, "Weather?", [], [], metrics))
+
+        assert chunks == ["Sunny ", "all week"]
+        assert model.generate_content.call_args.kwargs == {"stream": True}
+        assert metrics["time_to_first_token"] >= 0
+
+    def test_tool_calls_mid_stream_resume_streaming(self):
+        """Test that function calls in a stream are executed and the answer streamed afterwards"""
+        from backend.utils.llm import stream_gemini_tooled_model
+
+        model = Mock()
+        model.generate_content.side_effect = [
+            iter([
+                _response(_function_call_part("get_weather_info", location="London", event_date="2025-01-01")),
+                _response(_function_call_part("get_weather_info", location="Tokyo", event_date="2025-01-01")),
+            ]),
+            iter([_response(_text_part("London is drier"))]),
+        ]
+        history = []
+
+        chunks = list(stream_gemini_tooled_model(
+            model, "Compare", history, [_weather_tool(lambda location, event_date: {"location": location})]
+        ))
+
+        assert chunks == ["London is drier"]
+        assert model.generate_content.call_count == 2
+        results = [part["function_response"]["response"]["result"] for part in history[2]["parts"]]
+        assert results == [{"location": "London"}, {"location": "Tokyo"}]
+
+    def test_text_before_function_call_kept_in_history(self):
+        """Test that text streamed ahead of a function call is stored in that model turn"""
+        from backend.utils.llm import stream_gemini_tooled_model
+
+        model = Mock()
+        model.generate_content.side_effect = [
+            iter([
+                _response(_text_part("Let me check ")),
+                _response(_text_part("London. ")),
+                _response(_function_call_part("get_weather_info", location="London", event_date="2025-01-01")),
+            ]),
+            iter([_response(_text_part("It stays dry"))]),
+        ]
+        history = []
+
+        chunks = list(stream_gemini_tooled_model(
+            model, "Weather?", history, [_weather_tool(lambda location, event_date: {"location": location})]
+        ))
+
+        assert chunks == ["Let me check ", "London. ", "It stays dry"]
+        assert history[1]["role"] == "model"
+        assert history[1]["parts"][0] == "Let me check London. "
+        assert history[1]["parts"][1]["function_call"].name == "get_weather_info"
+
+    def test_first_token_time_includes_tool_execution(self):
+        """Test that time to first token covers tool execution that precedes the answer"""
+        from backend.utils.llm import stream_gemini_tooled_model
+
+        def slow_weather(location, event_date):
+            time.sleep(0.05)
+            return {}
+
+        model = Mock()
+        model.generate_content.side_effect = [
+            iter([_response(_function_call_part("get_weather_info", location="London", event_date="2025-01-01"))]),
+            iter([_response(_text_part("ok"))]),
+        ]
+        metrics = {}
+
+        list(stream_gemini_tooled_model(model, "Weather?", [], [_weather_tool(slow_weather)], metrics))
+
+        assert metrics["time_to_first_token"] >= 0.05
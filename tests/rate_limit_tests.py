@@ -0,0 +1,152 @@
+import asyncio
+import threading
+import time
+from datetime import datetime
+from unittest.mock import Mock, patch
+
+import pytest
+
+from backend.utils import rate_limit
+from backend.utils.rate_limit import RateLimiter, RateLimitExceeded, is_throttled, limited
+from backend.utils.tracing import trace
+
+
+def _wait_until(condition, timeout: float = 2.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline
+        time.sleep(0.001)
+
+
+class TestRateLimiter:
+    """Test the token bucket and its fair queue"""
+
+    def test_burst_then_rate(self):
+        """Test that the burst is granted at once and later calls are spaced at the refill rate"""
+        limiter = RateLimiter("test", rate=20, burst=2)
+        started = time.monotonic()
+        for _ in range(6):
+            limiter.acquire()
+        elapsed = time.monotonic() - started
+
+        assert 0.18 <= elapsed < 0.5
+        stats = limiter.stats()
+        assert stats["granted"] == 6
+        assert stats["queued"] == 0 and stats["max_queued"] == 1
+
+    def test_round_robin_across_keys(self):
+        """Test that a request with one call is not stuck behind another request's backlog"""
+        limiter = RateLimiter("test", rate=50, burst=1)
+        limiter.acquire()
+        order = []
+
+        def call(key):
+            limiter.acquire(key)
+            order.append(key)
+
+        backlog = [threading.Thread(target=call, args=("busy",)) for _ in range(6)]
+        for thread in backlog:
+            thread.start()
+        _wait_until(lambda: limiter.stats()["queued"] == 6)
+        single = threading.Thread(target=call, args=("quiet",))
+        single.start()
+        for thread in [*backlog, single]:
+            thread.join()
+
+        assert order.index("quiet") <= 1
+        assert len(order) == 7
+
+    def test_gives_up_after_max_wait(self):
+        """Test that a caller queued past max_wait is rejected and leaves the queue"""
+        limiter = RateLimiter("test", rate=0.1, burst=1, max_wait=0.05)
+        limiter.acquire()
+
+        with pytest.raises(RateLimitExceeded):
+            limiter.acquire()
+        assert limiter.stats()["rejected"] == 1
+        assert limiter.stats()["queued"] == 0
+
+    def test_pause_holds_tokens(self):
+        """Test that a pause stops grants for its duration and then restarts from an empty bucket"""
+        limiter = RateLimiter("test", rate=100, burst=5)
+        limiter.pause(0.1)
+        started = time.monotonic()
+        limiter.acquire()
+
+        assert time.monotonic() - started >= 0.1
+        assert limiter.stats()["throttled"] == 1
+
+    def test_async_waiters(self):
+        """Test that coroutines share the bucket with the same spacing"""
+        limiter = RateLimiter("test", rate=20, burst=1)
+
+        async def main():
+            await asyncio.gather(*(limiter.acquire_async() for _ in range(5)))
+
+        started = time.monotonic()
+        asyncio.run(main())
+        assert time.monotonic() - started >= 0.18
+        assert limiter.stats()["granted"] == 5
+
+
+class TestThrottling:
+    """Test that upstream 429s pause the endpoint"""
+
+    @pytest.mark.parametrize("error", [
+        type("ResourceExhausted", (Exception,), {"code": 429})("Quota exceeded"),
+        Exception("failed to request 'https://api.open-meteo.com/v1/forecast': "
+                  "{'error': True, 'reason': 'Minutely API request limit exceeded. Please try again in one minute.'}"),
+    ])
+    def test_recognized(self, error):
+        """Test that Gemini and Open-Meteo limit errors are recognized"""
+        assert is_throttled(error)
+        assert not is_throttled(ValueError("City not found"))
+
+    def test_limited_pauses_on_429(self, monkeypatch):
+        """Test that a 429 raised inside limited() pauses the endpoint's limiter"""
+        monkeypatch.setattr(rate_limit, "RATE_LIMITS", {"gemini": (100, 2)})
+        error = type("ResourceExhausted", (Exception,), {"code": 429})("Quota exceeded")
+
+        with pytest.raises(Exception):
+            with limited("gemini"):
+                raise error
+
+        stats = rate_limit.get_rate_limiter("gemini").stats()
+        assert stats["throttled"] == 1
+        assert stats["tokens"] <= 0
+
+    @patch('requests.Session.get')
+    def test_geocoding_retry_after(self, mock_get, monkeypatch):
+        """Test that a geocoding 429 pauses geocoding for its Retry-After"""
+        from backend.utils.geocoding import _get_location_coordinates
+        monkeypatch.setattr(rate_limit, "RATE_LIMITS", {"geocoding": (100, 2)})
+        mock_get.return_value = Mock(status_code=429, headers={"Retry-After": "0.2"})
+
+        with pytest.raises(Exception):
+            _get_location_coordinates("Nowhere")
+
+        limiter = rate_limit.get_rate_limiter("geocoding")
+        assert limiter.stats()["throttled"] == 1
+        started = time.monotonic()
+        limiter.acquire()
+        assert time.monotonic() - started >= 0.15
+
+
+class TestRequestPathLimits:
+    """Test that upstream calls on the request path take tokens"""
+
+    @patch('backend.utils.weather._get_location_coordinates', return_value=(40.71427, -74.00597))
+    @patch('backend.utils.weather.get_openmeteo_client')
+    def test_forecast_fetch_limited(self, mock_get_client, mock_get_coords, monkeypatch):
+        """Test that a forecast fetch takes a forecast token and records its wait in the trace"""
+        from backend.utils.weather import get_forecast
+        from backend.replay.synthetic import SyntheticResponse
+        monkeypatch.setattr(rate_limit, "RATE_LIMITS", {"forecast": (1000, 1)})
+        mock_get_client.return_value.weather_api.return_value = [SyntheticResponse(hours=168)]
+
+        with trace("weather_info.fetch") as current:
+            result = get_forecast("New York", datetime.now().strftime("%Y-%m-%d"))
+
+        assert result["error"] is None
+        assert "ratelimit.forecast" in [record["name"] for record in current.spans]
+        assert rate_limit.rate_limit_stats()["forecast"]["granted"] == 1
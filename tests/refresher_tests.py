@@ -0,0 +1,160 @@
+import time
+from datetime import datetime
+from unittest.mock import Mock, patch
+
+import pytest
+
+from backend.cache import forecast_cache
+from backend.cache.forecast_cache import ForecastCache
+from backend.cache.memory_cache import MemoryCache
+from backend.replay.synthetic import SyntheticResponse
+from backend.utils import refresher as refresher_module
+from backend.utils.refresher import ForecastRefresher
+
+NEW_YORK = (40.7, -74.0)
+
+
+@pytest.fixture
+def short_lived_cache(monkeypatch):
+    """Fixture installing a forecast cache whose entries go stale after 50 ms"""
+    cache = ForecastCache(MemoryCache(max_entries=10, ttl=0.05), grid_degrees=0.1, stale_seconds=60)
+    monkeypatch.setattr(forecast_cache, "_forecast_cache", cache)
+    return cache
+
+
+@pytest.fixture
+def refresher(monkeypatch):
+    """Fixture enabling background refresh with a refresher whose passes the test runs itself"""
+    instance = ForecastRefresher(hot_locations=10, half_life=3600, min_requests=2, refresh_ahead=0, interval=60)
+    monkeypatch.setattr(refresher_module, "FORECAST_REFRESH_ENABLED", True)
+    monkeypatch.setattr(refresher_module, "_forecast_refresher", instance)
+    return instance
+
+
+@pytest.fixture
+def upstream():
+    """Fixture answering geocoding with New York and counting Open-Meteo requests"""
+    client = Mock()
+    client.weather_api.side_effect = lambda url, params: [SyntheticResponse(hours=168) for _ in params["latitude"]]
+    with patch('backend.utils.weather._get_location_coordinates', return_value=(40.71427, -74.00597)), \
+            patch('backend.utils.weather.get_openmeteo_client', return_value=client):
+        yield client
+
+
+def _today() -> str:
+    return datetime.now().strftime("%Y-%m-%d")
+
+
+class TestStaleEntries:
+    """Test that forecast cache entries outlive their TTL as stale"""
+
+    def test_get_ignores_stale_lookup_returns_it(self, short_lived_cache):
+        """Test that an expired entry is invisible to get but returned by lookup marked stale"""
+        forecast = Mock()
+        short_lived_cache.set(*NEW_YORK, "2024-06-01", forecast)
+        assert short_lived_cache.lookup(*NEW_YORK, "2024-06-01").is_stale is False
+        time.sleep(0.06)
+
+        assert short_lived_cache.get(*NEW_YORK, "2024-06-01") is None
+        entry = short_lived_cache.lookup(*NEW_YORK, "2024-06-01")
+        assert entry.forecast is forecast and entry.is_stale
+
+    def test_peek_not_counted(self, tmp_path):
+        """Test that peeking leaves the hit and miss counts alone"""
+        from backend.cache.sqlite_cache import SQLiteCache
+        for backend in (MemoryCache(max_entries=10), SQLiteCache(str(tmp_path / "cache.sqlite"), max_entries=10)):
+            backend.set("atlanta", 1)
+            assert backend.peek("atlanta") == 1
+            assert backend.peek("boston") is None
+            assert (backend.hits, backend.misses) == (0, 0)
+
+
+class TestStaleWhileRevalidate:
+    """Test serving stale forecasts while they are refreshed"""
+
+    def test_stale_served_then_refreshed(self, short_lived_cache, refresher, upstream):
+        """Test that an expired forecast is served at once and replaced by the next refresh pass"""
+        from backend.utils.weather import get_forecast
+
+        first = get_forecast("New York", _today())
+        time.sleep(0.06)
+        second = get_forecast("New York", _today())
+
+        assert second["from_cache"] and second["data"] is first["data"]
+        assert upstream.weather_api.call_count == 1
+
+        assert refresher.refresh_due() == 1
+        assert upstream.weather_api.call_count == 2
+        entry = short_lived_cache.lookup(*NEW_YORK, _today())
+        assert not entry.is_stale and entry.forecast is not first["data"]
+
+    def test_stale_is_miss_without_refresher(self, short_lived_cache, upstream):
+        """Test that with background refresh off an expired forecast is fetched again"""
+        from backend.utils.weather import get_forecast
+
+        get_forecast("New York", _today())
+        time.sleep(0.06)
+        result = get_forecast("New York", _today())
+
+        assert not result["from_cache"]
+        assert upstream.weather_api.call_count == 2
+
+
+class TestHotLocations:
+    """Test which locations the refresher keeps warm"""
+
+    def test_hot_points_ranked_and_thresholded(self):
+        """Test that points need min_requests and come back hottest first"""
+        refresher = ForecastRefresher(hot_locations=2, half_life=3600, min_requests=2)
+        refresher.record([(1.0, 1.0)] * 2 + [(2.0, 2.0)] * 3 + [(3.0, 3.0)] * 4 + [(4.0, 4.0)])
+
+        assert refresher.hot_points() == [(3.0, 3.0), (2.0, 2.0)]
+
+    def test_scores_decay(self):
+        """Test that requests stop counting after a few half-lives and cold points are forgotten"""
+        refresher = ForecastRefresher(half_life=0.01, min_requests=2)
+        refresher.record([(1.0, 1.0)] * 3)
+        time.sleep(0.05)
+
+        assert refresher.hot_points() == []
+        assert refresher.stats()["tracked"] == 0
+
+    def test_refresh_ahead_of_expiry(self, isolated_forecast_cache, upstream):
+        """Test that hot points expiring within refresh_ahead, or missing, are refetched in one request"""
+        from backend.utils.weather import _forecast_window
+        start_date, _ = _forecast_window()
+        refresher = ForecastRefresher(min_requests=0.5, refresh_ahead=3600)
+        isolated_forecast_cache.set(*NEW_YORK, start_date, Mock())
+        refresher.record([NEW_YORK, (48.9, 2.4)])
+
+        assert sorted(refresher.due_points(start_date)) == [NEW_YORK, (48.9, 2.4)]
+        assert refresher.refresh_due() == 2
+        upstream.weather_api.assert_called_once()
+        assert isolated_forecast_cache.stats()["hits"] == 0
+
+    def test_failed_pass_logged(self, caplog):
+        """Test that a pass failing before any fetch is logged by the background thread, not just counted"""
+        refresher = ForecastRefresher(interval=60)
+        refresher.due_points = Mock(side_effect=OSError("cache unavailable"))
+
+        with caplog.at_level("ERROR", logger="backend.utils.refresher"):
+            refresher.start()
+            refresher._wake.set()
+            deadline = time.monotonic() + 5
+            while not caplog.records and time.monotonic() < deadline:
+                time.sleep(0.01)
+
+        assert refresher.stats()["failed"] == 1
+        assert caplog.records[0].getMessage() == "Forecast refresh pass failed"
+        assert isinstance(caplog.records[0].exc_info[1], OSError)
+
+    def test_fresh_points_left_alone(self, isolated_forecast_cache, upstream):
+        """Test that nothing is fetched while hot forecasts are far from expiring"""
+        from backend.utils.weather import _forecast_window
+        start_date, _ = _forecast_window()
+        refresher = ForecastRefresher(min_requests=0.5, refresh_ahead=60)
+        isolated_forecast_cache.set(*NEW_YORK, start_date, Mock())
+        refresher.record([NEW_YORK])
+
+        assert refresher.refresh_due() == 0
+        upstream.weather_api.assert_not_called()
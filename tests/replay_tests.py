@@ -0,0 +1,223 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import Mock, patch
+
+import pytest
+import requests
+from google.api_core.exceptions import ServiceUnavailable
+
+from backend.replay.faults import FaultInjector
+from backend.replay.gemini import RecordingModel, ReplayFunctionCall, ReplayModel, ReplayPart, ReplayResponse
+from backend.replay.server import start_replay_server
+from backend.replay.store import FixtureStore
+
+
+class _FakeGeocodingHandler(BaseHTTPRequestHandler):
+    """Stands in for the real geocoding API while recording"""
+    protocol_version = "HTTP/1.1"
+    requests_seen = 0
+
+    def do_GET(self):
+        type(self).requests_seen += 1
+        body = json.dumps({"results": [{"latitude": 48.8534, "longitude": 2.3488}]}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def fake_upstream():
+    """Fixture providing a local HTTP server in place of geocoding-api.open-meteo.com"""
+    _FakeGeocodingHandler.requests_seen = 0
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _FakeGeocodingHandler)
+    threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+
+
+@pytest.fixture
+def store(tmp_path):
+    return FixtureStore(str(tmp_path / "fixtures"))
+
+
+def _stand_in(store, mode="replay", upstream="http://127.0.0.1:9", **faults):
+    return start_replay_server(store, mode, port=0, faults=FaultInjector(**faults), upstreams={"geocoding": upstream})
+
+
+class TestFixtureStore:
+    """Test the on-disk fixture store"""
+
+    def test_round_trip_and_stable_keys(self, store):
+        """Test that equal requests share a key regardless of dict order"""
+        key = store.key({"path": "/v1/search", "params": {"name": ["paris"], "count": ["1"]}})
+        assert key == store.key({"params": {"count": ["1"], "name": ["paris"]}, "path": "/v1/search"})
+
+        store.put("geocoding", key, {"status": 200})
+        assert store.get("geocoding", key) == {"status": 200}
+        assert store.get("geocoding", "missing") is None
+
+
+class TestFaultInjector:
+    """Test the seeded latency and error decisions"""
+
+    def test_same_seed_same_draws(self):
+        """Test that a seed reproduces the same sequence"""
+        first = FaultInjector(latency=0.01, jitter=0.02, error_rate=0.3, seed=7)
+        second = FaultInjector(latency=0.01, jitter=0.02, error_rate=0.3, seed=7)
+        draws = [first.draw() for _ in range(50)]
+        assert draws == [second.draw() for _ in range(50)]
+        assert all(0.01 <= delay <= 0.03 for delay, _ in draws)
+        assert 0 < sum(fails for _, fails in draws) < 50
+
+
+class TestReplayServer:
+    """Test the localhost stand-in"""
+
+    def test_record_then_replay_without_upstream(self, store, fake_upstream):
+        """Test that recorded responses are served once the real service is gone"""
+        recorder = _stand_in(store, mode="record", upstream=fake_upstream)
+        params = {"name": "paris", "count": 1, "format": "json"}
+        recorded = requests.get(f"{recorder.base_url}/geocoding/v1/search", params=params)
+        recorder.shutdown()
+
+        replayer = _stand_in(store)
+        replayed = requests.get(f"{replayer.base_url}/geocoding/v1/search", params=params)
+        replayer.shutdown()
+
+        assert _FakeGeocodingHandler.requests_seen == 1
+        assert replayed.status_code == 200
+        assert replayed.json() == recorded.json() == {"results": [{"latitude": 48.8534, "longitude": 2.3488}]}
+
+    def test_volatile_params_ignored(self, store, fake_upstream):
+        """Test that a moved forecast window still matches the recording"""
+        recorder = _stand_in(store, mode="record", upstream=fake_upstream)
+        requests.get(f"{recorder.base_url}/geocoding/v1/search", params={"name": "paris", "start_date": "2024-06-01"})
+        recorder.shutdown()
+
+        replayer = _stand_in(store)
+        response = requests.get(f"{replayer.base_url}/geocoding/v1/search", params={"name": "paris", "start_date": "2030-01-01"})
+        replayer.shutdown()
+
+        assert response.status_code == 200
+
+    def test_unrecorded_request_is_404(self, store):
+        """Test that replay never falls through to the network"""
+        replayer = _stand_in(store)
+        response = requests.get(f"{replayer.base_url}/geocoding/v1/search", params={"name": "nowhere"})
+        replayer.shutdown()
+
+        assert response.status_code == 404
+        assert "No recorded response" in response.json()["reason"]
+
+    def test_injected_latency_and_errors(self, store, fake_upstream):
+        """Test that replayed responses are delayed and failed as configured"""
+        recorder = _stand_in(store, mode="record", upstream=fake_upstream)
+        requests.get(f"{recorder.base_url}/geocoding/v1/search", params={"name": "paris"})
+        recorder.shutdown()
+
+        slow = _stand_in(store, latency=0.1)
+        start = time.perf_counter()
+        assert requests.get(f"{slow.base_url}/geocoding/v1/search", params={"name": "paris"}).status_code == 200
+        assert time.perf_counter() - start >= 0.1
+        slow.shutdown()
+
+        failing = _stand_in(store, error_rate=1.0)
+        assert requests.get(f"{failing.base_url}/geocoding/v1/search", params={"name": "paris"}).status_code == 503
+        failing.shutdown()
+
+    def test_app_geocoding_through_stand_in(self, store, fake_upstream):
+        """Test the unmodified geocoding path against a replayed fixture"""
+        from backend.utils.geocoding import _get_location_coordinates
+
+        recorder = _stand_in(store, mode="record", upstream=fake_upstream)
+        with patch("backend.utils.geocoding.GEOCODING_URL", f"{recorder.base_url}/geocoding/v1/search"):
+            _get_location_coordinates("Paris")
+        recorder.shutdown()
+
+        replayer = _stand_in(store)
+        with patch("backend.utils.geocoding.GEOCODING_URL", f"{replayer.base_url}/geocoding/v1/search"), \
+                patch("backend.utils.geocoding.get_geocoding_cache") as mock_cache:
+            mock_cache.return_value.get.return_value = None
+            assert _get_location_coordinates("Paris") == (48.8534, 2.3488)
+        replayer.shutdown()
+
+
+class TestGeminiReplay:
+    """Test the Gemini record/replay stand-ins"""
+
+    def _recorded(self, store, contents, *chunks, stream=False):
+        model = Mock()
+        model.generate_content.return_value = iter(chunks) if stream else chunks[0]
+        recorder = RecordingModel(model, "tooled", store)
+        result = recorder.generate_content(contents, stream=stream)
+        return list(result) if stream else result
+
+    def test_function_calls_and_text_replayed(self, store):
+        """Test that a recorded turn with a function call replays with the same parts"""
+        contents = [{"role": "user", "parts": ["Weather in Paris on 2024-06-01?"]}]
+        self._recorded(store, contents, ReplayResponse([
+            ReplayPart(function_call=ReplayFunctionCall("get_weather_info", {"location": "Paris"})),
+            ReplayPart(text="Let me check."),
+        ]))
+
+        response = ReplayModel("tooled", store, FaultInjector()).generate_content(contents)
+        parts = response.candidates[0].content.parts
+
+        assert parts[0].function_call.name == "get_weather_info"
+        assert parts[0].function_call.args == {"location": "Paris"}
+        assert parts[1].text == "Let me check."
+
+    def test_dates_masked_in_keys(self, store):
+        """Test that a recording made on another day still matches"""
+        self._recorded(store, [{"role": "user", "parts": ["Plan for 2024-06-01"]}], ReplayResponse([ReplayPart("ok")]))
+
+        response = ReplayModel("tooled", store, FaultInjector()).generate_content(
+            [{"role": "user", "parts": ["Plan for 2030-12-31"]}]
+        )
+        assert response.candidates[0].content.parts[0].text == "ok"
+
+    def test_streamed_chunks_replayed(self, store):
+        """Test that streams replay chunk by chunk"""
+        contents = [{"role": "user", "parts": ["Hi"]}]
+        self._recorded(store, contents, ReplayResponse([ReplayPart("Hel")]), ReplayResponse([ReplayPart("lo")]), stream=True)
+
+        chunks = ReplayModel("tooled", store, FaultInjector()).generate_content(contents, stream=True)
+        assert [chunk.candidates[0].content.parts[0].text for chunk in chunks] == ["Hel", "lo"]
+
+    def test_missing_and_failed_requests(self, store):
+        """Test that unrecorded requests and injected failures raise"""
+        contents = [{"role": "user", "parts": ["Hi"]}]
+        with pytest.raises(LookupError):
+            ReplayModel("tooled", store, FaultInjector()).generate_content(contents)
+
+        self._recorded(store, contents, ReplayResponse([ReplayPart("ok")]))
+        with pytest.raises(ServiceUnavailable):
+            ReplayModel("tooled", store, FaultInjector(error_rate=1.0)).generate_content(contents)
+
+    def test_tooled_loop_runs_on_replay(self, store):
+        """Test the real tool-calling loop against recorded responses"""
+        from backend.data_models.data_models import Tool
+        from backend.utils.llm import invoke_gemini_tooled_model
+
+        params = {"location": {"type": "string", "description": "", "required": True},
+                  "event_date": {"type": "string", "description": "", "required": True}}
+        tools = [Tool("get_weather_info", lambda location, event_date: {"ok": location}, "", params, "", [])]
+        first_turn = [{"role": "user", "parts": ["Paris?"]}]
+        self._recorded(store, first_turn, ReplayResponse([
+            ReplayPart(function_call=ReplayFunctionCall("get_weather_info", {"location": "Paris", "event_date": "2024-06-01"}))
+        ]))
+        second_turn = first_turn + [
+            {"role": "model", "parts": [{"function_call": ReplayFunctionCall("get_weather_info", {"location": "Paris", "event_date": "2024-06-01"})}]},
+            {"role": "user", "parts": [{"function_response": {"name": "get_weather_info", "response": {"result": {"ok": "Paris"}}}}]},
+        ]
+        self._recorded(store, second_turn, ReplayResponse([ReplayPart("Sunny in Paris")]))
+
+        answer = invoke_gemini_tooled_model(ReplayModel("tooled", store, FaultInjector()), "Paris?", [], tools)
+        assert answer == "Sunny in Paris"
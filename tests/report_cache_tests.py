@@ -0,0 +1,85 @@
+from unittest.mock import Mock
+
+import numpy as np
+import pytest
+
+from backend.data_models.data_models import Forecast
+
+
+@pytest.fixture
+def forecast():
+    """Fixture providing a one-day forecast"""
+    time = np.arange(1717200000, 1717200000 + 24 * 3600, 3600)
+    return Forecast(time, np.vstack([np.arange(24.0), np.zeros(24)]), ("temperature_2m", "precipitation"), 0, "GMT")
+
+
+def _model(*reports) -> Mock:
+    model = Mock()
+    responses = []
+    for report in reports:
+        part = Mock()
+        part.text = report
+        response = Mock()
+        response.candidates = [Mock()]
+        response.candidates[0].content.parts = [part]
+        responses.append(response)
+    model.generate_content.side_effect = responses
+    return model
+
+
+class TestForecastContentHash:
+    """Test the forecast fingerprint used in report keys"""
+
+    def test_equal_forecasts_hash_equally(self, forecast):
+        """Test that a copy hashes the same and any changed value does not"""
+        copy = Forecast(forecast.time.copy(), forecast.values.copy(), forecast.variables, 0, "GMT")
+        assert copy.content_hash() == forecast.content_hash()
+
+        copy.values[0, 5] += 0.1
+        assert copy.content_hash() != forecast.content_hash()
+
+    def test_day_view_hashes_its_own_content(self, forecast):
+        """Test that non-contiguous day views can be hashed"""
+        assert forecast.day(forecast.dates[0]).content_hash() == forecast.content_hash()
+
+
+class TestGetWeatherReport:
+    """Test the memoized Weather_Man report"""
+
+    def test_repeated_request_served_from_cache(self, forecast):
+        """Test that the same location, date, units and forecast reuse one model call"""
+        from backend.utils.llm import get_weather_report
+
+        model = _model("Sunny report")
+        result = {"error": None, "data": forecast, "location": "New York", "date": forecast.dates[0]}
+        other_spelling = {**result, "location": "new  york "}
+
+        assert get_weather_report(model, result, "Metric") == "Sunny report"
+        assert get_weather_report(model, other_spelling, "metric") == "Sunny report"
+        model.generate_content.assert_called_once()
+
+    def test_units_and_forecast_content_are_part_of_key(self, forecast):
+        """Test that other units or an updated forecast produce a new report"""
+        from backend.utils.llm import get_weather_report
+
+        model = _model("Metric report", "Imperial report", "Updated report")
+        result = {"error": None, "data": forecast, "location": "New York", "date": forecast.dates[0]}
+        updated = Forecast(forecast.time, forecast.values + 1, forecast.variables, 0, "GMT")
+
+        assert get_weather_report(model, result, "Metric") == "Metric report"
+        assert get_weather_report(model, result, "Imperial") == "Imperial report"
+        assert get_weather_report(model, {**result, "data": updated}, "Metric") == "Updated report"
+        assert model.generate_content.call_count == 3
+
+    def test_errors_not_cached(self, isolated_report_cache):
+        """Test that reports for failed lookups are generated but never stored"""
+        from backend.utils.llm import get_weather_report
+
+        model = _model("No data report", "No data report")
+        result = {"error": "City not found", "data": None, "location": "XYZ", "date": "2025-01-01"}
+
+        get_weather_report(model, result, "Metric")
+        get_weather_report(model, result, "Metric")
+
+        assert model.generate_content.call_count == 2
+        assert len(isolated_report_cache.backend) == 0
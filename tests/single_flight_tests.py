@@ -0,0 +1,252 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from unittest.mock import Mock, patch
+
+import pytest
+
+from backend.replay.synthetic import SyntheticResponse
+from backend.utils.single_flight import SingleFlight
+
+
+def _run_together(count: int, function) -> list:
+    """Call ``function`` from ``count`` threads released at the same moment"""
+    barrier = threading.Barrier(count)
+
+    def call():
+        barrier.wait()
+        return function()
+
+    with ThreadPoolExecutor(max_workers=count) as executor:
+        futures = [executor.submit(call) for _ in range(count)]
+        return [future.result() for future in futures]
+
+
+def _slow(result, delay: float = 0.1):
+    def call(*args, **kwargs):
+        time.sleep(delay)
+        return result
+    return call
+
+
+class TestSingleFlight:
+    """Test the in-flight call coalescing primitive"""
+
+    def test_concurrent_callers_share_one_call(self):
+        """Test that callers arriving while a call is in flight get its result without calling again"""
+        flights = SingleFlight()
+        function = Mock(side_effect=_slow("done"))
+
+        results = _run_together(8, lambda: flights.do("key", function))
+
+        assert results == ["done"] * 8
+        function.assert_called_once()
+        assert (flights.leaders, flights.followers) == (1, 7)
+        assert flights.in_flight() == 0
+
+    def test_error_shared_with_followers(self):
+        """Test that a failed call raises the same error for every waiting caller"""
+        flights = SingleFlight()
+
+        def failing():
+            time.sleep(0.1)
+            raise ValueError("City not found")
+
+        def call():
+            try:
+                flights.do("key", failing)
+            except ValueError as e:
+                return str(e)
+
+        assert _run_together(4, call) == ["City not found"] * 4
+        assert flights.leaders == 1
+
+    def test_finished_calls_not_kept(self):
+        """Test that a later call for the same key runs again"""
+        flights = SingleFlight()
+        function = Mock(return_value=1)
+
+        flights.do("key", function)
+        flights.do("key", function)
+
+        assert function.call_count == 2
+
+    def test_async_followers(self):
+        """Test that coroutines await the leader's call"""
+        flights = SingleFlight()
+        calls = []
+
+        async def fetch():
+            calls.append(1)
+            await asyncio.sleep(0.05)
+            return "done"
+
+        async def main():
+            return await asyncio.gather(*(flights.do_async("key", fetch) for _ in range(5)))
+
+        assert asyncio.run(main()) == ["done"] * 5
+        assert len(calls) == 1
+
+    def test_cancelled_follower_leaves_others_waiting(self):
+        """Test that cancelling one async follower neither cancels the leader nor the other followers"""
+        flights = SingleFlight()
+
+        async def fetch():
+            await asyncio.sleep(0.05)
+            return 42
+
+        async def main():
+            leader = asyncio.create_task(flights.do_async("key", fetch))
+            await asyncio.sleep(0)
+            cancelled, follower = (asyncio.create_task(flights.do_async("key", fetch)) for _ in range(2))
+            await asyncio.sleep(0.01)
+            cancelled.cancel()
+            return await asyncio.gather(leader, cancelled, follower, return_exceptions=True)
+
+        leader, cancelled, follower = asyncio.run(main())
+
+        assert leader == follower == 42
+        assert isinstance(cancelled, asyncio.CancelledError)
+        assert flights.followers == 2
+
+
+class TestCoalescedUpstreamCalls:
+    """Test that concurrent identical requests reach the upstream APIs once"""
+
+    @patch('requests.Session.get')
+    def test_one_geocoding_request(self, mock_get):
+        """Test that concurrent lookups of one uncached location share a single geocoding request"""
+        from backend.utils.geocoding import _get_location_coordinates
+
+        response = Mock(status_code=200)
+        response.json.return_value = {"results": [{"latitude": 48.85, "longitude": 2.35}]}
+        mock_get.side_effect = _slow(response)
+
+        results = _run_together(6, lambda: _get_location_coordinates("Paris"))
+
+        assert results == [(48.85, 2.35)] * 6
+        mock_get.assert_called_once()
+
+    @patch('backend.utils.weather._get_location_coordinates', return_value=(40.71427, -74.00597))
+    @patch('backend.utils.weather.get_openmeteo_client')
+    def test_one_forecast_request(self, mock_get_client, mock_get_coords):
+        """Test that concurrent forecasts for one grid cell share a single Open-Meteo request"""
+        from backend.utils.weather import get_forecast
+
+        mock_client = Mock()
+        mock_client.weather_api.side_effect = _slow([SyntheticResponse(hours=168)])
+        mock_get_client.return_value = mock_client
+        event_date = datetime.now().strftime("%Y-%m-%d")
+
+        results = _run_together(6, lambda: get_forecast("New York", event_date))
+
+        mock_client.weather_api.assert_called_once()
+        assert all(result["error"] is None for result in results)
+        assert sum(not result["from_cache"] for result in results) == 6
+
+    @patch('backend.utils.weather._get_location_coordinates', return_value=(40.71427, -74.00597))
+    @patch('backend.utils.weather.get_openmeteo_client')
+    def test_forecast_error_shared(self, mock_get_client, mock_get_coords):
+        """Test that followers receive the leader's upstream failure as an error result"""
+        from backend.utils.weather import get_forecast, forecast_flights
+
+        def failing(*args, **kwargs):
+            time.sleep(0.1)
+            raise ConnectionError("upstream down")
+
+        mock_client = Mock()
+        mock_client.weather_api.side_effect = failing
+        mock_get_client.return_value = mock_client
+        event_date = datetime.now().strftime("%Y-%m-%d")
+
+        results = _run_together(4, lambda: get_forecast("New York", event_date))
+
+        mock_client.weather_api.assert_called_once()
+        assert all("upstream down" in result["error"] for result in results)
+        assert forecast_flights.in_flight() == 0
+
+    def test_async_and_sync_callers_share(self):
+        """Test that an async forecast joins a fetch already started by a synchronous caller"""
+        from backend.utils.async_weather import get_forecast_async, run_sync
+        from backend.utils.weather import get_forecast
+
+        started = threading.Event()
+
+        def slow_fetch(*args, **kwargs):
+            started.set()
+            time.sleep(0.2)
+            return [SyntheticResponse(hours=168)]
+
+        sync_client = Mock()
+        sync_client.weather_api.side_effect = slow_fetch
+        async_client = Mock()
+        resources = (Mock(), async_client, None)
+        event_date = datetime.now().strftime("%Y-%m-%d")
+
+        with patch('backend.utils.weather._get_location_coordinates', return_value=(40.71427, -74.00597)), \
+                patch('backend.utils.weather.get_openmeteo_client', return_value=sync_client), \
+                patch('backend.utils.async_weather._resolve_location_offline',
+                      return_value=("new york", (40.71427, -74.00597))), \
+                patch('backend.utils.async_weather._get_loop_resources', return_value=resources):
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                leader = executor.submit(get_forecast, "New York", event_date)
+                assert started.wait(timeout=5)
+                follower = run_sync(get_forecast_async("NYC", event_date))
+                assert leader.result()["error"] is None
+
+        assert follower["error"] is None
+        sync_client.weather_api.assert_called_once()
+        async_client.weather_api.assert_not_called()
+
+    @patch('backend.utils.weather._get_location_coordinates', return_value=(40.71427, -74.00597))
+    def test_claims_released_when_cache_read_fails(self, mock_get_coords):
+        """Test that an error between claiming a grid point and fetching it does not leave the claim behind"""
+        from backend.utils.weather import get_forecast, forecast_flights
+
+        event_date = datetime.now().strftime("%Y-%m-%d")
+        with patch('backend.utils.weather.get_forecast_cache') as mock_get_cache:
+            mock_get_cache.return_value.snap.side_effect = lambda lat, lon: (round(lat, 1), round(lon, 1))
+            mock_get_cache.return_value.lookup.side_effect = OSError("cache unavailable")
+            with pytest.raises(OSError):
+                get_forecast("New York", event_date)
+
+        assert forecast_flights.in_flight() == 0
+
+    @patch('backend.utils.weather._get_location_coordinates', return_value=(40.71427, -74.00597))
+    @patch('backend.utils.weather.get_openmeteo_client')
+    def test_stuck_leader_not_waited_on_forever(self, mock_get_client, mock_get_coords):
+        """Test that a follower whose leader never answers fetches the forecast itself"""
+        from backend.utils.weather import _forecast_window, forecast_flights, get_forecast
+
+        mock_client = Mock()
+        mock_client.weather_api.return_value = [SyntheticResponse(hours=168)]
+        mock_get_client.return_value = mock_client
+        event_date = datetime.now().strftime("%Y-%m-%d")
+        key = (40.7, -74.0, _forecast_window()[0])
+
+        stuck, _ = forecast_flights.claim(key)
+        followers = forecast_flights.followers
+        try:
+            with patch('backend.utils.weather.FORECAST_FLIGHT_WAIT_SECONDS', 0.05):
+                result = get_forecast("New York", event_date)
+        finally:
+            forecast_flights.resolve(key, error=RuntimeError("test over"), future=stuck)
+
+        assert forecast_flights.followers == followers + 1
+        assert result["error"] is None
+        mock_client.weather_api.assert_called_once()
+
+    def test_release_leaves_newer_claim(self):
+        """Test that settling an old claim does not touch a newer claim on the same key"""
+        flights = SingleFlight()
+        old, _ = flights.claim("key")
+        flights.resolve("key", "first")
+        new, is_leader = flights.claim("key")
+
+        flights.resolve("key", error=RuntimeError("cleanup"), future=old)
+
+        assert is_leader and not new.done()
+        assert flights.in_flight() == 1
+        assert old.result() == "first"
@@ -0,0 +1,126 @@
+from datetime import datetime, timedelta
+from unittest.mock import Mock, patch
+
+import pytest
+
+from backend.data_models.data_models import Tool
+from backend.utils.tools import ToolRegistry
+
+PARAMS = {
+    "locations": {"type": "array of strings", "description": "Cities", "required": True},
+    "event_date": {"type": "string", "description": "YYYY-MM-DD", "required": True, "format": "date"},
+    "days": {"type": "integer", "description": "Days", "required": False},
+}
+
+
+def _registry(function=None) -> ToolRegistry:
+    tool = Tool("compare", function or Mock(return_value="ok"), "Compares cities.", PARAMS, "Seven days only.", [])
+    return ToolRegistry([tool])
+
+
+def _function_call(name: str, **args) -> Mock:
+    function_call = Mock()
+    function_call.name = name
+    function_call.args = args
+    return function_call
+
+
+class TestDeclarations:
+    """Test the function declarations built from Tool params"""
+
+    def test_declaration_from_params(self):
+        """Test that types, descriptions and required params are declared"""
+        declaration = _registry().declarations[0]
+
+        assert declaration["name"] == "compare"
+        assert declaration["description"] == "Compares cities. Seven days only."
+        assert declaration["parameters"]["properties"]["locations"] == {
+            "type": "array", "items": {"type": "string"}, "description": "Cities"
+        }
+        assert declaration["parameters"]["required"] == ["locations", "event_date"]
+
+    def test_unsupported_type_rejected(self):
+        """Test that a param type with no schema fails when the registry is built"""
+        tool = Tool("broken", Mock(), "", {"when": {"type": "timestamp", "description": ""}}, "", [])
+        with pytest.raises(ValueError):
+            ToolRegistry([tool])
+
+    def test_model_sees_registered_names(self, monkeypatch):
+        """Test that the tooled model declares the tools under the names calls are dispatched by"""
+        import config.gemini as gemini_config
+        monkeypatch.setattr(gemini_config, "_models", {})
+        monkeypatch.setattr(gemini_config, "get_api_key", lambda name: "test-key")
+
+        with patch("google.generativeai.configure"):
+            model = gemini_config.get_tooled_model("UTC")
+
+        declared = [declaration.name for tool in model._tools.to_proto() for declaration in tool.function_declarations]
+        assert declared == [tool.name for tool in gemini_config.TOOLS_LIST]
+        assert gemini_config._tool_library() is gemini_config._tool_library()
+
+
+class TestValidation:
+    """Test local argument validation and coercion"""
+
+    def test_coercion(self):
+        """Test that unambiguous argument shapes are coerced"""
+        args, error = _registry().validate("compare", {"locations": " Paris ", "event_date": "2025/06/01", "days": "3"})
+
+        assert error is None
+        assert args == {"locations": ["Paris"], "event_date": "2025-06-01", "days": 3}
+
+    def test_structured_errors(self):
+        """Test that every bad argument is reported together and the tool never runs"""
+        function = Mock()
+        result = _registry(function).execute("compare", {"locations": [], "event_date": "June 1st", "units": "metric"})
+
+        assert result["error"] == "Invalid arguments for compare"
+        assert set(result["invalid_arguments"]) == {"locations", "event_date", "units"}
+        assert "YYYY-MM-DD" in result["invalid_arguments"]["event_date"]
+        assert result["invalid_arguments"]["units"] == "unexpected argument"
+        function.assert_not_called()
+
+    def test_missing_required(self):
+        """Test that missing required arguments are named"""
+        _, error = _registry().validate("compare", {"locations": ["Paris"]})
+        assert error["invalid_arguments"] == {"event_date": "missing required argument"}
+
+    def test_unknown_tool(self):
+        """Test that a call to an unregistered tool is an error"""
+        assert _registry().execute("forecast", {}) == {"error": "Function forecast not found"}
+
+    def test_event_date_window_checked_locally(self):
+        """Test that the weather tools reject dates outside the forecast window before fetching anything"""
+        from config.gemini import TOOL_REGISTRY
+
+        too_late = (datetime.now() + timedelta(days=30)).strftime("%Y-%m-%d")
+        with patch("backend.utils.weather.get_forecast_batch") as mock_fetch:
+            result = TOOL_REGISTRY.execute("get_event_weather_info", {"location": "Paris", "event_date": too_late})
+
+        assert "within the next 7 days" in result["invalid_arguments"]["event_date"]
+        mock_fetch.assert_not_called()
+
+
+class TestToolLoopValidation:
+    """Test that the tool-calling loop validates before executing"""
+
+    def test_invalid_call_answered_without_running(self):
+        """Test that a malformed call gets a structured error in its function response"""
+        from backend.utils.llm import _execute_function_calls
+        from backend.utils.tracing import trace
+
+        function = Mock(return_value="ok")
+        registry = _registry(function)
+        calls = [
+            _function_call("compare", locations=["Paris"], event_date="tomorrow"),
+            _function_call("compare", locations=["Paris", "Rome"], event_date="2025-06-01"),
+        ]
+
+        with trace("skye.answer") as current:
+            results = _execute_function_calls(calls, registry)
+
+        assert results[0]["invalid_arguments"]["event_date"].startswith("expected a date")
+        assert results[1] == "ok"
+        function.assert_called_once_with(locations=["Paris", "Rome"], event_date="2025-06-01")
+        errors = [record["attributes"].get("error") for record in current.spans if record["name"] == "tool.compare"]
+        assert sorted(errors, key=str) == ["InvalidArguments", None]
@@ -0,0 +1,193 @@
+import asyncio
+import json
+import threading
+import time
+from datetime import datetime
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+
+from backend.data_models.data_models import Tool
+from backend.utils import tracing
+from backend.utils.tracing import Histogram, histogram_summaries, span, trace
+
+
+@pytest.fixture(autouse=True)
+def fresh_histograms():
+    """Fixture clearing the process-wide histograms around each test"""
+    tracing.reset_histograms()
+    yield
+    tracing.reset_histograms()
+
+
+def _response(*parts) -> Mock:
+    response = Mock()
+    response.candidates = [Mock()]
+    response.candidates[0].content.parts = list(parts)
+    return response
+
+
+def _part(text: str = "", function_call=None) -> Mock:
+    part = Mock()
+    part.text = text
+    part.function_call = function_call
+    return part
+
+
+def _call(name: str, **args) -> Mock:
+    function_call = Mock()
+    function_call.name = name
+    function_call.args = args
+    return function_call
+
+
+class TestHistogram:
+    """Test the fixed-bucket latency histogram"""
+
+    def test_summary(self):
+        """Test that counts, extremes and bucketed percentiles are reported"""
+        histogram = Histogram(buckets_ms=(10, 100, 1000))
+        for duration in (1, 5, 50, 60, 70, 500, 5000):
+            histogram.observe(duration)
+
+        summary = histogram.summary()
+        assert summary["count"] == 7
+        assert summary["min_ms"] == 1
+        assert summary["max_ms"] == 5000
+        assert summary["p50_ms"] == 100
+        assert summary["p99_ms"] == 5000
+
+
+class TestSpans:
+    """Test span nesting, trace collection and export"""
+
+    def test_nested_spans_collected_on_trace(self):
+        """Test that spans inside a trace record their parent and feed the histograms"""
+        with trace("request") as current:
+            with span("outer"):
+                with span("inner", source="test") as attributes:
+                    attributes["extra"] = 1
+
+        records = {record["name"]: record for record in current.spans}
+        assert records["inner"]["parent_id"] == records["outer"]["span_id"]
+        assert records["outer"]["parent_id"] == records["request"]["span_id"]
+        assert records["inner"]["attributes"] == {"source": "test", "extra": 1}
+        assert {record["trace_id"] for record in current.spans} == {current.trace_id}
+        assert histogram_summaries()["inner"]["count"] == 1
+
+    def test_errors_recorded_and_raised(self):
+        """Test that an exception marks the span and still propagates"""
+        with trace("request") as current:
+            with pytest.raises(KeyError):
+                with span("lookup"):
+                    raise KeyError("missing")
+
+        assert current.spans[0]["attributes"] == {"error": "KeyError"}
+
+    def test_jsonl_export(self, tmp_path, monkeypatch):
+        """Test that finished spans and histogram summaries are appended as JSON lines"""
+        path = tmp_path / "spans.jsonl"
+        monkeypatch.setattr(tracing, "TRACE_EXPORT_PATH", str(path))
+        with span("geocode"):
+            pass
+        tracing.export_histograms(str(path))
+
+        lines = [json.loads(line) for line in path.read_text().splitlines()]
+        assert lines[0]["name"] == "geocode"
+        assert lines[1]["histogram"] == "geocode" and lines[1]["count"] == 1
+
+    def test_disabled(self, monkeypatch):
+        """Test that spans are no-ops when tracing is off"""
+        monkeypatch.setattr(tracing, "TRACING_ENABLED", False)
+        with span("geocode"):
+            pass
+        assert histogram_summaries() == {}
+
+
+class TestRequestPathSpans:
+    """Test the spans recorded along the request path"""
+
+    def test_llm_rounds_and_parallel_tools(self):
+        """Test that every generate_content call and each concurrent tool call lands in the trace"""
+        from backend.utils.llm import invoke_gemini_tooled_model
+
+        params = {"location": {"type": "string", "description": "", "required": True},
+                  "event_date": {"type": "string", "description": "", "required": True}}
+        tool = Tool("get_weather_info", lambda location, event_date: {"ok": location}, "", params, "", [])
+        model = Mock()
+        model.generate_content.side_effect = [
+            _response(_part(function_call=_call("get_weather_info", location="Paris", event_date="2025-06-01")),
+                      _part(function_call=_call("get_weather_info", location="Rome", event_date="2025-06-01"))),
+            _response(_part("Both sunny")),
+        ]
+
+        with trace("skye.answer") as current:
+            invoke_gemini_tooled_model(model, "Paris or Rome?", [], [tool])
+
+        root = next(record for record in current.spans if record["name"] == "skye.answer")
+        rounds = [record for record in current.spans if record["name"] == "llm.tooled.generate_content"]
+        tools = [record for record in current.spans if record["name"] == "tool.get_weather_info"]
+        assert [record["attributes"]["round"] for record in rounds] == [0, 1]
+        assert len(tools) == 2
+        assert all(record["parent_id"] == root["span_id"] for record in rounds + tools)
+
+    def test_stream_span_excludes_consumer(self):
+        """Test that a streamed round is timed without the time the consumer spends on each chunk"""
+        from backend.utils.llm import stream_gemini_tooled_model
+
+        model = Mock()
+        model.generate_content.return_value = iter([_response(_part("Sunny ")), _response(_part("all week"))])
+
+        with trace("skye.answer") as current:
+            for _ in stream_gemini_tooled_model(model, "Weather?", [], []):
+                time.sleep(0.1)
+
+        root = next(record for record in current.spans if record["name"] == "skye.answer")
+        [round_span] = [record for record in current.spans if record["name"] == "llm.tooled.generate_content"]
+        assert round_span["duration_ms"] < 100
+        assert round_span["parent_id"] == root["span_id"]
+
+    def test_abandoned_stream_span(self):
+        """Test that closing the stream early ends the round's span at the next chunk, without an error"""
+        from backend.utils.llm import stream_gemini_tooled_model
+
+        closed = threading.Event()
+
+        def chunks():
+            yield _response(_part("Sunny "))
+            closed.wait(timeout=5)
+            yield _response(_part("all week"))
+
+        model = Mock()
+        model.generate_content.return_value = chunks()
+
+        with trace("skye.answer") as current:
+            stream = stream_gemini_tooled_model(model, "Weather?", [], [])
+            assert next(stream) == "Sunny "
+            stream.close()
+            closed.set()
+
+        deadline = time.monotonic() + 5
+        while not any(record["name"] == "llm.tooled.generate_content" for record in current.spans):
+            assert time.monotonic() < deadline
+            time.sleep(0.01)
+        [round_span] = [record for record in current.spans if record["name"] == "llm.tooled.generate_content"]
+        assert round_span["attributes"]["abandoned"] is True
+        assert "error" not in round_span["attributes"]
+
+    def test_forecast_spans_from_background_loop(self, isolated_forecast_cache):
+        """Test that spans recorded on the async loop thread join the caller's trace"""
+        from backend.utils.async_weather import get_forecast_async, run_sync
+        from backend.replay.synthetic import SyntheticResponse
+
+        client = Mock()
+        client.weather_api = AsyncMock(return_value=[SyntheticResponse(24)])
+        resources = (Mock(), client, asyncio.Semaphore(1))
+        with trace("weather_info.fetch") as current, \
+                patch("backend.utils.async_weather._resolve_location_offline", return_value=("paris", (48.85, 2.35))), \
+                patch("backend.utils.async_weather._get_loop_resources", return_value=resources):
+            result = run_sync(get_forecast_async("Paris", datetime.now().strftime("%Y-%m-%d")))
+
+        assert result["error"] is None
+        names = [record["name"] for record in current.spans]
+        assert {"geocode", "forecast.fetch", "forecast.transform", "weather_info.fetch"} <= set(names)
@@ -0,0 +1,145 @@
+import time
+from unittest.mock import Mock, patch
+
+import pytest
+
+from backend.cache import forecast_cache
+from backend.cache.forecast_cache import ForecastCache
+from backend.cache.memory_cache import MemoryCache
+from backend.replay.synthetic import SyntheticResponse
+from backend.utils import warm_start as warm_start_module
+from backend.utils.weather import _build_forecast, _forecast_window
+
+COORDINATES = {"Paris": (48.85, 2.35), "Rome": (41.89, 12.48), "Oslo": (59.91, 10.75)}
+
+
+def _forecast_cache(ttl: float = 1800) -> ForecastCache:
+    return ForecastCache(MemoryCache(max_entries=10, ttl=ttl), grid_degrees=0.1)
+
+
+class TestMemorySnapshots:
+    """Test taking and restoring memory cache snapshots"""
+
+    def test_restore_keeps_expiry_and_drops_expired(self):
+        """Test that restored entries keep their expiry and expired ones are left out"""
+        cache = MemoryCache(max_entries=10, ttl=60)
+        cache.set("paris", 1)
+        cache.set("rome", 2, ttl=0.01)
+        entries = cache.snapshot()
+        time.sleep(0.02)
+
+        restored = MemoryCache(max_entries=10, ttl=60)
+        assert restored.restore(entries) == 1
+        assert restored.get("paris") == 1 and restored.get("rome") is None
+        assert restored.snapshot()[0][2] == entries[0][2]
+
+
+class TestForecastSnapshots:
+    """Test saving the forecast cache to disk and loading it back"""
+
+    def test_round_trip(self, tmp_path):
+        """Test that forecasts and their freshness survive a save and load"""
+        path = str(tmp_path / "forecasts.snapshot")
+        forecast = _build_forecast(SyntheticResponse(hours=24))
+        cache = _forecast_cache()
+        cache.set(48.85, 2.35, "2024-06-01", forecast)
+
+        assert cache.save_snapshot(path) == 1
+        restored = _forecast_cache()
+        assert restored.load_snapshot(path) == 1
+        entry = restored.lookup(48.85, 2.35, "2024-06-01")
+        assert entry.forecast.to_dict() == forecast.to_dict()
+        assert entry.fresh_until == cache.lookup(48.85, 2.35, "2024-06-01").fresh_until
+
+    def test_unchanged_cache_not_rewritten(self, tmp_path):
+        """Test that a snapshot is only written after new forecasts were stored"""
+        path = str(tmp_path / "forecasts.snapshot")
+        cache = _forecast_cache()
+        assert cache.save_snapshot(path) == 0
+
+        cache.set(48.85, 2.35, "2024-06-01", _build_forecast(SyntheticResponse(hours=24)))
+        cache.save_snapshot(path)
+        assert cache.save_snapshot(path) == 0
+
+    @pytest.mark.parametrize("content", [b"", b"not a pickle"])
+    def test_unreadable_snapshot_ignored(self, tmp_path, content):
+        """Test that a damaged snapshot restores nothing instead of failing startup"""
+        path = tmp_path / "forecasts.snapshot"
+        path.write_bytes(content)
+        assert _forecast_cache().load_snapshot(str(path)) == 0
+        assert _forecast_cache().load_snapshot(str(tmp_path / "missing")) == 0
+
+    def test_other_grid_ignored(self, tmp_path):
+        """Test that a snapshot keyed on a different grid is not restored"""
+        path = str(tmp_path / "forecasts.snapshot")
+        cache = _forecast_cache()
+        cache.set(48.85, 2.35, "2024-06-01", _build_forecast(SyntheticResponse(hours=24)))
+        cache.save_snapshot(path)
+
+        assert ForecastCache(MemoryCache(max_entries=10), grid_degrees=0.25).load_snapshot(path) == 0
+
+    def test_loaded_when_cache_created(self, tmp_path, monkeypatch):
+        """Test that the process-wide cache starts from the saved snapshot"""
+        path = str(tmp_path / "forecasts.snapshot")
+        forecast = _build_forecast(SyntheticResponse(hours=24))
+        saved = ForecastCache(MemoryCache(max_entries=10, ttl=1800), grid_degrees=forecast_cache.FORECAST_GRID_DEGREES)
+        saved.set(48.85, 2.35, "2024-06-01", forecast)
+        saved.save_snapshot(path)
+
+        monkeypatch.setattr(forecast_cache, "_forecast_cache", None)
+        monkeypatch.setattr(forecast_cache, "FORECAST_SNAPSHOT_PATH", path)
+        monkeypatch.setattr(forecast_cache, "create_forecast_cache_backend", lambda: MemoryCache(10, ttl=1800))
+        start_snapshots = Mock()
+        monkeypatch.setattr(forecast_cache, "_start_snapshots", start_snapshots)
+
+        cache = forecast_cache.get_forecast_cache()
+        assert cache.get(48.85, 2.35, "2024-06-01") is not None
+        start_snapshots.assert_called_once_with(cache, path, forecast_cache.FORECAST_SNAPSHOT_INTERVAL_SECONDS)
+
+    def test_not_taken_without_path(self, monkeypatch):
+        """Test that no snapshot is loaded or written unless a path is configured"""
+        monkeypatch.setattr(forecast_cache, "_forecast_cache", None)
+        monkeypatch.setattr(forecast_cache, "FORECAST_SNAPSHOT_PATH", "")
+        monkeypatch.setattr(forecast_cache, "create_forecast_cache_backend", lambda: MemoryCache(10, ttl=1800))
+        start_snapshots = Mock()
+        monkeypatch.setattr(forecast_cache, "_start_snapshots", start_snapshots)
+
+        with patch.object(ForecastCache, "load_snapshot") as load_snapshot:
+            forecast_cache.get_forecast_cache()
+        load_snapshot.assert_not_called()
+        start_snapshots.assert_not_called()
+
+
+class TestWarmStart:
+    """Test prefetching the configured city list"""
+
+    def test_read_city_list(self, tmp_path):
+        """Test that comments, blank lines and repeats are skipped"""
+        path = tmp_path / "cities.txt"
+        path.write_text("# Europe\nParis\n\nRome  # capital\nParis\n")
+        assert warm_start_module.read_city_list(str(path)) == ["Paris", "Rome"]
+
+    @patch('backend.utils.weather.get_openmeteo_client')
+    @patch('backend.utils.weather._get_location_coordinates', side_effect=COORDINATES.get)
+    def test_prefetch_once_per_process(self, mock_get_coords, mock_get_client, tmp_path, monkeypatch,
+                                       isolated_forecast_cache):
+        """Test that the first call fetches every city in one request and later calls do nothing"""
+        monkeypatch.setattr(warm_start_module, "_warm_started", False)
+        path = tmp_path / "cities.txt"
+        path.write_text("\n".join(COORDINATES))
+        mock_get_client.return_value.weather_api.side_effect = lambda url, params: [
+            SyntheticResponse(hours=168) for _ in params["latitude"]
+        ]
+
+        thread = warm_start_module.warm_start(str(path))
+        thread.join(timeout=5)
+
+        mock_get_client.return_value.weather_api.assert_called_once()
+        start_date, _ = _forecast_window()
+        assert all(isolated_forecast_cache.get(*point, start_date) is not None for point in COORDINATES.values())
+        assert warm_start_module.warm_start(str(path)) is None
+
+    def test_missing_city_list(self, monkeypatch):
+        """Test that an unreadable city list is skipped"""
+        monkeypatch.setattr(warm_start_module, "_warm_started", False)
+        assert warm_start_module.warm_start("/nonexistent/cities.txt") is None
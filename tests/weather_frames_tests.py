@@ -0,0 +1,46 @@
+import numpy as np
+import pytest
+
+from backend.data_models.data_models import Forecast
+from backend.utils.weather_frames import HourlyWeatherFrame, filter_by_hour_range, process_weather_data
+
+
+@pytest.fixture
+def weather_frame():
+    """Fixture providing 36 hours from 2024-06-01 12:00 local time (UTC-4)"""
+    start = 1717200000 + 16 * 3600
+    time = np.arange(start, start + 36 * 3600, 3600)
+    values = np.vstack([np.arange(36, dtype=np.float64), np.zeros(36)])
+    forecast = Forecast(time, values, ("temperature_2m", "precipitation"), utc_offset_seconds=-4 * 3600)
+    return process_weather_data({"error": None, "data": forecast})
+
+
+class TestHourlyWeatherFrame:
+    """Test the indexed forecast frame behind the Weather_Info charts"""
+
+    def test_indexed_by_date_and_hour(self, weather_frame):
+        """Test the (date, hour) index, the date list and the precomputed labels"""
+        assert weather_frame.dates == ["2024-06-01", "2024-06-02"]
+        assert weather_frame.frame.index.names == ["date", "hour"]
+        assert weather_frame.frame.loc[("2024-06-01", 12), "hour_label"] == "12:00"
+        assert weather_frame.frame.loc[("2024-06-02", 0), "temperature_2m"] == 12
+
+    def test_inclusive_hour_slice(self, weather_frame):
+        """Test that both ends of the range are included"""
+        hours = filter_by_hour_range(weather_frame, "2024-06-02", 6, 9)
+        assert hours.index.tolist() == [6, 7, 8, 9]
+        assert hours["hour_label"].tolist() == ["06:00", "07:00", "08:00", "09:00"]
+        assert hours["temperature_2m"].tolist() == [18, 19, 20, 21]
+
+    def test_slices_memoized(self, weather_frame):
+        """Test that repeating a range returns the stored slice"""
+        first = weather_frame.hours("2024-06-01", 14, 20)
+        assert weather_frame.hours("2024-06-01", 14, 20) is first
+
+    def test_missing_data_is_empty(self, weather_frame):
+        """Test that unknown dates, hours outside the data and failed fetches give empty results"""
+        assert weather_frame.hours("2024-06-03", 0, 23).empty
+        assert weather_frame.hours("2024-06-01", 0, 6).empty
+        failed = process_weather_data({"error": "City not found", "data": None})
+        assert failed.is_empty and failed.dates == []
+        assert HourlyWeatherFrame.empty().hours("2024-06-01", 0, 23).empty